@@ -1,10 +1,55 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import interactions, outcomes, patients
+from app.api.v1.async_endpoints import interactions as async_interactions
+from app.api.v1.async_endpoints import outcomes as async_outcomes
+from app.api.v1.async_endpoints import patients as async_patients
+from app.api.v1.endpoints import interactions, outcomes, patients, stats
+from app.core.config import settings
 
-api_router = APIRouter()
-api_router.include_router(patients.router, prefix="/patients", tags=["patients"])
-api_router.include_router(
+
+def _with_fallback(primary: APIRouter, fallback: APIRouter) -> APIRouter:
+    """
+    Adds the routes of `fallback` that `primary` does not implement itself,
+    so the async routers only need to cover the paths they speed up.
+    """
+    taken = {
+        (route.path, method)
+        for route in primary.routes
+        for method in getattr(route, "methods", ())
+    }
+    for route in fallback.routes:
+        methods = getattr(route, "methods", ())
+        if not any((route.path, method) in taken for method in methods):
+            primary.routes.append(route)
+    return primary
+
+
+sync_api_router = APIRouter()
+sync_api_router.include_router(patients.router, prefix="/patients", tags=["patients"])
+sync_api_router.include_router(
     interactions.router, prefix="/interactions", tags=["interactions"]
 )
-api_router.include_router(outcomes.router, prefix="/outcomes", tags=["configuration"])
+sync_api_router.include_router(
+    outcomes.router, prefix="/outcomes", tags=["configuration"]
+)
+sync_api_router.include_router(stats.router, prefix="/stats", tags=["statistics"])
+
+async_api_router = APIRouter()
+async_api_router.include_router(
+    _with_fallback(async_patients.router, patients.router),
+    prefix="/patients",
+    tags=["patients"],
+)
+async_api_router.include_router(
+    _with_fallback(async_interactions.router, interactions.router),
+    prefix="/interactions",
+    tags=["interactions"],
+)
+async_api_router.include_router(
+    _with_fallback(async_outcomes.router, outcomes.router),
+    prefix="/outcomes",
+    tags=["configuration"],
+)
+async_api_router.include_router(stats.router, prefix="/stats", tags=["statistics"])
+
+api_router = async_api_router if settings.DB_ASYNC else sync_api_router
@@ -0,0 +1,127 @@
+import uuid
+from datetime import datetime
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.endpoints.interactions import (
+    history_etag,
+    set_history_headers,
+    set_next_page_headers,
+)
+from app.core import http_cache
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.core.responses import rows_response
+from app.schemas.interaction import (
+    InteractionCreate,
+    InteractionRead,
+    InteractionUpdate,
+)
+from app.services import interactions as interaction_service
+from app.services import versions
+
+router = APIRouter()
+
+
+@router.post("/", response_model=InteractionRead, status_code=status.HTTP_201_CREATED)
+async def create_interaction(
+    interaction: InteractionCreate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Document a patient interaction.
+    """
+    return await session.run_sync(interaction_service.create_interaction, interaction)
+
+
+@router.get("/", response_model=List[InteractionRead])
+async def read_interactions(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    offset: int = 0,
+    limit: int = 100,
+    patient_id: List[uuid.UUID] = Query(default=[], max_length=100),
+    outcome: List[str] = Query(default=[]),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_archived: bool = False,
+):
+    """
+    Retrieve interactions with optional filtering, newest first.
+    Pages are linked through an opaque cursor in the `X-Next-Cursor` and
+    `Link` headers; pass it back as `cursor` for constant-cost deep paging.
+    `patient_id` and `outcome` may be repeated to match any of the values
+    (`?outcome=Critical&outcome=Monitor`). `since`/`until` bound the
+    timestamp (until exclusive); ranges that lie in archived months are
+    served from the archive without touching the table. Listings without
+    a range only continue into the archive with `include_archived=true`.
+    Patient histories carry an ETag; send it as `If-None-Match` to get
+    a 304 without the rows being loaded.
+    """
+    etag = None
+    if patient_id:
+        history = await session.run_sync(versions.history_versions, patient_id)
+        etag = history_etag(request, history)
+        cached = http_cache.not_modified(request, etag, http_cache.PRIVATE_REVALIDATE)
+        if cached:
+            return cached
+
+    if settings.FAST_JSON_RESPONSES:
+        rows = await session.run_sync(
+            interaction_service.list_interaction_rows,
+            offset,
+            limit,
+            patient_id,
+            outcome,
+            cursor,
+            since,
+            until,
+            include_archived,
+        )
+        fast_response = rows_response(rows)
+        set_next_page_headers(request, fast_response, rows, limit)
+        set_history_headers(fast_response, etag)
+        return fast_response
+
+    interactions = await session.run_sync(
+        interaction_service.list_interactions,
+        offset,
+        limit,
+        patient_id,
+        outcome,
+        cursor,
+        since,
+        until,
+        include_archived,
+    )
+    set_next_page_headers(request, response, interactions, limit)
+    set_history_headers(response, etag)
+    return interactions
+
+
+@router.put("/{interaction_id}", response_model=InteractionRead)
+async def update_interaction(
+    interaction_id: uuid.UUID,
+    interaction_update: InteractionUpdate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Update interaction details (notes, outcome).
+    """
+    return await session.run_sync(
+        interaction_service.update_interaction, interaction_id, interaction_update
+    )
+
+
+@router.delete("/{interaction_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_interaction(
+    interaction_id: uuid.UUID, session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Delete a specific interaction.
+    """
+    await session.run_sync(interaction_service.delete_interaction, interaction_id)
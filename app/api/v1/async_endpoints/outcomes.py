@@ -0,0 +1,55 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.endpoints.outcomes import cached_outcomes
+from app.core.database import get_async_session
+from app.models import Outcome
+from app.services import outcomes as outcome_service
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[Outcome])
+async def list_outcomes(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    List all configured outcomes. Cacheable reference data with an ETag
+    (`If-None-Match` gets a 304).
+    """
+    outcomes = await session.run_sync(outcome_service.list_outcomes)
+    return cached_outcomes(request, response, outcomes)
+
+
+@router.post("/", response_model=Outcome, status_code=status.HTTP_201_CREATED)
+async def create_outcome(
+    outcome: Outcome, session: AsyncSession = Depends(get_async_session)
+):
+    """Create a new valid outcome."""
+    return await session.run_sync(outcome_service.create_outcome, outcome)
+
+
+@router.delete("/{code}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_outcome(code: str, session: AsyncSession = Depends(get_async_session)):
+    """
+    Remove an outcome from the valid list.
+    Existing interactions with this outcome are preserved (soft validation).
+    """
+    await session.run_sync(outcome_service.delete_outcome, code)
+
+
+@router.put("/{code}", response_model=Outcome)
+async def update_outcome(
+    code: str,
+    outcome_update: Outcome,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Update outcome description.
+    Note: The code (ID) cannot be changed via this endpoint.
+    """
+    return await session.run_sync(outcome_service.update_outcome, code, outcome_update)
@@ -0,0 +1,87 @@
+import uuid
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.endpoints.patients import DELETION_RESPONSES, deletion_accepted
+from app.core.config import settings
+from app.core.database import engine, get_async_session
+from app.core.responses import rows_response
+from app.models import Gender
+from app.schemas.patient import PatientCreate, PatientRead, PatientUpdate
+from app.services import patients as patient_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=PatientRead, status_code=status.HTTP_201_CREATED)
+async def create_patient(
+    patient: PatientCreate, session: AsyncSession = Depends(get_async_session)
+):
+    return await session.run_sync(patient_service.create_patient, patient)
+
+
+@router.get("/", response_model=List[PatientRead])
+async def read_patients(
+    session: AsyncSession = Depends(get_async_session),
+    first_name: str | None = None,
+    last_name: str | None = None,
+    date_of_birth: date | None = None,
+    gender: Gender | None = None,
+    offset: int = 0,
+    limit: int = 100,
+):
+    if settings.FAST_JSON_RESPONSES:
+        rows = await session.run_sync(
+            patient_service.list_patient_rows,
+            first_name,
+            last_name,
+            date_of_birth,
+            gender,
+            offset,
+            limit,
+        )
+        return rows_response(rows)
+
+    return await session.run_sync(
+        patient_service.list_patients,
+        first_name,
+        last_name,
+        date_of_birth,
+        gender,
+        offset,
+        limit,
+    )
+
+
+@router.put("/{patient_id}", response_model=PatientRead)
+async def update_patient(
+    patient_id: uuid.UUID,
+    patient_update: PatientUpdate,
+    session: AsyncSession = Depends(get_async_session),
+):
+    return await session.run_sync(
+        patient_service.update_patient, patient_id, patient_update
+    )
+
+
+@router.delete(
+    "/{patient_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=DELETION_RESPONSES,
+)
+async def delete_patient(
+    request: Request,
+    patient_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+    background: bool = False,
+):
+    if background:
+        job = await session.run_sync(patient_service.start_deletion, patient_id)
+        # The job runs on the sync engine in the threadpool, like the sync stack
+        background_tasks.add_task(patient_service.run_deletion, engine, job.id)
+        return deletion_accepted(request, job)
+    await session.run_sync(patient_service.delete_patient, patient_id)
@@ -1,16 +1,36 @@
+import json
 import uuid
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
 
-from app.core.database import get_session
-from app.models import Interaction, Outcome, Patient
+from app.core import change_feed, http_cache
+from app.core.config import settings
+from app.core.database import get_lazy_session, get_read_session, get_session
+from app.core.responses import rows_response
+from app.schemas.audit import AuditEntryRead
 from app.schemas.interaction import (
+    BulkInteractionResult,
     InteractionCreate,
     InteractionRead,
     InteractionUpdate,
 )
+from app.services import export as export_service
+from app.services import interactions as interaction_service
+from app.services import search as search_service
+from app.services import versions
 
 router = APIRouter()
 
@@ -22,44 +42,251 @@ def create_interaction(
     """
     Document a patient interaction.
     """
+    if settings.GROUP_COMMIT_WINDOW_MS > 0:
+        return interaction_service.create_interaction_grouped(session, interaction)
+    return interaction_service.create_interaction(session, interaction)
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+BULK_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/InteractionCreate"},
+                }
+            },
+            NDJSON_MEDIA_TYPE: {
+                "schema": {"$ref": "#/components/schemas/InteractionCreate"}
+            },
+        },
+    }
+}
+
 
-    patient = session.get(Patient, interaction.patient_id)
-    if not patient:
+async def read_bulk_rows(request: Request) -> list[Any]:
+    """
+    Parse a bulk upload body: a JSON array, or NDJSON (one object per line).
+    NDJSON lines are validated individually so a bad line only rejects itself.
+    NDJSON is split into lines as the body arrives, and the upload is refused
+    with 413 as soon as it goes past BULK_MAX_ROWS; a JSON array has to be
+    read whole before it can be parsed.
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        rows: Any = []
+        async for line in ndjson_lines(request.stream()):
+            if line.strip():
+                rows.append(line)
+                check_bulk_size(rows)
+        return rows
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        rows = None
+    if not isinstance(rows, list):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Patient with ID {interaction.patient_id} not found",
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Body must be a JSON array or NDJSON.",
         )
+    check_bulk_size(rows)
+    return rows
 
-    # TODO: Move this validation logic to a service layer
-    _validate_outcome(session, interaction.outcome)
 
-    db_interaction = Interaction.model_validate(interaction)
-    session.add(db_interaction)
-    session.commit()
-    session.refresh(db_interaction)
-    return db_interaction
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream on newlines, holding at most one partial line."""
+    pending = b""
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
 
 
-@router.get("/", response_model=List[InteractionRead])
-def read_interactions(
+def check_bulk_size(rows: list[Any]) -> None:
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ROWS} rows per request.",
+        )
+
+
+@router.post(
+    "/bulk", response_model=BulkInteractionResult, openapi_extra=BULK_REQUEST_BODY
+)
+def create_interactions_bulk(
+    rows: list[Any] = Depends(read_bulk_rows),
     session: Session = Depends(get_session),
-    offset: int = 0,
-    limit: int = 100,
+):
+    """
+    Document many interactions in one request (device gateway uploads).
+    Valid rows are stored; rejected rows are reported with their index.
+    """
+    return interaction_service.create_interactions_bulk(session, rows)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_interactions(
+    session: Session = Depends(get_session),
+    format: export_service.ExportFormat = export_service.ExportFormat.NDJSON,
     patient_id: uuid.UUID | None = None,
     outcome: str | None = None,
 ):
     """
-    Retrieve interactions with optional filtering.
+    Stream all interactions as NDJSON or CSV, in constant memory.
+    """
+    return StreamingResponse(
+        export_service.export_interactions(
+            session.get_bind(), format, patient_id, outcome
+        ),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="interactions.{format.value}"'
+        },
+    )
+
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_interactions(
+    session: Session = Depends(get_lazy_session),
+    patient_id: List[uuid.UUID] = Query(default=[], max_length=100),
+    outcome: List[str] = Query(default=[]),
+    last_event_id: int | None = Header(default=None),
+):
+    """
+    Server-sent events for every interaction created or updated from now
+    on, optionally only for some patients and/or outcomes. Event ids are
+    increasing sequence numbers; reconnecting with `Last-Event-ID` first
+    replays the changes since then. Each event carries the interaction as
+    it is when the event is sent.
+    """
+    bind = session.get_bind()
+    subscription = await change_feed.hub.subscribe(bind, patient_id, outcome)
+    return StreamingResponse(
+        change_feed.event_stream(bind, subscription, last_event_id),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/search", response_model=List[InteractionRead])
+def search_interactions(
+    q: str,
+    session: Session = Depends(get_read_session),
+    patient_id: uuid.UUID | None = None,
+    limit: int = 20,
+):
+    """
+    Ranked, case-insensitive prefix search over interaction notes.
     """
-    statement = select(Interaction).order_by(Interaction.timestamp.desc())
+    return search_service.search_interactions(session, q, limit, patient_id)
 
+
+@router.get("/", response_model=List[InteractionRead])
+def read_interactions(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_read_session),
+    offset: int = 0,
+    limit: int = 100,
+    patient_id: List[uuid.UUID] = Query(default=[], max_length=100),
+    outcome: List[str] = Query(default=[]),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_archived: bool = False,
+):
+    """
+    Retrieve interactions with optional filtering, newest first.
+    Pages are linked through an opaque cursor in the `X-Next-Cursor` and
+    `Link` headers; pass it back as `cursor` for constant-cost deep paging.
+    `patient_id` and `outcome` may be repeated to match any of the values
+    (`?outcome=Critical&outcome=Monitor`). `since`/`until` bound the
+    timestamp (until exclusive); ranges that lie in archived months are
+    served from the archive without touching the table. Listings without
+    a range only continue into the archive with `include_archived=true`.
+    Patient histories carry an ETag; send it as `If-None-Match` to get
+    a 304 without the rows being loaded.
+    """
+    etag = None
     if patient_id:
-        statement = statement.where(Interaction.patient_id == patient_id)
+        etag = history_etag(request, versions.history_versions(session, patient_id))
+        cached = http_cache.not_modified(request, etag, http_cache.PRIVATE_REVALIDATE)
+        if cached:
+            return cached
+
+    if settings.FAST_JSON_RESPONSES:
+        rows = interaction_service.list_interaction_rows(
+            session,
+            offset,
+            limit,
+            patient_id,
+            outcome,
+            cursor,
+            since,
+            until,
+            include_archived,
+        )
+        fast_response = rows_response(rows)
+        set_next_page_headers(request, fast_response, rows, limit)
+        set_history_headers(fast_response, etag)
+        return fast_response
+
+    interactions = interaction_service.list_interactions(
+        session,
+        offset,
+        limit,
+        patient_id,
+        outcome,
+        cursor,
+        since,
+        until,
+        include_archived,
+    )
+    set_next_page_headers(request, response, interactions, limit)
+    set_history_headers(response, etag)
+    return interactions
+
 
-    if outcome:
-        statement = statement.where(Interaction.outcome == outcome)
+def history_etag(request: Request, history: Sequence[int]) -> str:
+    """ETag of a history page: the patients' versions plus the page's query."""
+    return http_cache.make_etag(*history, request.url.query)
 
-    return session.exec(statement.offset(offset).limit(limit)).all()
+
+def set_history_headers(response: Response, etag: str | None) -> None:
+    if etag:
+        http_cache.set_cache_headers(response, etag, http_cache.PRIVATE_REVALIDATE)
+
+
+def set_next_page_headers(
+    request: Request, response: Response, interactions: Sequence[Any], limit: int
+) -> None:
+    cursor = interaction_service.next_cursor(interactions, limit)
+    if cursor:
+        url = request.url.remove_query_params("offset").include_query_params(
+            cursor=cursor
+        )
+        response.headers["X-Next-Cursor"] = cursor
+        response.headers["Link"] = f'<{url}>; rel="next"'
+
+
+@router.get("/{interaction_id}/history", response_model=List[AuditEntryRead])
+def read_interaction_history(
+    interaction_id: uuid.UUID, session: Session = Depends(get_session)
+):
+    """
+    Audit trail of an interaction: every create, update and delete, oldest
+    first, with the changed fields before and after. Read from the primary,
+    where this worker's queued entries have just been flushed.
+    """
+    return interaction_service.interaction_history(session, interaction_id)
 
 
 @router.put("/{interaction_id}", response_model=InteractionRead)
@@ -71,24 +298,9 @@ def update_interaction(
     """
     Update interaction details (notes, outcome).
     """
-    db_interaction = session.get(Interaction, interaction_id)
-    if not db_interaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found"
-        )
-
-    # Validate Outcome if present
-    if interaction_update.outcome:
-        _validate_outcome(session, interaction_update.outcome)
-
-    interaction_data = interaction_update.model_dump(exclude_unset=True)
-    for key, value in interaction_data.items():
-        setattr(db_interaction, key, value)
-
-    session.add(db_interaction)
-    session.commit()
-    session.refresh(db_interaction)
-    return db_interaction
+    return interaction_service.update_interaction(
+        session, interaction_id, interaction_update
+    )
 
 
 @router.delete("/{interaction_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -98,21 +310,4 @@ def delete_interaction(
     """
     Delete a specific interaction.
     """
-    interaction = session.get(Interaction, interaction_id)
-    if not interaction:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found"
-        )
-    session.delete(interaction)
-    session.commit()
-
-
-def _validate_outcome(session: Session, outcome_code: str):
-    """
-    Helper to validate that an outcome configuration exists.
-    """
-    if not session.get(Outcome, outcome_code):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid outcome '{outcome_code}'. Please configure it first.",
-        )
+    interaction_service.delete_interaction(session, interaction_id)
@@ -1,33 +1,47 @@
-from typing import List
+from typing import List, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlmodel import Session
 
-from app.core.database import get_session
+from app.core import http_cache
+from app.core.config import settings
+from app.core.database import get_lazy_session, get_session
 from app.models import Outcome
+from app.services import outcomes as outcome_service
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Outcome])
-def list_outcomes(session: Session = Depends(get_session)):
-    """List all configured outcomes."""
-    # TODO: Cache this result (Redis/Memcached) as outcomes change rarely.
-    return session.exec(select(Outcome)).all()
+def list_outcomes(
+    request: Request, response: Response, session: Session = Depends(get_lazy_session)
+):
+    """
+    List all configured outcomes. Cacheable reference data with an ETag
+    (`If-None-Match` gets a 304). Served from the in-process registry; when
+    that has to (re)load, it reads the primary, never a lagging replica that
+    could put an outcome just written back out of date.
+    """
+    return cached_outcomes(request, response, outcome_service.list_outcomes(session))
+
+
+def cached_outcomes(
+    request: Request, response: Response, outcomes: Sequence[Outcome]
+) -> Sequence[Outcome] | Response:
+    # The list is served from memory, so hashing it is cheaper than any version
+    etag = http_cache.make_etag(*(f"{o.code}:{o.description}" for o in outcomes))
+    cache_control = f"public, max-age={settings.OUTCOMES_CACHE_MAX_AGE}"
+    cached = http_cache.not_modified(request, etag, cache_control)
+    if cached:
+        return cached
+    http_cache.set_cache_headers(response, etag, cache_control)
+    return outcomes
 
 
 @router.post("/", response_model=Outcome, status_code=status.HTTP_201_CREATED)
 def create_outcome(outcome: Outcome, session: Session = Depends(get_session)):
     """Create a new valid outcome."""
-    if session.get(Outcome, outcome.code):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Outcome '{outcome.code}' already exists.",
-        )
-    session.add(outcome)
-    session.commit()
-    session.refresh(outcome)
-    return outcome
+    return outcome_service.create_outcome(session, outcome)
 
 
 @router.delete("/{code}", status_code=status.HTTP_204_NO_CONTENT)
@@ -36,13 +50,7 @@ def delete_outcome(code: str, session: Session = Depends(get_session)):
     Remove an outcome from the valid list.
     Existing interactions with this outcome are preserved (soft validation).
     """
-    outcome = session.get(Outcome, code)
-    if not outcome:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Outcome not found"
-        )
-    session.delete(outcome)
-    session.commit()
+    outcome_service.delete_outcome(session, code)
 
 
 @router.put("/{code}", response_model=Outcome)
@@ -55,16 +63,4 @@ def update_outcome(
     Update outcome description.
     Note: The code (ID) cannot be changed via this endpoint.
     """
-    db_outcome = session.get(Outcome, code)
-    if not db_outcome:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Outcome not found"
-        )
-
-    if outcome_update.description is not None:
-        db_outcome.description = outcome_update.description
-
-    session.add(db_outcome)
-    session.commit()
-    session.refresh(db_outcome)
-    return db_outcome
+    return outcome_service.update_outcome(session, code, outcome_update)
@@ -1,29 +1,136 @@
 import uuid
+from collections.abc import AsyncIterator, Iterator
 from datetime import date
-from typing import List
+from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+import anyio
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlmodel import Session
 
-from app.core.database import get_session
-from app.models import Gender, Patient
-from app.schemas.patient import PatientCreate, PatientRead, PatientUpdate
+from app.core.config import settings
+from app.core.database import get_read_session, get_session
+from app.core.responses import rows_response
+from app.models import Gender, Patient, PatientDeletion
+from app.schemas.patient import (
+    PatientCreate,
+    PatientImportResult,
+    PatientRead,
+    PatientTimeline,
+    PatientUpdate,
+)
+from app.schemas.stats import PatientSummary
+from app.services import export as export_service
+from app.services import patient_import
+from app.services import patients as patient_service
+from app.services import search as search_service
+from app.services import stats as stats_service
 
 router = APIRouter()
 
 
 @router.post("/", response_model=PatientRead, status_code=status.HTTP_201_CREATED)
 def create_patient(patient: PatientCreate, session: Session = Depends(get_session)):
-    db_patient = Patient.model_validate(patient)
-    session.add(db_patient)
-    session.commit()
-    session.refresh(db_patient)
-    return db_patient
+    if settings.GROUP_COMMIT_WINDOW_MS > 0:
+        return patient_service.create_patient_grouped(session, patient)
+    return patient_service.create_patient(session, patient)
+
+
+IMPORT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            media_type: {"schema": {"type": "string"}}
+            for media_type in export_service.MEDIA_TYPES.values()
+        },
+    }
+}
+
+
+def iterate_from_thread(stream: AsyncIterator[bytes]) -> Iterator[bytes]:
+    """
+    Consume an async byte stream from a worker thread, one chunk at a time,
+    so a sync import can read the request body while it arrives.
+    """
+
+    async def next_chunk() -> bytes:
+        return await stream.__anext__()
+
+    while True:
+        try:
+            yield anyio.from_thread.run(next_chunk)
+        except StopAsyncIteration:
+            return
+
+
+@router.post(
+    "/import", response_model=PatientImportResult, openapi_extra=IMPORT_REQUEST_BODY
+)
+async def import_patients(
+    request: Request,
+    session: Session = Depends(get_session),
+    format: export_service.ExportFormat = export_service.ExportFormat.CSV,
+    dedupe: bool = True,
+):
+    """
+    Import patient master data from CSV or NDJSON (same columns as the export).
+    Records matching an existing patient on name and date of birth are skipped
+    unless `dedupe=false`. The body is parsed and loaded chunk by chunk as it
+    is received, and duplicates are looked up in the database rather than
+    remembered, so memory stays bounded by the chunk size.
+    """
+    lines = patient_import.decode_lines(iterate_from_thread(request.stream()))
+    records = patient_import.parse_records(lines, format)
+    return await run_in_threadpool(
+        patient_import.import_patients,
+        session,
+        records,
+        settings.BULK_CHUNK_SIZE,
+        dedupe,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_patients(
+    session: Session = Depends(get_session),
+    format: export_service.ExportFormat = export_service.ExportFormat.NDJSON,
+):
+    """
+    Stream all patients as NDJSON or CSV, in constant memory.
+    """
+    return StreamingResponse(
+        export_service.export_patients(session.get_bind(), format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="patients.{format.value}"'
+        },
+    )
+
+
+@router.get("/search", response_model=List[PatientRead])
+def search_patients(
+    q: str, session: Session = Depends(get_read_session), limit: int = 20
+):
+    """
+    Ranked, case-insensitive prefix search over patient names
+    (e.g. `q=jo sm` finds "John Smith").
+    """
+    return search_service.search_patients(session, q, limit)
 
 
 @router.get("/", response_model=List[PatientRead])
 def read_patients(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     first_name: str | None = None,
     last_name: str | None = None,
     date_of_birth: date | None = None,
@@ -31,19 +138,60 @@ def read_patients(
     offset: int = 0,
     limit: int = 100,
 ):
-    # TODO: Index if search volume increases
+    if settings.FAST_JSON_RESPONSES:
+        return rows_response(
+            patient_service.list_patient_rows(
+                session, first_name, last_name, date_of_birth, gender, offset, limit
+            )
+        )
+    return patient_service.list_patients(
+        session, first_name, last_name, date_of_birth, gender, offset, limit
+    )
+
+
+@router.get("/timelines", response_model=List[PatientTimeline])
+def read_timelines(
+    ids: List[uuid.UUID] = Query(max_length=100),
+    session: Session = Depends(get_read_session),
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    """
+    Several patients with their recent interactions (`?ids=..&ids=..`).
+    Unknown IDs are omitted.
+    """
+    return patient_service.get_timelines(session, ids, limit)
+
+
+@router.get("/{patient_id}/timeline", response_model=PatientTimeline)
+def read_timeline(
+    patient_id: uuid.UUID,
+    session: Session = Depends(get_read_session),
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    """A patient with their most recent interactions, newest first."""
+    timelines = patient_service.get_timelines(session, [patient_id], limit)
+    if not timelines:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    return timelines[0]
 
-    query = select(Patient)
-    if first_name:
-        query = query.where(Patient.first_name == first_name)
-    if last_name:
-        query = query.where(Patient.last_name == last_name)
-    if date_of_birth:
-        query = query.where(Patient.date_of_birth == date_of_birth)
-    if gender:
-        query = query.where(Patient.gender == gender)
 
-    return session.exec(query.offset(offset).limit(limit)).all()
+@router.get("/{patient_id}/summary", response_model=PatientSummary)
+def read_summary(
+    patient_id: uuid.UUID,
+    session: Session = Depends(get_read_session),
+    days: int | None = Query(default=None, ge=1),
+):
+    """
+    Interaction counts per outcome for a patient, optionally limited to the
+    last `days` days (e.g. Critical interactions this week).
+    """
+    if not session.get(Patient, patient_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    return stats_service.patient_summary(session, patient_id, days)
 
 
 @router.put("/{patient_id}", response_model=PatientRead)
@@ -52,28 +200,49 @@ def update_patient(
     patient_update: PatientUpdate,
     session: Session = Depends(get_session),
 ):
-    db_patient = session.get(Patient, patient_id)
-    if not db_patient:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
-        )
+    return patient_service.update_patient(session, patient_id, patient_update)
 
-    patient_data = patient_update.model_dump(exclude_unset=True)
-    for key, value in patient_data.items():
-        setattr(db_patient, key, value)
 
-    session.add(db_patient)
-    session.commit()
-    session.refresh(db_patient)
-    return db_patient
+DELETION_RESPONSES: dict[int | str, dict[str, Any]] = {
+    status.HTTP_202_ACCEPTED: {"model": PatientDeletion}
+}
 
 
-@router.delete("/{patient_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_patient(patient_id: uuid.UUID, session: Session = Depends(get_session)):
-    patient = session.get(Patient, patient_id)
-    if not patient:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+@router.delete(
+    "/{patient_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=DELETION_RESPONSES,
+)
+def delete_patient(
+    request: Request,
+    patient_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    background: bool = False,
+):
+    """
+    Delete a patient with their whole history, in chunked set-based DELETEs.
+    With `background=true` the deletion runs after the response: 202 with a
+    job to poll at the `Location` header.
+    """
+    if background:
+        job = patient_service.start_deletion(session, patient_id)
+        background_tasks.add_task(
+            patient_service.run_deletion, session.get_bind(), job.id
         )
-    session.delete(patient)
-    session.commit()
+        return deletion_accepted(request, job)
+    patient_service.delete_patient(session, patient_id)
+
+
+@router.get("/deletions/{job_id}", response_model=PatientDeletion)
+def read_deletion(job_id: uuid.UUID, session: Session = Depends(get_read_session)):
+    """Status of a background patient deletion."""
+    return patient_service.get_deletion(session, job_id)
+
+
+def deletion_accepted(request: Request, job: PatientDeletion) -> JSONResponse:
+    return JSONResponse(
+        jsonable_encoder(job),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": str(request.url_for("read_deletion", job_id=job.id))},
+    )
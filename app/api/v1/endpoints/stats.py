@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+from app.core.database import get_read_session
+from app.schemas.stats import OutcomeStatistics
+from app.services import stats as stats_service
+
+router = APIRouter()
+
+
+@router.get("/outcomes", response_model=OutcomeStatistics)
+def read_outcome_statistics(
+    session: Session = Depends(get_read_session),
+    days: int | None = Query(default=None, ge=1),
+):
+    """
+    Interaction counts per outcome across all patients, optionally limited to
+    the last `days` days. Served from the daily rollup, not raw interactions.
+    """
+    return stats_service.outcome_statistics(session, days)
@@ -0,0 +1,123 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+logger = logging.getLogger(__name__)
+
+# Inserts a batch of rows in the given session; the writer commits.
+BatchWriter = Callable[[Session, Sequence[dict[str, Any]]], None]
+
+
+class AuditWriter:
+    """
+    Writes rows in the background, in batches, without making callers wait.
+
+    `put` queues the rows of one committed transaction and returns. Once
+    `start`ed, a thread takes everything queued (up to `max_batch` rows) and
+    writes it with one executemany and one commit, so batches grow by
+    themselves under load. A failed batch is never dropped: it is logged and
+    retried with a backoff doubling up to `max_backoff` seconds, and stays
+    queued meanwhile. When the queue holds `max_queued` transactions, `put`
+    waits for the thread to catch up, so an unwritable audit log ends up
+    holding up the writes it audits rather than losing their entries.
+
+    Not started (scripts, tests), `put` writes the rows immediately and a
+    failure is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        write: BatchWriter,
+        max_batch: int,
+        max_queued: int,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.write = write
+        self.max_batch = max_batch
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue: queue.Queue[tuple[Engine, Sequence[dict[str, Any]]] | None] = (
+            queue.Queue(max_queued)
+        )
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 30.0) -> None:
+        """Write everything queued and stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.error(
+                    "Audit writer still retrying after %s s; queued entries "
+                    "were not written",
+                    timeout,
+                )
+            self._thread = None
+
+    def put(self, bind: Engine, rows: Sequence[dict[str, Any]]) -> None:
+        if self._thread is None:
+            self._commit(bind, rows)
+        else:
+            self._queue.put((bind, rows))
+
+    def flush(self) -> None:
+        """Wait until everything queued so far is written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][1]) if batch[0] else 0
+            while batch[-1] is not None and size < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                size += len(batch[-1][1]) if batch[-1] else 0
+
+            by_bind: dict[Engine, list[dict[str, Any]]] = {}
+            for item in batch:
+                if item is not None:
+                    by_bind.setdefault(item[0], []).extend(item[1])
+            for bind, rows in by_bind.items():
+                self._commit_until_written(bind, rows)
+            for _ in batch:
+                self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _commit(self, bind: Engine, rows: Sequence[dict[str, Any]]) -> None:
+        with Session(bind) as session:
+            self.write(session, rows)
+            session.commit()
+
+    def _commit_until_written(
+        self, bind: Engine, rows: Sequence[dict[str, Any]]
+    ) -> None:
+        delay = self.backoff
+        while True:
+            try:
+                self._commit(bind, rows)
+                return
+            except Exception:
+                logger.exception(
+                    "Writing %d audit entries failed; retrying in %s s",
+                    len(rows),
+                    delay,
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
@@ -0,0 +1,227 @@
+"""
+In-process fan-out of the interaction change feed to SSE subscribers.
+
+Interaction writes append to `interaction_change` (app.services.changes).
+After a commit that recorded changes the hub is woken: it reads everything
+after the last sequence number it handed out in one query, encodes each
+change once as an SSE frame and queues it for every matching subscriber.
+While anyone is subscribed it also polls every STREAM_POLL_SECONDS, which
+picks up writes committed by other workers. A subscriber more than
+STREAM_MAX_QUEUED frames behind is disconnected; it resumes with
+`Last-Event-ID` and catches up from the table.
+
+On PostgreSQL, transactions can commit out of sequence order; a change
+committed after a later one was delivered only reaches clients through a
+reconnect backfill.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, AsyncIterator, Sequence
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine, Row, event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import changes
+
+logger = logging.getLogger(__name__)
+
+# Changes read per query, by the hub and by backfills.
+FETCH_BATCH = 1000
+
+Frame = tuple[int, bytes]
+# Queued to every subscriber each STREAM_KEEPALIVE_SECONDS, so idle streams
+# wait on their queue alone (no per-event timeout task).
+KEEP_ALIVE: Frame = (0, b": keep-alive\n\n")
+
+
+def sse_frame(row: Row[Any]) -> Frame:
+    seq, *values = row
+    data = orjson.dumps(dict(zip(row._fields[1:], values)))
+    return seq, b"id: %d\nevent: interaction\ndata: %s\n\n" % (seq, data)
+
+
+class Subscription:
+    def __init__(
+        self,
+        patient_ids: Sequence[uuid.UUID],
+        outcomes: Sequence[str],
+        position: int,
+    ) -> None:
+        self.patient_ids = frozenset(patient_ids)
+        self.outcomes = frozenset(outcomes)
+        # Changes up to here come from backfill, later ones from the queue
+        self.position = position
+        # None marks a subscriber dropped for falling behind
+        self.queue: asyncio.Queue[Frame | None] = asyncio.Queue()
+
+    def matches(self, patient_id: uuid.UUID, outcome: str) -> bool:
+        return (not self.patient_ids or patient_id in self.patient_ids) and (
+            not self.outcomes or outcome in self.outcomes
+        )
+
+
+class ChangeFeedHub:
+    def __init__(
+        self,
+        poll_seconds: float = 1.0,
+        max_queued: int = 1000,
+        keepalive_seconds: float = 15.0,
+    ) -> None:
+        self.poll_seconds = poll_seconds
+        self.max_queued = max_queued
+        self.keepalive_seconds = keepalive_seconds
+        self.position = 0
+        self._subscribers: set[Subscription] = set()
+        self._bind: Engine | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._wake = asyncio.Event()
+        self._ready = asyncio.Event()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    async def subscribe(
+        self,
+        bind: Engine,
+        patient_ids: Sequence[uuid.UUID] = (),
+        outcomes: Sequence[str] = (),
+    ) -> Subscription:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            # The tail task runs only while someone is subscribed
+            self._bind, self._loop = bind, loop
+            self._wake, self._ready = asyncio.Event(), asyncio.Event()
+            self._subscribers = set()
+            self._task = loop.create_task(self._tail())
+        task = self._task
+        ready = loop.create_task(self._ready.wait())
+        await asyncio.wait((ready, task), return_when=asyncio.FIRST_COMPLETED)
+        if not self._ready.is_set():
+            # The tail failed to start: every waiting subscriber gets its
+            # error, and the next one starts a new task (this one is done)
+            ready.cancel()
+            task.result()
+        subscription = Subscription(patient_ids, outcomes, self.position)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def wake(self) -> None:
+        """Have the hub read new changes now. Safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # The loop is closed; the next subscriber starts a new one
+            pass
+
+    async def _tail(self) -> None:
+        assert self._bind is not None
+        self.position = await run_in_threadpool(changes.latest_seq, self._bind)
+        self._ready.set()
+        loop = asyncio.get_running_loop()
+        keepalive_at = loop.time() + self.keepalive_seconds
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._subscribers:
+                return
+            if loop.time() >= keepalive_at:
+                keepalive_at = loop.time() + self.keepalive_seconds
+                for subscription in self._subscribers:
+                    subscription.queue.put_nowait(KEEP_ALIVE)
+            try:
+                while True:
+                    rows = await run_in_threadpool(
+                        changes.since, self._bind, self.position, limit=FETCH_BATCH
+                    )
+                    for row in rows:
+                        self._publish(row)
+                    if len(rows) < FETCH_BATCH:
+                        break
+            except Exception:
+                logger.exception("Reading the interaction change feed failed")
+
+    def _publish(self, row: Row[Any]) -> None:
+        frame = sse_frame(row)
+        mapping = row._mapping
+        patient_id, outcome = mapping["patient_id"], mapping["outcome"]
+        for subscription in list(self._subscribers):
+            if not subscription.matches(patient_id, outcome):
+                continue
+            if subscription.queue.qsize() >= self.max_queued:
+                self._subscribers.discard(subscription)
+                subscription.queue.put_nowait(None)
+            else:
+                subscription.queue.put_nowait(frame)
+        self.position = frame[0]
+
+
+hub = ChangeFeedHub(
+    settings.STREAM_POLL_SECONDS,
+    settings.STREAM_MAX_QUEUED,
+    settings.STREAM_KEEPALIVE_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def wake_on_commit(session: Session) -> None:
+    if session.info.pop(changes.CHANGES_PENDING, False):
+        hub.wake()
+
+
+async def event_stream(
+    bind: Engine, subscription: Subscription, last_event_id: int | None
+) -> AsyncIterator[bytes]:
+    """
+    SSE body for one subscriber: the changes after `last_event_id` from the
+    table, then live frames from the hub, with keep-alive comments between.
+    """
+    try:
+        after = last_event_id
+        while after is not None and after < subscription.position:
+            rows = await run_in_threadpool(
+                changes.since,
+                bind,
+                after,
+                list(subscription.patient_ids),
+                list(subscription.outcomes),
+                subscription.position,
+                FETCH_BATCH,
+            )
+            for row in rows:
+                yield sse_frame(row)[1]
+            after = rows[-1].seq if len(rows) == FETCH_BATCH else None
+
+        queue = subscription.queue
+        while True:
+            # Everything queued since the last wake-up goes out in one write
+            frames = [await queue.get()]
+            while not queue.empty() and len(frames) < FETCH_BATCH:
+                frames.append(queue.get_nowait())
+            body = b"".join(
+                frame[1]
+                for frame in frames
+                if frame is not None
+                and (last_event_id is None or frame[0] > last_event_id or not frame[0])
+            )
+            if body:
+                yield body
+            if None in frames:
+                return
+    finally:
+        hub.unsubscribe(subscription)
@@ -5,6 +5,129 @@ class Settings(BaseSettings):
     # TODO: Use a proper secret manager for prod credentials
     DATABASE_URL: str = "sqlite:///./test.db"
     DB_ECHO: bool = False
+    # Read replicas for the read-only sessions of GET handlers (JSON list in
+    # the environment), used round-robin; an unreachable one is skipped for
+    # REPLICA_RETRY_SECONDS. Clients that wrote within READ_YOUR_WRITES_SECONDS
+    # (last-write cookie or X-Last-Write header) read from the primary.
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_RETRY_SECONDS: float = 30.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Create/upgrade the schema at startup (once per SCHEMA_VERSION, under a
+    # lock). When off, workers only check the version and refuse to start on a
+    # mismatch; run `python -m app.tools.migrate` before rolling them out.
+    DB_INIT_ON_STARTUP: bool = True
+
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Applied to every new SQLite connection. WAL lets readers run alongside the
+    # single writer; busy_timeout makes writers wait instead of failing with
+    # "database is locked". Negative cache_size is in KiB.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64_000
+
+    # Serve the v1 CRUD endpoints from the async engine instead of the threadpool.
+    DB_ASYNC: bool = False
+    # Derived from DATABASE_URL (aiosqlite / asyncpg driver) when not set.
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Seconds between cheap version checks of the in-process outcome registry.
+    OUTCOME_REGISTRY_CHECK_INTERVAL: float = 5.0
+
+    # Rows per INSERT/commit and upper bound per request for bulk uploads.
+    BULK_CHUNK_SIZE: int = 1000
+    BULK_MAX_ROWS: int = 50_000
+
+    # Interactions removed per DELETE statement/commit when deleting a patient.
+    DELETE_CHUNK_SIZE: int = 5000
+
+    # Responses to creates sent with an Idempotency-Key are replayed to
+    # retries for this long; the most recent ones are also kept in memory.
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 3600
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+
+    # Change feed at GET /api/v1/interactions/stream. Changes are kept for
+    # STREAM_RETENTION_HOURS so clients can resume with Last-Event-ID. While
+    # anyone is subscribed, each worker also polls for changes every
+    # STREAM_POLL_SECONDS, which picks up writes made by other workers.
+    # Subscribers more than STREAM_MAX_QUEUED events behind are disconnected.
+    STREAM_RETENTION_HOURS: float = 24.0
+    STREAM_POLL_SECONDS: float = 1.0
+    STREAM_KEEPALIVE_SECONDS: float = 15.0
+    STREAM_MAX_QUEUED: int = 1000
+
+    # Outbox worker started with the app: OUTBOX_WORKER_THREADS threads per
+    # process claim OUTBOX_BATCH_SIZE messages at a time for
+    # OUTBOX_LEASE_SECONDS, and poll every OUTBOX_POLL_SECONDS when idle. A
+    # failed message is retried after OUTBOX_BACKOFF_SECONDS, doubling up to
+    # OUTBOX_BACKOFF_MAX_SECONDS, and dead-lettered after OUTBOX_MAX_ATTEMPTS.
+    # Off by default: nothing registers a handler yet, so nothing is enqueued.
+    OUTBOX_WORKER_ENABLED: bool = False
+    OUTBOX_WORKER_THREADS: int = 1
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: float = 60.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_SECONDS: float = 1.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 300.0
+
+    # Audit log of patient, interaction and outcome writes. Entries are
+    # queued at commit and inserted by a background writer, up to
+    # AUDIT_BATCH_SIZE per INSERT; with AUDIT_QUEUE_SIZE transactions
+    # waiting, commits wait for the writer.
+    AUDIT_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 1000
+    AUDIT_QUEUE_SIZE: int = 10_000
+
+    # Rows fetched per round-trip (yield_per) by the streaming exports.
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Monthly gzip NDJSON files of archived interactions, and how many recent
+    # months (including the current one) `app.tools.archive_interactions` keeps.
+    ARCHIVE_DIR: str = "./archive"
+    ARCHIVE_HOT_MONTHS: int = 12
+
+    # Request/SQL instrumentation exposed at /metrics; slower requests are logged.
+    METRICS_ENABLED: bool = True
+    METRICS_SLOW_REQUEST_MS: float = 1000.0
+
+    # Load shedding on the /api/v1 routes, per route class (reads, writes):
+    # a token bucket per client address (429 when empty) and a concurrency
+    # limit between MIN and MAX that backs off while responses start slower
+    # than CONCURRENCY_TARGET_LATENCY_MS (503 when reached). Behind proxies
+    # listed in TRUSTED_PROXIES (JSON list of addresses), clients are keyed on
+    # their X-Forwarded-For address instead of the proxy's.
+    LOAD_SHEDDING_ENABLED: bool = False
+    TRUSTED_PROXIES: list[str] = []
+    RATE_LIMIT_READ_PER_SECOND: float = 50.0
+    RATE_LIMIT_READ_BURST: int = 100
+    RATE_LIMIT_WRITE_PER_SECOND: float = 10.0
+    RATE_LIMIT_WRITE_BURST: int = 20
+    CONCURRENCY_LIMIT_MIN: int = 4
+    CONCURRENCY_LIMIT_MAX: int = 64
+    CONCURRENCY_TARGET_LATENCY_MS: float = 250.0
+
+    # Cache-Control max-age of the outcome reference data. Patient data is
+    # always "private, no-cache": clients revalidate with If-None-Match.
+    OUTCOMES_CACHE_MAX_AGE: int = 60
+
+    # Serve list endpoints from plain column rows encoded with orjson, skipping
+    # per-row response_model validation. The response schema is unchanged.
+    FAST_JSON_RESPONSES: bool = False
+
+    # Group commit: when > 0, single-row creates from concurrent requests are
+    # collected for this many milliseconds and committed in one transaction
+    # (sync stack only). Each request still waits for its own row to commit.
+    GROUP_COMMIT_WINDOW_MS: float = 0.0
+    GROUP_COMMIT_MAX_BATCH: int = 500
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,40 +1,290 @@
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
 
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Connection, Engine, event, make_url, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import settings
-from app.models import Outcome
+from app.core.config import Settings, settings
+from app.core.metrics import instrument_engine
+from app.core.replicas import ReplicaRouter
+from app.models import Outcome, RegistryVersion, SchemaVersion
+from app.services.outcome_registry import REGISTRY_NAME
+from app.services.stats import UPSERT_DIALECTS
 
-# SQLite specific argument to allow multi-threaded access in Dev
-connect_args = {"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+# Arbitrary pg_advisory_lock key serialising init_db across workers
+INIT_LOCK_KEY = 7_061_697_465
 
-# echo=True logs SQL queries to console
-engine = create_engine(
-    settings.DATABASE_URL, connect_args=connect_args, echo=settings.DB_ECHO
+
+def engine_options(url: str, config: Settings = settings) -> dict[str, Any]:
+    """Pool and driver arguments for `create_engine` from the Settings profile."""
+    parsed = make_url(url)
+    options: dict[str, Any] = {"echo": config.DB_ECHO}
+    if parsed.get_backend_name() == "sqlite":
+        # SQLite specific argument to allow multi-threaded access in Dev
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases use a single shared connection, not a pool
+            return options
+    options.update(
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine, config: Settings = settings) -> None:
+    """Apply the SQLite pragma profile to every connection `engine` opens."""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": config.SQLITE_CACHE_SIZE,
+    }
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(url: str, config: Settings = settings) -> Engine:
+    engine = create_engine(url, **engine_options(url, config))
+    install_sqlite_pragmas(engine, config)
+    if config.METRICS_ENABLED:
+        instrument_engine(engine)
+    return engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+
+replica_router = ReplicaRouter(
+    engine,
+    [create_db_engine(url) for url in settings.DATABASE_REPLICA_URLS],
+    settings.REPLICA_RETRY_SECONDS,
+    settings.READ_YOUR_WRITES_SECONDS,
 )
 
+# Async drivers for the sync URLs we support.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{dialect}' URLs")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    """
+    Lazily creates the async engine, so deployments running the sync stack
+    do not need the async driver installed.
+    """
+    url = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(url, **engine_options(url))
+    install_sqlite_pragmas(async_engine.sync_engine)
+    if settings.METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine)
+    return async_engine
+
 
 def get_session() -> Generator[Session, None, None]:
     """
     Dependency Injection provider for Database Sessions.
-    Ensures session is closed after request completes.
+    Ensures session is closed after request completes. Objects stay loaded
+    after commit, so handlers return what they wrote without a refresh SELECT.
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+class LazySession:
+    """
+    Stands in for a `Session` and only creates it on first use, so a request
+    whose handler never touches the database costs neither a session nor a
+    threadpool hop to close it.
+    """
+
+    def __init__(self, factory: Callable[[], Session]) -> None:
+        self._factory = factory
+        self._session: Session | None = None
+
+    @property
+    def used(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self) -> None:
+        if self._session is not None:
+            bind = self._session.bind
+            self._session.close()
+            # Sessions opened on their own connection hand it back too
+            if isinstance(bind, Connection):
+                bind.close()
+
+
+@asynccontextmanager
+async def lazy_session(factory: Callable[[], Session]) -> AsyncIterator[Session]:
+    # Async, so setup and the no-op teardown stay on the event loop
+    lazy = LazySession(factory)
+    try:
+        yield lazy  # type: ignore[misc]
+    finally:
+        if lazy.used:
+            await run_in_threadpool(lazy.close)
+
+
+async def get_lazy_session() -> AsyncGenerator[Session, None]:
+    """`get_session` for handlers that may answer without the database."""
+    async with lazy_session(lambda: Session(engine, expire_on_commit=False)) as session:
         yield session
 
 
-def init_db() -> None:
+def read_session(request: Request | None = None) -> Session:
     """
-    Creates tables based on SQLModel definitions.
+    Read-only session on a connection picked by the replica router, in
+    autocommit mode (no BEGIN/ROLLBACK round trips) and without autoflush.
+    """
+    connection = replica_router.connect(request)
+    connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+    return Session(connection, autoflush=False, expire_on_commit=False)
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[Session, None]:
+    """
+    Lazy `read_session` for GET handlers. Handlers using it must not write.
+    """
+    async with lazy_session(lambda: read_session(request)) as session:
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of `get_session`, used by the async v1 endpoints.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+# Bump with every change to the models or the seed data, so the next start
+# (or `python -m app.tools.migrate`) applies it once for all workers.
+SCHEMA_VERSION = 6
+
+DEFAULT_OUTCOMES = ("Healthy", "Monitor", "Critical")
+
+
+def init_db(force: bool = False) -> None:
+    """
+    Create the tables and seed reference data, once per SCHEMA_VERSION.
+    When the database is already current this is a single read; otherwise
+    the first worker to take the init lock applies the schema and the
+    others wait and find it done.
     In production, this would be replaced by Alembic migrations.
     """
     # TODO: Switch to Alembic for proper migration management in prod
-    SQLModel.metadata.create_all(engine)
-
-    # Seed default outcomes
-    with Session(engine) as session:
-        defaults = ["Healthy", "Monitor", "Critical"]
-        for code in defaults:
-            if not session.get(Outcome, code):
-                session.add(Outcome(code=code, description="System Default"))
-        session.commit()
+    if not force and schema_version() == SCHEMA_VERSION:
+        return
+    with init_lock():
+        if not force and schema_version() == SCHEMA_VERSION:
+            return
+        SQLModel.metadata.create_all(engine)
+        # create_all skips existing tables; add indexes declared since then
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        with Session(engine) as session:
+            _seed(session)
+            session.merge(SchemaVersion(version=SCHEMA_VERSION))
+            session.commit()
+
+
+def schema_version() -> int | None:
+    """The SCHEMA_VERSION last applied to the database, None if never."""
+    try:
+        with Session(engine) as session:
+            row = session.get(SchemaVersion, 1)
+    except DBAPIError:
+        # No schema_version table yet
+        return None
+    return row.version if row else None
+
+
+def verify_schema() -> None:
+    """Fail fast when the database was not migrated to this code's schema."""
+    current = schema_version()
+    if current != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version is {current}, expected {SCHEMA_VERSION}; "
+            "run `python -m app.tools.migrate`."
+        )
+
+
+@contextmanager
+def init_lock() -> Iterator[None]:
+    """
+    Serialises `init_db` across processes: a Postgres advisory lock, or an
+    exclusive lock on a file next to a SQLite database.
+    """
+    backend, database = engine.url.get_backend_name(), engine.url.database
+    key = {"key": INIT_LOCK_KEY}
+    if backend == "postgresql":
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), key)
+            try:
+                yield
+            finally:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), key)
+        return
+    if backend == "sqlite" and database not in (None, "", ":memory:"):
+        import fcntl  # POSIX only, like the deployment image
+
+        with open(f"{database}.init.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return
+    yield
+
+
+def _seed(session: Session) -> None:
+    """Default outcomes and the registry version row, one upsert each."""
+    outcomes = [
+        {"code": code, "description": "System Default"} for code in DEFAULT_OUTCOMES
+    ]
+    registry = [{"name": REGISTRY_NAME, "version": 0}]
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is None:
+        for row in outcomes:
+            if not session.get(Outcome, row["code"]):
+                session.add(Outcome(**row))
+        if not session.get(RegistryVersion, REGISTRY_NAME):
+            session.add(RegistryVersion(**registry[0]))
+        return
+    session.execute(upsert(Outcome).on_conflict_do_nothing(), outcomes)
+    session.execute(upsert(RegistryVersion).on_conflict_do_nothing(), registry)
@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+# Inserts a batch of rows in the given session; the committer commits.
+BatchWriter = Callable[[Session, Sequence[dict[str, Any]]], None]
+
+
+class GroupCommitter:
+    """
+    Coalesces single-row inserts from concurrent requests into one transaction.
+
+    `submit` queues a row and blocks until it is committed. A background thread
+    takes the first queued row, keeps collecting for `window_ms` (or until
+    `max_batch` rows), then writes the batch with one executemany and one
+    commit. If the batch fails, its rows are retried one transaction each so
+    a bad row only fails its own request.
+    """
+
+    def __init__(self, write: BatchWriter, window_ms: float, max_batch: int) -> None:
+        self.write = write
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+        self._queue: queue.Queue[tuple[Engine, dict[str, Any], Future[None]]] = (
+            queue.Queue()
+        )
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, bind: Engine, row: dict[str, Any]) -> None:
+        future: Future[None] = Future()
+        self._ensure_started()
+        self._queue.put((bind, row, future))
+        future.result()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            by_bind: dict[Engine, list[tuple[dict[str, Any], Future[None]]]] = {}
+            for bind, row, future in batch:
+                by_bind.setdefault(bind, []).append((row, future))
+            for bind, pending in by_bind.items():
+                self._flush(bind, pending)
+
+    def _flush(
+        self, bind: Engine, pending: list[tuple[dict[str, Any], Future[None]]]
+    ) -> None:
+        try:
+            self._commit(bind, [row for row, _ in pending])
+        except Exception as exc:
+            if len(pending) == 1:
+                pending[0][1].set_exception(exc)
+                return
+            for row, future in pending:
+                self._flush(bind, [(row, future)])
+            return
+        for _, future in pending:
+            future.set_result(None)
+
+    def _commit(self, bind: Engine, rows: Sequence[dict[str, Any]]) -> None:
+        with Session(bind) as session:
+            self.write(session, rows)
+            session.commit()
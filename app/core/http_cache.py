@@ -0,0 +1,36 @@
+"""
+Conditional GET helpers: strong ETags, `If-None-Match` handling and
+`Cache-Control` for the read endpoints.
+"""
+
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Patient data: clients may keep a copy but must revalidate every time.
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag over the parts that determine a representation."""
+    key = "\x1f".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(key, digest_size=12).hexdigest()}"'
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Response | None:
+    """A 304 response if the client already holds `etag`, otherwise None."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # If-None-Match uses the weak comparison
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag not in tags and "*" not in tags:
+        return None
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -0,0 +1,294 @@
+"""
+`Idempotency-Key` support for the create endpoints.
+
+Gateways retry POSTs that timed out. A request carrying the header runs
+once per key and path; retries get the stored response back (with
+`Idempotent-Replayed: true`) without reaching the handler. Responses are
+kept in an in-process LRU with a TTL, in front of the `idempotency_key`
+table that all workers share. Requests with a key that is still running
+wait for it on the same worker and get 409 on another. Reusing a key with
+a different body is a 422. 5xx responses and errors are not stored, so the
+request can be retried.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, delete
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models import IdempotencyRecord
+from app.models.interaction import utcnow
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENT_PATHS = {"/api/v1/patients/", "/api/v1/interactions/"}
+MAX_KEY_LENGTH = 255
+# Expired rows are deleted by every PURGE_EVERY-th claim.
+PURGE_EVERY = 1000
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    content_type: str | None
+    body: bytes
+
+
+class KeyInUse(Exception):
+    """Another worker is still running a request with this key."""
+
+
+class IdempotencyStore:
+    """Stored responses by (path, key): an LRU with TTL over the table."""
+
+    def __init__(
+        self,
+        engine: Engine,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 10_000,
+    ) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._cache: OrderedDict[tuple[str, str], tuple[float, StoredResponse]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._claims = itertools.count(1)
+
+    def cached(self, path: str, key: str) -> StoredResponse | None:
+        with self._lock:
+            entry = self._cache.get((path, key))
+            if entry is None:
+                return None
+            expires, response = entry
+            if expires < time.monotonic():
+                del self._cache[(path, key)]
+                return None
+            self._cache.move_to_end((path, key))
+            return response
+
+    def remember(self, path: str, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            expires = time.monotonic() + self.ttl_seconds
+            self._cache[(path, key)] = (expires, response)
+            self._cache.move_to_end((path, key))
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def claim(self, path: str, key: str, fingerprint: str) -> StoredResponse | None:
+        """
+        Record that this worker runs the request. Returns the stored response
+        instead if the key has already completed, and raises KeyInUse while
+        it is running elsewhere.
+        """
+        cutoff = utcnow() - timedelta(seconds=self.ttl_seconds)
+        with Session(self.engine) as session:
+            if next(self._claims) % PURGE_EVERY == 0:
+                session.exec(
+                    delete(IdempotencyRecord).where(
+                        IdempotencyRecord.created_at < cutoff
+                    )
+                )
+            record = session.get(IdempotencyRecord, (path, key))
+            if record is not None and record.created_at < cutoff:
+                session.delete(record)
+                session.flush()
+                record = None
+            if record is None:
+                session.add(
+                    IdempotencyRecord(path=path, key=key, fingerprint=fingerprint)
+                )
+                try:
+                    session.commit()
+                    return None
+                except IntegrityError:
+                    # Claimed by another worker in the meantime
+                    session.rollback()
+                    record = session.get(IdempotencyRecord, (path, key))
+            if record is None or record.status_code is None:
+                raise KeyInUse(key)
+            response = StoredResponse(
+                record.fingerprint,
+                record.status_code,
+                record.content_type,
+                record.body or b"",
+            )
+        self.remember(path, key, response)
+        return response
+
+    def complete(self, path: str, key: str, response: StoredResponse) -> None:
+        self.remember(path, key, response)
+        with Session(self.engine) as session:
+            record = session.get(IdempotencyRecord, (path, key))
+            if record is None:
+                return
+            record.status_code = response.status_code
+            record.content_type = response.content_type
+            record.body = response.body
+            session.add(record)
+            session.commit()
+
+    def release(self, path: str, key: str) -> None:
+        """Forget a claim whose request failed, so a retry runs it again."""
+        with Session(self.engine) as session:
+            session.exec(
+                delete(IdempotencyRecord).where(
+                    IdempotencyRecord.path == path,
+                    IdempotencyRecord.key == key,
+                    IdempotencyRecord.status_code.is_(None),  # type: ignore[union-attr]
+                )
+            )
+            session.commit()
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware for POSTs to IDEMPOTENT_PATHS carrying an
+    `Idempotency-Key`. Other requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore | None = None) -> None:
+        self.app = app
+        if store is None:
+            store = IdempotencyStore(
+                engine,
+                settings.IDEMPOTENCY_TTL_SECONDS,
+                settings.IDEMPOTENCY_CACHE_SIZE,
+            )
+        self.store = store
+        # Requests being run on this worker, by (path, key)
+        self._running: dict[tuple[str, str], asyncio.Future[None]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = None
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "POST"
+            and scope["path"] in IDEMPOTENT_PATHS
+        ):
+            key = Headers(scope=scope).get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response: Response = JSONResponse(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} chars."},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await read_body(receive)
+        fingerprint = hashlib.sha256(body).hexdigest()
+        path = scope["path"]
+        # Join a request with the same key already running here
+        while (running := self._running.get((path, key))) is not None:
+            await asyncio.shield(running)
+
+        stored = self.store.cached(path, key)
+        if stored is None:
+            done = asyncio.get_running_loop().create_future()
+            self._running[(path, key)] = done
+            try:
+                stored = await run_in_threadpool(
+                    self.store.claim, path, key, fingerprint
+                )
+                if stored is None:
+                    await self._run(path, key, fingerprint, body, scope, receive, send)
+                    return
+            except KeyInUse:
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is in progress."},
+                    status_code=409,
+                    headers={"Retry-After": "1"},
+                )
+                await response(scope, receive, send)
+                return
+            finally:
+                del self._running[(path, key)]
+                done.set_result(None)
+
+        if stored.fingerprint != fingerprint:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key was already used with another request."},
+                status_code=422,
+            )
+        else:
+            response = Response(
+                stored.body,
+                status_code=stored.status_code,
+                media_type=stored.content_type,
+                headers={REPLAYED_HEADER: "true"},
+            )
+        await response(scope, receive, send)
+
+    async def _run(
+        self,
+        path: str,
+        key: str,
+        fingerprint: str,
+        body: bytes,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Run the request we claimed, storing its response."""
+        status_code = 500
+        content_type = None
+        chunks: list[bytes] = []
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await run_in_threadpool(self.store.release, path, key)
+            raise
+        if status_code >= 500:
+            await run_in_threadpool(self.store.release, path, key)
+            return
+        response = StoredResponse(
+            fingerprint, status_code, content_type, b"".join(chunks)
+        )
+        await run_in_threadpool(self.store.complete, path, key, response)
+
+
+async def read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
@@ -0,0 +1,211 @@
+"""
+Rate limiting and load shedding for the v1 API.
+
+Requests are split into route classes: reads (GET/HEAD/OPTIONS) and writes.
+Each client address has a token bucket per class; a client over its rate
+gets 429. The address is the connection's peer, unless that is one of
+TRUSTED_PROXIES: then it is the last X-Forwarded-For hop not added by a
+trusted proxy (without TRUSTED_PROXIES, every client behind a proxy or
+load balancer shares its bucket). Each class also has a concurrency limit
+that follows latency (AIMD): it starts at the maximum, grows by one per
+round of fast responses while in use, and is cut by `backoff` once per
+round in which responses start slower than the target. A request over the
+limit gets 503 straight away instead of queueing for the threadpool, so
+the requests that are admitted keep their latency. Both rejections carry
+`Retry-After`.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Collection
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, settings
+from app.core.replicas import READ_METHODS
+
+API_PREFIX = "/api/v1/"
+# Long-lived responses: rate limited, but not held against the concurrency
+# limit (nor their duration fed back into it).
+LONG_LIVED_PATHS = {"/api/v1/interactions/stream"}
+# Buckets kept for this many recently seen clients; others start full again.
+MAX_TRACKED_CLIENTS = 10_000
+
+
+def route_class(scope: Scope) -> str | None:
+    """'read' or 'write' for v1 API requests, None for unlimited paths."""
+    if not scope["path"].startswith(API_PREFIX):
+        return None
+    return "read" if scope["method"] in READ_METHODS else "write"
+
+
+def client_key(scope: Scope, trusted_proxies: Collection[str]) -> str:
+    """The address a request is rate limited by."""
+    client = scope["client"][0] if scope.get("client") else "unknown"
+    if client not in trusted_proxies:
+        return client
+    forwarded = [
+        value.decode("latin-1")
+        for name, value in scope["headers"]
+        if name == b"x-forwarded-for"
+    ]
+    # Walk back from the nearest hop: earlier entries are client-supplied
+    hops = [hop.strip() for hop in ",".join(forwarded).split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if hop not in trusted_proxies:
+            return hop
+    return client
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    burst: int
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = float(self.burst)
+
+    def take(self, now: float | None = None) -> float:
+        """Take a token: 0 if one was available, else seconds until one is."""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by client, evicting the least recently seen."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def take(self, client: str) -> float:
+        bucket = self._buckets.pop(client, None) or TokenBucket(self.rate, self.burst)
+        self._buckets[client] = bucket
+        if len(self._buckets) > MAX_TRACKED_CLIENTS:
+            self._buckets.popitem(last=False)
+        return bucket.take()
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit driven by the latency of admitted requests."""
+
+    def __init__(
+        self,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        backoff: float = 0.9,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.backoff = backoff
+        # Start open and let slow responses find the limit: starting at the
+        # minimum would shed a burst that arrives before it has grown
+        self.limit = float(maximum)
+        self.inflight = 0
+        self._cut_at = 0.0
+
+    def acquire(self) -> bool:
+        if self.inflight >= int(self.limit):
+            return False
+        self.inflight += 1
+        return True
+
+    def release(self) -> None:
+        self.inflight -= 1
+
+    def observe(self, started: float, seconds: float) -> None:
+        """Feed back the latency of a request admitted at `started`."""
+        if seconds > self.target_seconds:
+            # Requests admitted before the last cut reflect the old limit
+            if started >= self._cut_at:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._cut_at = time.monotonic()
+        elif self.inflight >= self.limit / 2:
+            # Only grow while the limit is actually in use
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+
+class LoadSheddingMiddleware:
+    """
+    Pure ASGI middleware applying the per-client rate limits and the
+    adaptive concurrency limit of each route class. Runs on the event loop
+    only, so its state needs no locking.
+    """
+
+    def __init__(self, app: ASGIApp, config: Settings = settings) -> None:
+        self.app = app
+        self.trusted_proxies = frozenset(config.TRUSTED_PROXIES)
+        self.rate_limiters = {
+            "read": RateLimiter(
+                config.RATE_LIMIT_READ_PER_SECOND, config.RATE_LIMIT_READ_BURST
+            ),
+            "write": RateLimiter(
+                config.RATE_LIMIT_WRITE_PER_SECOND, config.RATE_LIMIT_WRITE_BURST
+            ),
+        }
+        self.limits = {
+            name: AdaptiveLimit(
+                config.CONCURRENCY_LIMIT_MIN,
+                config.CONCURRENCY_LIMIT_MAX,
+                config.CONCURRENCY_TARGET_LATENCY_MS / 1000,
+            )
+            for name in ("read", "write")
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        name = route_class(scope) if scope["type"] == "http" else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope, self.trusted_proxies)
+        wait = self.rate_limiters[name].take(client)
+        if wait:
+            response = reject(429, "Too many requests", wait)
+            await response(scope, receive, send)
+            return
+        if scope["path"] in LONG_LIVED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        limit = self.limits[name]
+        if not limit.acquire():
+            response = reject(503, "Server is overloaded, retry shortly", 1.0)
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        observed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal observed
+            # Time to first byte: streaming bodies would skew the signal
+            if message["type"] == "http.response.start" and not observed:
+                observed = True
+                limit.observe(started, time.monotonic() - started)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            limit.release()
+
+
+def reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
@@ -0,0 +1,202 @@
+"""
+Per-request instrumentation: request counts, latency histograms, and the
+number of SQL statements and time spent in SQL, keyed by route template.
+Exposed in Prometheus text format via `registry.render`.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNTERS = (
+    ("http_request_sql_statements_total", "SQL statements by route.", "statements"),
+    ("http_request_sql_seconds_total", "Time spent in SQL by route.", "sql_seconds"),
+)
+
+
+@dataclass
+class RequestStats:
+    """SQL work done on behalf of the current request."""
+
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+# Set per request by the middleware. Sync handlers run in the threadpool with
+# a copy of the context, which still points at the same RequestStats object.
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@dataclass
+class RouteMetrics:
+    requests: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    seconds: float = 0.0
+    count: int = 0
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._routes: dict[tuple[str, str], RouteMetrics] = defaultdict(RouteMetrics)
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        stats: RequestStats,
+    ) -> None:
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._routes[(method, route)]
+            metrics.requests[status_code] += 1
+            if bucket < len(LATENCY_BUCKETS):
+                metrics.buckets[bucket] += 1
+            metrics.seconds += seconds
+            metrics.count += 1
+            metrics.statements += stats.statements
+            metrics.sql_seconds += stats.sql_seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_requests_total Requests by route, method and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), metrics in routes:
+                for status_code, count in sorted(metrics.requests.items()):
+                    labels = f'method="{method}",route="{route}",status="{status_code}"'
+                    lines.append(f"http_requests_total{{{labels}}} {count}")
+
+            lines += [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), metrics in routes:
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, metrics.buckets):
+                    cumulative += count
+                    lines.append(
+                        f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}}'
+                        f" {cumulative}"
+                    )
+                lines += [
+                    f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+                    f" {metrics.count}",
+                    f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds}",
+                    f"http_request_duration_seconds_count{{{labels}}} {metrics.count}",
+                ]
+
+            for name, help_text, attribute in SQL_COUNTERS:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), metrics in routes:
+                    labels = f'method="{method}",route="{route}"'
+                    lines.append(f"{name}{{{labels}}} {getattr(metrics, attribute)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attribute every statement executed on `engine` to the current request.
+    These hooks run for every statement, so they are kept to a timestamp on
+    the statement's execution context and two additions.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(
+        conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, *_: Any
+    ) -> None:
+        if context is not None:
+            context.metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(
+        conn: Any, cursor: Any, statement: Any, parameters: Any, context: Any, *_: Any
+    ) -> None:
+        stats = _current.get()
+        if stats is not None and context is not None:
+            stats.statements += 1
+            stats.sql_seconds += time.perf_counter() - context.metrics_started
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route, e.g. `/api/v1/patients/{patient_id}`.
+    The route may only know its path relative to the router it was included
+    in, so its segments replace the matching tail of the request path.
+    """
+    route = scope.get("route")
+    if route is None:
+        # Unmatched paths share one label to keep cardinality bounded
+        return "unmatched"
+    prefix = scope["path"].rsplit("/", route.path.count("/"))[0]
+    return prefix + route.path
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware task overhead) recording
+    every HTTP request into the registry and logging slow ones.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = time.perf_counter() - started
+            _current.reset(token)
+            template = route_template(scope)
+            registry.observe(scope["method"], template, status_code, seconds, stats)
+            if seconds * 1000 >= settings.METRICS_SLOW_REQUEST_MS:
+                logger.warning(
+                    "Slow request %s %s: %.1f ms, %d SQL statements, %.1f ms in SQL",
+                    scope["method"],
+                    template,
+                    seconds * 1000,
+                    stats.statements,
+                    stats.sql_seconds * 1000,
+                )
@@ -0,0 +1,89 @@
+"""
+Background runner for the transactional outbox (app.services.outbox).
+
+Each worker process starts OUTBOX_WORKER_THREADS threads from the app's
+lifespan. A thread drains batches of OUTBOX_BATCH_SIZE until the outbox is
+empty, then sleeps until a commit in this process enqueues a message or
+OUTBOX_POLL_SECONDS pass (picking up messages from other processes and
+retries that came due). Claims are leases, so any number of threads and
+processes can drain the same table.
+"""
+
+import logging
+import os
+import socket
+import threading
+
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import outbox
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    def __init__(
+        self, threads: int = 1, batch_size: int = 100, poll_seconds: float = 1.0
+    ) -> None:
+        self.threads = threads
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self, bind: Engine) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        for number in range(self.threads):
+            thread = threading.Thread(
+                target=self._run,
+                args=(bind, f"{prefix}:{number}"),
+                name=f"outbox-{number}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Let running batches finish and stop the threads."""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self) -> None:
+        """Drain now instead of at the next poll. Safe to call from any thread."""
+        if self._threads:
+            self._wake.set()
+
+    def _run(self, bind: Engine, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                claimed = outbox.drain(bind, worker_id, self.batch_size)
+            except Exception:
+                logger.exception("Draining the outbox failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wake.wait(self.poll_seconds)
+                # Stays set once stopping, for threads still finishing a batch
+                if not self._stopping.is_set():
+                    self._wake.clear()
+
+
+worker = OutboxWorker(
+    settings.OUTBOX_WORKER_THREADS,
+    settings.OUTBOX_BATCH_SIZE,
+    settings.OUTBOX_POLL_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def wake_on_commit(session: Session) -> None:
+    if session.info.pop(outbox.OUTBOX_PENDING, False):
+        worker.wake()
@@ -0,0 +1,107 @@
+"""
+Read-replica routing for the read-only sessions of GET handlers.
+
+Replicas are used round-robin. One that fails to connect is skipped for
+`REPLICA_RETRY_SECONDS`, and reads fall back to the primary when none is
+available. Replicas lag behind the primary, so a client that has just
+written carries a last-write token (cookie or header, set on every
+successful write) and is served from the primary until the token is older
+than `READ_YOUR_WRITES_SECONDS`.
+"""
+
+import itertools
+import threading
+import time
+from typing import Sequence
+
+from fastapi import Request
+from sqlalchemy import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: Sequence[Engine] = (),
+        retry_after: float = 30.0,
+        read_your_writes: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_after = retry_after
+        self.read_your_writes = read_your_writes
+        self._next = itertools.count()
+        self._down_until: dict[Engine, float] = {}
+        self._lock = threading.Lock()
+
+    def connect(self, request: Request | None = None) -> Connection:
+        """
+        A connection for a read: the next healthy replica, or the primary for
+        clients that wrote recently and when no replica can be reached.
+        """
+        if request is None or not self.wrote_recently(request):
+            for replica in self._healthy():
+                try:
+                    return replica.connect()
+                except DBAPIError:
+                    with self._lock:
+                        self._down_until[replica] = time.monotonic() + self.retry_after
+        return self.primary.connect()
+
+    def wrote_recently(self, request: Request) -> bool:
+        token = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(
+            LAST_WRITE_COOKIE
+        )
+        try:
+            written = float(token) if token else None
+        except ValueError:
+            return False
+        return written is not None and time.time() - written < self.read_your_writes
+
+    def _healthy(self) -> list[Engine]:
+        if not self.replicas:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._next) % len(self.replicas)
+            ordered = self.replicas[start:] + self.replicas[:start]
+            return [r for r in ordered if self._down_until.get(r, 0.0) <= now]
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware handing out the last-write token (header and cookie)
+    on every successful write request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                token = f"{time.time():.3f}"
+                max_age = max(1, round(settings.READ_YOUR_WRITES_SECONDS))
+                headers = MutableHeaders(scope=message)
+                headers.append(LAST_WRITE_HEADER, token)
+                headers.append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={token}; Max-Age={max_age}; Path=/;"
+                    " HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
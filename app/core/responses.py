@@ -0,0 +1,27 @@
+from typing import Any, Mapping, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, which encodes UUIDs, datetimes, dates
+    and enums natively. Returning it from an endpoint skips `response_model`
+    validation, so the content must already match the declared schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def rows_response(rows: Sequence[Row[Any] | Mapping[str, Any]]) -> FastJSONResponse:
+    """
+    Render rows selected with the columns of a Read schema (or dicts with the
+    same keys) as objects.
+    """
+    content: list[Mapping[str, Any]] = [
+        row._asdict() if isinstance(row, Row) else row for row in rows
+    ]
+    return FastJSONResponse(content)
@@ -3,16 +3,31 @@ from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
 from fastapi import Depends, FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
 from sqlmodel import Session, text
 
 from app.api.v1.api import api_router
-from app.core.database import get_session, init_db
+from app.core import idempotency, load_shedding, metrics, outbox_worker, replicas
+from app.core.config import settings
+from app.core.database import engine, get_lazy_session, init_db, verify_schema
+from app.services import audit
+from app.services.outcome_registry import outcome_registry
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    if settings.DB_INIT_ON_STARTUP:
+        init_db()
+    else:
+        verify_schema()
+    with Session(engine) as session:
+        outcome_registry.load(session)
+    audit.writer.start()
+    if settings.OUTBOX_WORKER_ENABLED:
+        outbox_worker.worker.start(engine)
     yield
+    outbox_worker.worker.stop()
+    audit.writer.stop()
 
 
 API_DESCRIPTION = (
@@ -23,6 +38,7 @@ tags_metadata = [
     {"name": "patients", "description": "Patient demographics."},
     {"name": "interactions", "description": "Clinical documentation."},
     {"name": "configuration", "description": "Reference data management."},
+    {"name": "statistics", "description": "Precomputed outcome statistics."},
 ]
 
 # Add the global dependency so Swagger UI shows the input field for every endpoint
@@ -58,11 +74,27 @@ async def chaos_middleware(request: Request, call_next):
     return response
 
 
+app.add_middleware(idempotency.IdempotencyMiddleware)
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(replicas.ReadYourWritesMiddleware)
+if settings.LOAD_SHEDDING_ENABLED:
+    app.add_middleware(load_shedding.LoadSheddingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
 @app.get("/health")
-def health_check(detail: bool = False, session: Session = Depends(get_session)):
+def health_check(detail: bool = False, session: Session = Depends(get_lazy_session)):
     """Health check endpoint."""
     if not detail:
         return {"status": "ok"}
@@ -1,4 +1,18 @@
+from . import search as search
+from .archive import InteractionArchive as InteractionArchive
+from .audit import AuditAction as AuditAction
+from .audit import AuditEntry as AuditEntry
+from .history_version import HistoryVersion as HistoryVersion
+from .idempotency import IdempotencyRecord as IdempotencyRecord
 from .interaction import Interaction as Interaction
+from .interaction_change import InteractionChange as InteractionChange
+from .outbox import OutboxMessage as OutboxMessage
 from .outcome import Outcome as Outcome
 from .patient import Gender as Gender
 from .patient import Patient as Patient
+from .patient_deletion import DeletionStatus as DeletionStatus
+from .patient_deletion import PatientDeletion as PatientDeletion
+from .registry_version import RegistryVersion as RegistryVersion
+from .schema_version import SchemaVersion as SchemaVersion
+from .stats import DailyOutcomeStats as DailyOutcomeStats
+from .stats import PatientOutcomeStats as PatientOutcomeStats
@@ -0,0 +1,16 @@
+from datetime import date
+
+from sqlmodel import Field, SQLModel
+
+
+class InteractionArchive(SQLModel, table=True):
+    """
+    A calendar month (UTC) of interactions moved out of the `interaction`
+    table into a gzip-compressed NDJSON file under `ARCHIVE_DIR`.
+    """
+
+    __tablename__ = "interaction_archive"
+
+    month: date = Field(primary_key=True)
+    file: str
+    rows: int = 0
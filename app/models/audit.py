@@ -0,0 +1,38 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, Index, SQLModel
+
+from .interaction import utcnow
+
+
+class AuditAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class AuditEntry(SQLModel, table=True):
+    """
+    Append-only record of one write to a patient, interaction or outcome.
+    `before`/`after` hold the changed fields only: all of them for creates
+    (`after`) and deletes (`before`), the differing ones for updates.
+    Entries outlive their entity, so `entity_id` is not a foreign key.
+    """
+
+    __tablename__ = "audit_log"
+    # An entity's history in write order
+    __table_args__ = (
+        Index("ix_audit_log_entity_id_id", "entity_type", "entity_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity_type: str
+    entity_id: str
+    action: AuditAction
+    before: Optional[dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    after: Optional[dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    recorded_at: datetime = Field(default_factory=utcnow)
@@ -0,0 +1,16 @@
+import uuid
+
+from sqlmodel import Field, SQLModel
+
+
+class HistoryVersion(SQLModel, table=True):
+    """
+    Per-patient counter bumped in the same transaction as every write to the
+    patient's interactions. Conditional GETs of the history compare it
+    instead of loading rows.
+    """
+
+    __tablename__ = "history_version"
+
+    patient_id: uuid.UUID = Field(foreign_key="patient.id", primary_key=True)
+    version: int = 0
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+from .interaction import utcnow
+
+
+class IdempotencyRecord(SQLModel, table=True):
+    """
+    The response to a create request sent with an `Idempotency-Key`, so a
+    retry on any worker replays it. `status_code` is None while the first
+    request is still running.
+    """
+
+    __tablename__ = "idempotency_key"
+
+    path: str = Field(primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    fingerprint: str
+    status_code: Optional[int] = None
+    content_type: Optional[str] = None
+    body: Optional[bytes] = None
+    created_at: datetime = Field(default_factory=utcnow, index=True)
@@ -2,23 +2,50 @@ import uuid
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlmodel import Field, Index, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from .patient import Patient
 
 
+def utcnow() -> datetime:
+    """
+    Current time as naive UTC, the form the (timezone-less) column returns,
+    so a freshly created interaction serialises like one read back later.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """`value` in the naive UTC form the timestamp column stores."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 class InteractionBase(SQLModel):
     notes: str
     outcome: str
 
 
 class Interaction(InteractionBase, table=True):
+    # Keyset order (timestamp, id) within a patient, an outcome, or both;
+    # `since`/`until` become a range scan on the timestamp column
+    __table_args__ = (
+        Index("ix_interaction_patient_timestamp_id", "patient_id", "timestamp", "id"),
+        Index("ix_interaction_outcome_timestamp_id", "outcome", "timestamp", "id"),
+        Index(
+            "ix_interaction_patient_outcome_timestamp_id",
+            "patient_id",
+            "outcome",
+            "timestamp",
+            "id",
+        ),
+    )
+
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
 
-    timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), index=True
-    )
+    timestamp: datetime = Field(default_factory=utcnow, index=True)
 
     patient_id: uuid.UUID = Field(foreign_key="patient.id", index=True)
 
@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+from .interaction import utcnow
+
+
+class InteractionChange(SQLModel, table=True):
+    """
+    One row per interaction create or update; `seq` orders the change feed
+    and is the SSE event id clients resume from. AUTOINCREMENT keeps SQLite
+    from reusing sequence numbers after old rows are pruned.
+    """
+
+    __tablename__ = "interaction_change"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    interaction_id: uuid.UUID
+    created_at: datetime = Field(default_factory=utcnow, index=True)
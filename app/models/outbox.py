@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import JSON, Column
+from sqlmodel import Field, SQLModel
+
+from .interaction import utcnow
+
+
+class OutboxMessage(SQLModel, table=True):
+    """
+    Post-write work, inserted in the transaction of the write that caused it
+    and deleted once handled (app.services.outbox).
+
+    A message can be claimed while `available_at` has passed. Claiming sets
+    `claimed_by` and pushes `available_at` out by the lease, so the message
+    of a worker that died is claimed again once its lease runs out; failures
+    push it out by the retry backoff. `dead_at` is set once the message has
+    failed OUTBOX_MAX_ATTEMPTS times; it is then kept but never claimed.
+    """
+
+    __tablename__ = "outbox_message"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    topic: str
+    payload: dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    attempts: int = 0
+    available_at: datetime = Field(default_factory=utcnow, index=True)
+    claimed_by: Optional[str] = None
+    last_error: Optional[str] = None
+    dead_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=utcnow)
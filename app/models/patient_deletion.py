@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+from .interaction import utcnow
+
+
+class DeletionStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class PatientDeletion(SQLModel, table=True):
+    """
+    A background patient deletion, polled by clients after a 202. Outlives
+    the patient it removes, so `patient_id` is not a foreign key.
+    """
+
+    __tablename__ = "patient_deletion"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    patient_id: uuid.UUID = Field(index=True)
+    status: DeletionStatus = DeletionStatus.PENDING
+    deleted_interactions: int = 0
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=utcnow)
+    finished_at: Optional[datetime] = None
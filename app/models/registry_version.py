@@ -0,0 +1,12 @@
+from sqlmodel import Field, SQLModel
+
+
+class RegistryVersion(SQLModel, table=True):
+    """
+    Version counters for in-process caches of reference data.
+    Bumped in the same transaction as every write to the cached table, so
+    other workers can detect a stale copy with a single primary-key read.
+    """
+
+    name: str = Field(primary_key=True)
+    version: int = 0
@@ -0,0 +1,13 @@
+from sqlmodel import Field, SQLModel
+
+
+class SchemaVersion(SQLModel, table=True):
+    """
+    Single row holding the schema/seed revision `init_db` last applied.
+    Workers compare it at startup instead of re-running DDL and seeding.
+    """
+
+    __tablename__ = "schema_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int
@@ -0,0 +1,112 @@
+"""
+Full-text search indexes, created and dropped together with the tables.
+
+SQLite: FTS5 tables kept in sync with `patient` and `interaction` by
+triggers, so every write path (ORM, bulk insert, import) is covered. Rows
+are keyed by the source `id` (an UNINDEXED column, plus a `<fts>_ids` lookup
+table for deletes), never by the source's implicit rowid, which VACUUM may
+renumber. PostgreSQL: GIN expression indexes over `to_tsvector`.
+"""
+
+from typing import Any
+
+from sqlalchemy import Connection, event, text
+from sqlmodel import SQLModel
+
+# Indexed (fts table, source table, columns)
+FTS_TABLES = (
+    ("patient_fts", "patient", ("first_name", "last_name")),
+    ("interaction_fts", "interaction", ("notes",)),
+)
+
+POSTGRES_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_patient_name_fts ON patient USING gin "
+    "(to_tsvector('simple', first_name || ' ' || last_name))",
+    "CREATE INDEX IF NOT EXISTS ix_interaction_notes_fts ON interaction USING gin "
+    "(to_tsvector('simple', notes))",
+)
+
+
+TRIGGER_SUFFIXES = ("ai", "ad", "au")
+
+
+def _sqlite_statements(fts: str, source: str, columns: tuple[str, ...]) -> list[str]:
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    insert = (
+        f"INSERT INTO {fts}(id, {names}) VALUES (new.id, {new}); "
+        f"INSERT INTO {fts}_ids(id, docid) VALUES (new.id, last_insert_rowid());"
+    )
+    delete = (
+        f"DELETE FROM {fts} WHERE rowid = "
+        f"(SELECT docid FROM {fts}_ids WHERE id = old.id); "
+        f"DELETE FROM {fts}_ids WHERE id = old.id;"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {source} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def _drop_sqlite_index(connection: Connection, fts: str) -> None:
+    for suffix in TRIGGER_SUFFIXES:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {fts}_{suffix}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {fts}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {fts}_ids"))
+
+
+def _sqlite_table_exists(connection: Connection, name: str) -> bool:
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"),
+        {"n": name},
+    ).first()
+    return exists is not None
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_search_indexes(target: Any, connection: Connection, **kw: Any) -> None:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        for statement in POSTGRES_INDEXES:
+            connection.execute(text(statement))
+    if dialect != "sqlite":
+        return
+
+    for fts, source, columns in FTS_TABLES:
+        if not _sqlite_table_exists(connection, f"{fts}_ids"):
+            # New database, or an older rowid-keyed index: (re)build from scratch
+            _drop_sqlite_index(connection, fts)
+            names = ", ".join(columns)
+            connection.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE {fts} USING fts5(id UNINDEXED, {names}, "
+                    "tokenize='unicode61 remove_diacritics 2')"
+                )
+            )
+            connection.execute(
+                text(
+                    f"CREATE TABLE {fts}_ids (id CHAR(32) PRIMARY KEY, "
+                    "docid INTEGER NOT NULL) WITHOUT ROWID"
+                )
+            )
+            # Index rows that predate the search tables
+            connection.execute(
+                text(f"INSERT INTO {fts}(id, {names}) SELECT id, {names} FROM {source}")
+            )
+            connection.execute(
+                text(f"INSERT INTO {fts}_ids(id, docid) SELECT id, rowid FROM {fts}")
+            )
+        for statement in _sqlite_statements(fts, source, columns):
+            connection.execute(text(statement))
+
+
+@event.listens_for(SQLModel.metadata, "before_drop")
+def drop_search_indexes(target: Any, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for fts, _, _ in FTS_TABLES:
+        _drop_sqlite_index(connection, fts)
@@ -0,0 +1,28 @@
+import uuid
+from datetime import date
+
+from sqlmodel import Field, SQLModel
+
+
+class PatientOutcomeStats(SQLModel, table=True):
+    """
+    Interactions per patient, outcome and (UTC) day. Maintained incrementally
+    by the interaction writes; rebuildable from `interaction`.
+    """
+
+    __tablename__ = "patient_outcome_stats"
+
+    patient_id: uuid.UUID = Field(foreign_key="patient.id", primary_key=True)
+    outcome: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    count: int = 0
+
+
+class DailyOutcomeStats(SQLModel, table=True):
+    """Interactions per outcome and (UTC) day, across all patients."""
+
+    __tablename__ = "daily_outcome_stats"
+
+    day: date = Field(primary_key=True)
+    outcome: str = Field(primary_key=True)
+    count: int = 0
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import SQLModel
+
+from app.models.audit import AuditAction
+
+
+class AuditEntryRead(SQLModel):
+    id: int
+    entity_type: str
+    entity_id: str
+    action: AuditAction
+    before: dict[str, Any] | None
+    after: dict[str, Any] | None
+    recorded_at: datetime
@@ -1,6 +1,8 @@
 import uuid
 from datetime import datetime
 
+from sqlmodel import SQLModel
+
 from app.models.interaction import InteractionBase
 
 
@@ -23,3 +25,17 @@ class InteractionRead(InteractionBase):
     id: uuid.UUID
     timestamp: datetime
     patient_id: uuid.UUID
+
+
+class BulkInteractionError(SQLModel):
+    """A rejected row of a bulk upload, identified by its position."""
+
+    index: int
+    detail: str
+
+
+class BulkInteractionResult(SQLModel):
+    """Outcome of a bulk upload. Valid rows are stored even if others fail."""
+
+    created: int
+    errors: list[BulkInteractionError]
@@ -1,7 +1,10 @@
 import uuid
 from datetime import date
 
+from sqlmodel import SQLModel
+
 from app.models.patient import Gender, PatientBase
+from app.schemas.interaction import InteractionRead
 
 
 class PatientCreate(PatientBase):
@@ -23,3 +26,28 @@ class PatientRead(PatientBase):
     """Schema for reading a patient."""
 
     id: uuid.UUID
+
+
+class PatientTimeline(PatientRead):
+    """A patient with their most recent interactions, newest first."""
+
+    interactions: list[InteractionRead]
+
+
+class PatientImportError(SQLModel):
+    """A rejected record of an import, by 1-based row number (header excluded)."""
+
+    row: int
+    detail: str
+
+
+class PatientImportResult(SQLModel):
+    """Running totals of a patient import; only the first errors are kept."""
+
+    processed: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[PatientImportError] = []
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
@@ -0,0 +1,22 @@
+import uuid
+
+from sqlmodel import SQLModel
+
+
+class OutcomeCount(SQLModel):
+    outcome: str
+    count: int
+
+
+class OutcomeStatistics(SQLModel):
+    """Interaction counts per outcome, over the last `days` days or all time."""
+
+    days: int | None
+    total: int
+    outcomes: list[OutcomeCount]
+
+
+class PatientSummary(OutcomeStatistics):
+    """Outcome counts of one patient's interactions."""
+
+    patient_id: uuid.UUID
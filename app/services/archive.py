@@ -0,0 +1,202 @@
+"""
+Archive tier for interactions.
+
+Whole calendar months (UTC) older than the hot window are moved out of the
+`interaction` table into one gzip-compressed NDJSON file per month, listed
+in `interaction_archive`. The hot table then only holds rows from
+`hot_since` on, so reads route by time range: a range ending before it
+skips the table, and only the archived months overlapping a range are
+opened; listings without a range read the archive only on request.
+Statistics rollups keep counting archived interactions; full-text search
+covers the hot table only.
+"""
+
+import gzip
+import heapq
+import json
+import os
+import uuid
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import Engine
+from sqlmodel import Session, col, delete, func, select
+
+from app.core.config import settings
+from app.models import Interaction, InteractionArchive
+from app.services import versions
+
+ARCHIVE_FIELDS = ("id", "patient_id", "timestamp", "outcome", "notes")
+# Rows fetched per round trip while a month is written out
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partitions(session: Session) -> Sequence[InteractionArchive]:
+    """Archived months, oldest first."""
+    statement = select(InteractionArchive).order_by(col(InteractionArchive.month))
+    return session.exec(statement).all()
+
+
+def hot_since(archived: Sequence[InteractionArchive]) -> datetime | None:
+    """Start of the hot table: everything before it is archived."""
+    if not archived:
+        return None
+    return datetime.combine(next_month(archived[-1].month), time())
+
+
+def overlapping(
+    archived: Sequence[InteractionArchive],
+    since: datetime | None,
+    until: datetime | None,
+) -> list[InteractionArchive]:
+    """The archived months that may hold rows in [since, until)."""
+    return [
+        partition
+        for partition in archived
+        if (until is None or datetime.combine(partition.month, time()) < until)
+        and (
+            since is None
+            or datetime.combine(next_month(partition.month), time()) > since
+        )
+    ]
+
+
+def read_partition(partition: InteractionArchive) -> Iterator[Interaction]:
+    """The interactions of an archived month, in (timestamp, id) order."""
+    with gzip.open(Path(settings.ARCHIVE_DIR) / partition.file, "rt") as lines:
+        for line in lines:
+            yield _from_record(json.loads(line))
+
+
+def archive_months(session: Session, before: date) -> list[InteractionArchive]:
+    """
+    Move every month of interactions older than the month of `before` to the
+    archive, oldest first, one file write and one transaction per month.
+    Months that are already archived get late rows merged into their file.
+    Rows are streamed to the file, so memory does not grow with the month.
+    """
+    before = month_start(before)
+    directory = Path(settings.ARCHIVE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    archived: list[InteractionArchive] = []
+
+    while True:
+        oldest = session.exec(select(func.min(Interaction.timestamp))).first()
+        if oldest is None or month_start(oldest) >= before:
+            return archived
+        month = month_start(oldest)
+        start = datetime.combine(month, time())
+        end = datetime.combine(next_month(month), time())
+        in_month = (
+            col(Interaction.timestamp) >= start,
+            col(Interaction.timestamp) < end,
+        )
+
+        partition = session.get(InteractionArchive, month)
+        statement = (
+            select(*(getattr(Interaction, name) for name in ARCHIVE_FIELDS))
+            .where(*in_month)
+            .order_by(col(Interaction.timestamp), col(Interaction.id))
+            .execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+        )
+        # Both sides are in (timestamp, id) order, so late rows are merged
+        # into an existing file one line at a time
+        rows = heapq.merge(
+            (
+                _to_record(interaction)
+                for interaction in (read_partition(partition) if partition else ())
+            ),
+            (dict(zip(ARCHIVE_FIELDS, row)) for row in session.execute(statement)),
+            key=lambda row: (row["timestamp"], row["id"]),
+        )
+
+        file = f"interactions-{month:%Y-%m}.ndjson.gz"
+        written = _write(directory / file, rows)
+
+        patient_ids = session.exec(
+            select(Interaction.patient_id).where(*in_month).distinct()
+        ).all()
+        session.execute(delete(Interaction).where(*in_month))
+        versions.bump(session, patient_ids)
+        partition = partition or InteractionArchive(month=month, file=file)
+        partition.rows = written
+        session.add(partition)
+        session.commit()
+        archived.append(partition)
+
+
+def forget_patient(session: Session, patient_id: uuid.UUID) -> int:
+    """
+    Rewrite the archived months holding interactions of `patient_id` without
+    them; the caller commits the catalog. Returns the number removed.
+    """
+    removed = 0
+    for partition in partitions(session):
+        matched = sum(
+            1
+            for interaction in read_partition(partition)
+            if interaction.patient_id == patient_id
+        )
+        if not matched:
+            continue
+        kept = (
+            _to_record(interaction)
+            for interaction in read_partition(partition)
+            if interaction.patient_id != patient_id
+        )
+        partition.rows = _write(Path(settings.ARCHIVE_DIR) / partition.file, kept)
+        session.add(partition)
+        removed += matched
+    return removed
+
+
+def iter_archived_records(
+    bind: Engine,
+    patient_id: uuid.UUID | None = None,
+    outcome: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """All archived interactions matching the filters, oldest first."""
+    with Session(bind) as session:
+        archived = partitions(session)
+    for partition in archived:
+        for interaction in read_partition(partition):
+            if patient_id and interaction.patient_id != patient_id:
+                continue
+            if outcome and interaction.outcome != outcome:
+                continue
+            yield _to_record(interaction)
+
+
+def _write(path: Path, rows: Iterable[dict[str, Any]]) -> int:
+    # Written next to the target and renamed, so readers never see half a file
+    partial = path.with_suffix(".partial")
+    written = 0
+    with gzip.open(partial, "wt") as out:
+        for row in rows:
+            out.write(json.dumps(row, default=str) + "\n")
+            written += 1
+    os.replace(partial, path)
+    return written
+
+
+def _to_record(interaction: Interaction) -> dict[str, Any]:
+    return {name: getattr(interaction, name) for name in ARCHIVE_FIELDS}
+
+
+def _from_record(record: dict[str, Any]) -> Interaction:
+    return Interaction(
+        id=uuid.UUID(record["id"]),
+        patient_id=uuid.UUID(record["patient_id"]),
+        timestamp=datetime.fromisoformat(record["timestamp"]),
+        outcome=record["outcome"],
+        notes=record["notes"],
+    )
@@ -0,0 +1,132 @@
+"""
+Audit log of every write to patients, interactions and outcomes.
+
+Write paths call `record` (or `record_update`) inside their own
+transaction. Entries are held in `session.info` until the commit and then
+handed to the audit writer, which inserts them in batches off the request
+path; a rollback drops them. Entries reach the table shortly after the
+write (at shutdown at the latest, when the writer is flushed).
+"""
+
+import uuid
+from typing import Any, Sequence
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+from sqlmodel import Session, col, insert, select
+
+from app.core.audit_writer import AuditWriter
+from app.core.config import settings
+from app.models import AuditAction, AuditEntry
+from app.models.interaction import utcnow
+
+# Entries of the open transaction, in session.info until it commits.
+AUDIT_PENDING = "audit_pending"
+
+PATIENT = "patient"
+INTERACTION = "interaction"
+OUTCOME = "outcome"
+
+
+def record(
+    session: Session,
+    entity_type: str,
+    entity_id: Any,
+    action: AuditAction,
+    before: dict[str, Any] | None = None,
+    after: dict[str, Any] | None = None,
+) -> None:
+    """Audit a write made in `session`'s transaction; the caller commits."""
+    if not settings.AUDIT_ENABLED:
+        return
+    session.info.setdefault(AUDIT_PENDING, []).append(
+        {
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "action": action,
+            "before": before,
+            "after": after,
+            "recorded_at": utcnow(),
+        }
+    )
+
+
+def record_update(
+    session: Session,
+    entity_type: str,
+    entity_id: Any,
+    before: dict[str, Any],
+    after: dict[str, Any],
+) -> None:
+    """Audit the fields that differ between two snapshots, if any."""
+    changed = [name for name, value in after.items() if before.get(name) != value]
+    if changed:
+        record(
+            session,
+            entity_type,
+            entity_id,
+            AuditAction.UPDATE,
+            {name: before.get(name) for name in changed},
+            {name: after[name] for name in changed},
+        )
+
+
+def insert_entries(session: Session, rows: Sequence[dict[str, Any]]) -> None:
+    """Insert queued entries; runs on the audit writer."""
+    # Snapshots hold UUIDs, dates and enums; store their JSON forms
+    session.execute(
+        insert(AuditEntry),
+        [
+            {
+                **row,
+                "before": _jsonable(row["before"]),
+                "after": _jsonable(row["after"]),
+            }
+            for row in rows
+        ],
+    )
+
+
+def _jsonable(snapshot: dict[str, Any] | None) -> dict[str, Any] | None:
+    return None if snapshot is None else orjson.loads(orjson.dumps(snapshot))
+
+
+writer = AuditWriter(
+    insert_entries, settings.AUDIT_BATCH_SIZE, settings.AUDIT_QUEUE_SIZE
+)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def queue_on_commit(session: OrmSession) -> None:
+    entries = session.info.pop(AUDIT_PENDING, None)
+    if entries:
+        bind = session.get_bind()
+        if bind.dialect.is_async:
+            # The writer thread needs a sync engine on the same database
+            from app.core.database import engine as bind
+        writer.put(bind, entries)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def discard_on_rollback(session: OrmSession) -> None:
+    session.info.pop(AUDIT_PENDING, None)
+
+
+def history(
+    session: Session, entity_type: str, entity_id: uuid.UUID | str
+) -> Sequence[AuditEntry]:
+    """
+    An entity's entries, oldest first. Entries this worker still holds are
+    written first; other workers' appear once their writer catches up.
+    """
+    writer.flush()
+    statement = (
+        select(AuditEntry)
+        .where(
+            col(AuditEntry.entity_type) == entity_type,
+            col(AuditEntry.entity_id) == str(entity_id),
+        )
+        .order_by(col(AuditEntry.id))
+    )
+    return session.exec(statement).all()
@@ -0,0 +1,79 @@
+"""
+Sequence of interaction creates and updates behind the change feed.
+
+Interaction write paths call `record` inside their own transaction, so a
+change is visible exactly when the row it points at is. `since` reads the
+changes after a sequence number with the interaction's current columns.
+"""
+
+import itertools
+import uuid
+from datetime import timedelta
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import Engine, Row
+from sqlmodel import Session, col, delete, func, insert, select
+
+from app.core.config import settings
+from app.models import Interaction, InteractionChange
+from app.models.interaction import utcnow
+
+# Set in session.info by `record`; the feed hub is woken after the commit.
+CHANGES_PENDING = "interaction_changes_pending"
+# Changes older than STREAM_RETENTION_HOURS are deleted by every
+# PRUNE_EVERY-th `record`.
+PRUNE_EVERY = 1000
+
+_records = itertools.count(1)
+
+
+def record(session: Session, interaction_ids: Iterable[uuid.UUID]) -> None:
+    """Append a change for each interaction; the caller commits."""
+    rows = [{"interaction_id": interaction_id} for interaction_id in interaction_ids]
+    if not rows:
+        return
+    session.execute(insert(InteractionChange), rows)
+    session.info[CHANGES_PENDING] = True
+    if next(_records) % PRUNE_EVERY == 0:
+        cutoff = utcnow() - timedelta(hours=settings.STREAM_RETENTION_HOURS)
+        session.execute(
+            delete(InteractionChange).where(col(InteractionChange.created_at) < cutoff)
+        )
+
+
+def latest_seq(bind: Engine) -> int:
+    with Session(bind) as session:
+        return session.exec(select(func.max(InteractionChange.seq))).one() or 0
+
+
+def since(
+    bind: Engine,
+    after: int,
+    patient_ids: Sequence[uuid.UUID] = (),
+    outcomes: Sequence[str] = (),
+    upto: int | None = None,
+    limit: int = 1000,
+) -> Sequence[Row[Any]]:
+    """
+    Changes with `after < seq <= upto` in order, as rows of `seq` and the
+    `InteractionRead` columns of the interaction as it is now. Changes of
+    interactions deleted since are skipped.
+    """
+    # Imported here: the interactions service records changes through us
+    from app.services.interactions import READ_COLUMNS
+
+    statement = (
+        select(InteractionChange.seq, *READ_COLUMNS)
+        .join(Interaction, col(Interaction.id) == InteractionChange.interaction_id)
+        .where(col(InteractionChange.seq) > after)
+        .order_by(col(InteractionChange.seq))
+        .limit(limit)
+    )
+    if upto is not None:
+        statement = statement.where(col(InteractionChange.seq) <= upto)
+    if patient_ids:
+        statement = statement.where(col(Interaction.patient_id).in_(patient_ids))
+    if outcomes:
+        statement = statement.where(col(Interaction.outcome).in_(outcomes))
+    with Session(bind) as session:
+        return session.execute(statement).all()
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date
+from enum import Enum
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import Engine, Select
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.models import Interaction, Patient
+from app.services import archive
+
+INTERACTION_COLUMNS = (
+    Interaction.id,
+    Interaction.patient_id,
+    Interaction.timestamp,
+    Interaction.outcome,
+    Interaction.notes,
+)
+PATIENT_COLUMNS = (
+    Patient.id,
+    Patient.first_name,
+    Patient.last_name,
+    Patient.date_of_birth,
+    Patient.gender,
+)
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_interactions(
+    bind: Engine,
+    export_format: ExportFormat,
+    patient_id: uuid.UUID | None = None,
+    outcome: str | None = None,
+) -> Iterator[str]:
+    statement = select(*INTERACTION_COLUMNS).order_by(col(Interaction.timestamp))
+    if patient_id:
+        statement = statement.where(Interaction.patient_id == patient_id)
+    if outcome:
+        statement = statement.where(Interaction.outcome == outcome)
+    # Archived months are older than anything in the table, so they go first
+    archived = (
+        tuple(record[column.name] for column in INTERACTION_COLUMNS)
+        for record in archive.iter_archived_records(bind, patient_id, outcome)
+    )
+    return stream_rows(bind, statement, export_format, archived)
+
+
+def export_patients(bind: Engine, export_format: ExportFormat) -> Iterator[str]:
+    return stream_rows(bind, select(*PATIENT_COLUMNS), export_format)
+
+
+def stream_rows(
+    bind: Engine,
+    statement: Select[Any],
+    export_format: ExportFormat,
+    leading: Iterable[Sequence[Any]] = (),
+) -> Iterator[str]:
+    """
+    Encode the rows of `statement` batch by batch.
+
+    Plain column tuples (no ORM identity map) fetched with `yield_per` and a
+    server-side cursor where the driver has one, so memory stays flat no
+    matter how many rows are exported. Runs in its own session because the
+    response body outlives the request handler. `leading` rows (same columns)
+    are streamed first, in batches of the same size.
+    """
+    fields = [column.name for column in statement.selected_columns]
+    if export_format is ExportFormat.CSV:
+        yield _csv_lines([fields])
+    leading = iter(leading)
+    while batch := list(islice(leading, settings.EXPORT_BATCH_SIZE)):
+        yield _encode(fields, batch, export_format)
+    with Session(bind) as session:
+        result = session.execute(
+            statement.execution_options(
+                stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE
+            )
+        )
+        for batch in result.partitions():
+            yield _encode(fields, batch, export_format)
+
+
+def _encode(
+    fields: list[str], batch: Sequence[Sequence[Any]], export_format: ExportFormat
+) -> str:
+    if export_format is ExportFormat.CSV:
+        return _csv_lines(batch)
+    return "".join(
+        json.dumps(dict(zip(fields, row)), default=_json_default) + "\n"
+        for row in batch
+    )
+
+
+def _csv_lines(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
@@ -0,0 +1,486 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import ColumnElement, Row, Select
+from sqlmodel import Session, col, func, insert, select, tuple_
+
+from app.core.config import settings
+from app.core.group_commit import GroupCommitter
+from app.models import AuditAction, AuditEntry, Interaction, Patient
+from app.models.interaction import as_naive_utc
+from app.schemas.interaction import (
+    BulkInteractionError,
+    BulkInteractionResult,
+    InteractionCreate,
+    InteractionRead,
+    InteractionUpdate,
+)
+from app.services import archive, audit, changes, outbox, stats, versions
+from app.services.outcome_registry import outcome_registry
+
+
+def create_interaction(session: Session, interaction: InteractionCreate) -> Interaction:
+    """
+    Document a patient interaction.
+    ID and timestamp are generated in-process, so the returned object is
+    complete without reading the row back.
+    """
+    db_interaction = _validated_interaction(session, interaction)
+    session.add(db_interaction)
+    stats.record(session, added=[_stats_key(db_interaction)])
+    versions.bump(session, [db_interaction.patient_id])
+    changes.record(session, [db_interaction.id])
+    outbox.enqueue(
+        session, outbox.INTERACTIONS_CREATED, {"ids": [str(db_interaction.id)]}
+    )
+    audit.record(
+        session,
+        audit.INTERACTION,
+        db_interaction.id,
+        AuditAction.CREATE,
+        after=db_interaction.model_dump(),
+    )
+    session.commit()
+    return db_interaction
+
+
+def create_interaction_grouped(
+    session: Session, interaction: InteractionCreate
+) -> Interaction:
+    """
+    Like `create_interaction`, but the insert is committed by the group
+    committer together with concurrent creates (see `GROUP_COMMIT_WINDOW_MS`).
+    """
+    db_interaction = _validated_interaction(session, interaction)
+    # Hand the connection back to the pool while waiting, the committer needs one
+    session.close()
+    interaction_committer.submit(session.get_bind(), db_interaction.model_dump())
+    return db_interaction
+
+
+def _validated_interaction(
+    session: Session, interaction: InteractionCreate
+) -> Interaction:
+    patient = session.get(Patient, interaction.patient_id)
+    if not patient:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Patient with ID {interaction.patient_id} not found",
+        )
+
+    validate_outcome(session, interaction.outcome)
+    return Interaction.model_validate(interaction)
+
+
+def create_interactions_bulk(
+    session: Session, rows: Sequence[Any]
+) -> BulkInteractionResult:
+    """
+    Document many interactions at once.
+
+    Rows are dicts or raw JSON documents (one NDJSON line each). All rows are
+    validated up front, with one IN query for the referenced patients and
+    outcomes checked against the registry. Valid rows are inserted with
+    executemany and one commit per chunk; invalid rows are reported by index.
+    """
+    errors: list[BulkInteractionError] = []
+    candidates: list[tuple[int, InteractionCreate]] = []
+    for index, row in enumerate(rows):
+        try:
+            if isinstance(row, (str, bytes)):
+                candidate = InteractionCreate.model_validate_json(row)
+            else:
+                candidate = InteractionCreate.model_validate(row)
+        except ValidationError as exc:
+            errors.append(
+                BulkInteractionError(index=index, detail=format_validation_error(exc))
+            )
+            continue
+        candidates.append((index, candidate))
+
+    known_patients = _existing_patient_ids(
+        session, {candidate.patient_id for _, candidate in candidates}
+    )
+
+    values: list[dict[str, Any]] = []
+    for index, candidate in candidates:
+        if candidate.patient_id not in known_patients:
+            detail = f"Patient with ID {candidate.patient_id} not found"
+        elif not outcome_registry.exists(session, candidate.outcome):
+            detail = (
+                f"Invalid outcome '{candidate.outcome}'. Please configure it first."
+            )
+        else:
+            values.append(Interaction.model_validate(candidate).model_dump())
+            continue
+        errors.append(BulkInteractionError(index=index, detail=detail))
+
+    chunk_size = settings.BULK_CHUNK_SIZE
+    for start in range(0, len(values), chunk_size):
+        insert_interactions(session, values[start : start + chunk_size])
+        session.commit()
+
+    errors.sort(key=lambda error: error.index)
+    return BulkInteractionResult(created=len(values), errors=errors)
+
+
+def insert_interactions(session: Session, rows: Sequence[dict[str, Any]]) -> None:
+    """Insert validated interaction rows with executemany; the caller commits."""
+    # IDs are needed for the change feed; rows from model_dump() have one
+    rows = [row if row.get("id") else {**row, "id": uuid.uuid4()} for row in rows]
+    session.execute(insert(Interaction), rows)
+    stats.record(
+        session,
+        added=[(row["patient_id"], row["outcome"], row["timestamp"]) for row in rows],
+    )
+    versions.bump(session, [row["patient_id"] for row in rows])
+    changes.record(session, [row["id"] for row in rows])
+    outbox.enqueue(
+        session, outbox.INTERACTIONS_CREATED, {"ids": [str(row["id"]) for row in rows]}
+    )
+    for row in rows:
+        audit.record(
+            session, audit.INTERACTION, row["id"], AuditAction.CREATE, after=row
+        )
+
+
+interaction_committer = GroupCommitter(
+    insert_interactions,
+    settings.GROUP_COMMIT_WINDOW_MS,
+    settings.GROUP_COMMIT_MAX_BATCH,
+)
+
+
+def list_interactions(
+    session: Session,
+    offset: int = 0,
+    limit: int = 100,
+    patient_ids: Sequence[uuid.UUID] = (),
+    outcomes: Sequence[str] = (),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_archived: bool = False,
+) -> Sequence[Interaction]:
+    """
+    Retrieve interactions with optional filtering, newest first. Each of
+    `patient_ids` and `outcomes` matches any of its values when not empty.
+    With a `cursor` (see `next_cursor`) the page starts right after the row
+    it points at, which costs the same at any depth; `offset` is ignored.
+    `since` (inclusive) and `until` (exclusive) bound the timestamp. Pages
+    continue into the archived months the range overlaps once the hot table
+    is exhausted; without a range only `include_archived` opens the archive.
+    """
+    return _list_page(
+        session,
+        offset,
+        limit,
+        patient_ids,
+        outcomes,
+        cursor,
+        since,
+        until,
+        include_archived,
+        False,
+    )
+
+
+READ_COLUMNS = [
+    col(getattr(Interaction, name)) for name in InteractionRead.model_fields
+]
+
+
+def list_interaction_rows(
+    session: Session,
+    offset: int = 0,
+    limit: int = 100,
+    patient_ids: Sequence[uuid.UUID] = (),
+    outcomes: Sequence[str] = (),
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_archived: bool = False,
+) -> Sequence[Row[Any] | dict[str, Any]]:
+    """
+    Same page as `list_interactions`, as plain rows with the `InteractionRead`
+    columns instead of ORM instances (dicts for archived rows).
+    """
+    return _list_page(
+        session,
+        offset,
+        limit,
+        patient_ids,
+        outcomes,
+        cursor,
+        since,
+        until,
+        include_archived,
+        True,
+    )
+
+
+def _list_page(
+    session: Session,
+    offset: int,
+    limit: int,
+    patient_ids: Sequence[uuid.UUID],
+    outcomes: Sequence[str],
+    cursor: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    include_archived: bool,
+    as_rows: bool,
+) -> list[Any]:
+    since = as_naive_utc(since) if since else None
+    until = as_naive_utc(until) if until else None
+    after = decode_cursor(cursor) if cursor else None
+    conditions = _filters(patient_ids, outcomes, since, until)
+
+    archived = None
+    skip_hot = False
+    if until is not None:
+        # A range that ends before the hot table starts never touches it
+        archived = archive.partitions(session)
+        hot_start = archive.hot_since(archived)
+        skip_hot = hot_start is not None and until <= hot_start
+
+    page: list[Any] = []
+    hot_matches = 0
+    if not skip_hot:
+        statement = _list_statement(conditions, offset, limit, after)
+        if as_rows:
+            page = list(session.execute(statement.with_only_columns(*READ_COLUMNS)))
+        else:
+            page = list(session.exec(statement))
+        if len(page) == limit:
+            return page
+        if since is None and until is None and not include_archived:
+            # Unbounded listings stay on the hot table; the archive is opt-in
+            return page
+        if after is None and offset:
+            hot_matches = offset + len(page) if page else _count(session, conditions)
+
+    if archived is None:
+        archived = archive.partitions(session)
+    months = archive.overlapping(archived, since, until)
+    skip = 0 if after else max(offset - hot_matches, 0)
+    for partition in reversed(months):
+        # Files are in (timestamp, id) order: the newest match comes last
+        matches = [
+            interaction
+            for interaction in archive.read_partition(partition)
+            if _archived_match(interaction, patient_ids, outcomes, since, until)
+            and (after is None or (interaction.timestamp, interaction.id) < after)
+        ]
+        matches.reverse()
+        taken = matches[skip : skip + limit - len(page)]
+        skip = max(skip - len(matches), 0)
+        page += [_read_row(i) if as_rows else i for i in taken]
+        if len(page) == limit:
+            break
+    return page
+
+
+def _filters(
+    patient_ids: Sequence[uuid.UUID],
+    outcomes: Sequence[str],
+    since: datetime | None,
+    until: datetime | None,
+) -> list[ColumnElement[bool]]:
+    conditions = []
+    if patient_ids:
+        conditions.append(col(Interaction.patient_id).in_(patient_ids))
+    if outcomes:
+        conditions.append(col(Interaction.outcome).in_(outcomes))
+    if since:
+        conditions.append(col(Interaction.timestamp) >= since)
+    if until:
+        conditions.append(col(Interaction.timestamp) < until)
+    return conditions
+
+
+def _list_statement(
+    conditions: list[ColumnElement[bool]],
+    offset: int,
+    limit: int,
+    after: tuple[datetime, uuid.UUID] | None,
+) -> Select[Any]:
+    statement = (
+        select(Interaction)
+        .where(*conditions)
+        .order_by(col(Interaction.timestamp).desc(), col(Interaction.id).desc())
+    )
+    if after:
+        statement = statement.where(
+            tuple_(Interaction.timestamp, Interaction.id) < after
+        )
+    else:
+        statement = statement.offset(offset)
+
+    return statement.limit(limit)
+
+
+def _count(session: Session, conditions: list[ColumnElement[bool]]) -> int:
+    statement = select(func.count()).select_from(Interaction).where(*conditions)
+    return session.exec(statement).one()
+
+
+def _archived_match(
+    interaction: Interaction,
+    patient_ids: Sequence[uuid.UUID],
+    outcomes: Sequence[str],
+    since: datetime | None,
+    until: datetime | None,
+) -> bool:
+    return (
+        (not patient_ids or interaction.patient_id in patient_ids)
+        and (not outcomes or interaction.outcome in outcomes)
+        and (not since or interaction.timestamp >= since)
+        and (not until or interaction.timestamp < until)
+    )
+
+
+def _read_row(interaction: Interaction) -> dict[str, Any]:
+    return {name: getattr(interaction, name) for name in InteractionRead.model_fields}
+
+
+def next_cursor(interactions: Sequence[Any], limit: int) -> str | None:
+    """Cursor for the page after `interactions`, or None on the last page."""
+    if not interactions or len(interactions) < limit:
+        return None
+    last = interactions[-1]
+    if isinstance(last, dict):
+        timestamp, interaction_id = last["timestamp"], last["id"]
+    else:
+        timestamp, interaction_id = last.timestamp, last.id
+    payload = json.dumps([timestamp.isoformat(), str(interaction_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, interaction_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), uuid.UUID(interaction_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from None
+
+
+def update_interaction(
+    session: Session,
+    interaction_id: uuid.UUID,
+    interaction_update: InteractionUpdate,
+) -> Interaction:
+    """
+    Update interaction details (notes, outcome).
+    """
+    db_interaction = session.get(Interaction, interaction_id)
+    if not db_interaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found"
+        )
+
+    # Validate Outcome if present
+    if interaction_update.outcome:
+        validate_outcome(session, interaction_update.outcome)
+
+    previous = _stats_key(db_interaction)
+    before = db_interaction.model_dump()
+    interaction_data = interaction_update.model_dump(exclude_unset=True)
+    for key, value in interaction_data.items():
+        setattr(db_interaction, key, value)
+
+    session.add(db_interaction)
+    if _stats_key(db_interaction) != previous:
+        stats.record(session, added=[_stats_key(db_interaction)], removed=[previous])
+    versions.bump(session, [db_interaction.patient_id])
+    changes.record(session, [db_interaction.id])
+    audit.record_update(
+        session,
+        audit.INTERACTION,
+        db_interaction.id,
+        before,
+        db_interaction.model_dump(),
+    )
+    session.commit()
+    return db_interaction
+
+
+def interaction_history(
+    session: Session, interaction_id: uuid.UUID
+) -> Sequence[AuditEntry]:
+    """
+    Audit entries of an interaction, oldest first; still available after it
+    was deleted.
+    """
+    entries = audit.history(session, audit.INTERACTION, interaction_id)
+    if not entries and not session.get(Interaction, interaction_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found"
+        )
+    return entries
+
+
+def delete_interaction(session: Session, interaction_id: uuid.UUID) -> None:
+    """
+    Delete a specific interaction.
+    """
+    interaction = session.get(Interaction, interaction_id)
+    if not interaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Interaction not found"
+        )
+    session.delete(interaction)
+    stats.record(session, removed=[_stats_key(interaction)])
+    versions.bump(session, [interaction.patient_id])
+    audit.record(
+        session,
+        audit.INTERACTION,
+        interaction.id,
+        AuditAction.DELETE,
+        before=interaction.model_dump(),
+    )
+    session.commit()
+
+
+def validate_outcome(session: Session, outcome_code: str) -> None:
+    """
+    Validate that an outcome configuration exists.
+    Served from the in-process registry, not the database.
+    """
+    if not outcome_registry.exists(session, outcome_code):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid outcome '{outcome_code}'. Please configure it first.",
+        )
+
+
+def _stats_key(interaction: Interaction) -> stats.InteractionKey:
+    return (interaction.patient_id, interaction.outcome, interaction.timestamp)
+
+
+def _existing_patient_ids(
+    session: Session, patient_ids: Iterable[uuid.UUID]
+) -> set[uuid.UUID]:
+    """Which of the given patient IDs exist, one IN query per chunk."""
+    ids = list(patient_ids)
+    found: set[uuid.UUID] = set()
+    chunk_size = settings.BULK_CHUNK_SIZE
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start : start + chunk_size]
+        found.update(session.exec(select(Patient.id).where(col(Patient.id).in_(chunk))))
+    return found
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
@@ -0,0 +1,195 @@
+"""
+Transactional outbox for work that follows a write.
+
+Write paths call `enqueue` inside their own transaction, so a message
+exists exactly when the write it describes was committed. Handlers
+registered with `handler` run later on the outbox worker
+(app.core.outbox_worker), which calls `drain`: claim a batch, run the
+handlers of every message and delete the batch in one transaction, and
+reschedule failed messages with exponential backoff until they are
+dead-lettered. Topics without a handler are not written at all, so the
+outbox adds no cost to a write until something consumes its messages.
+
+Delivery is at-least-once: a handler can see a message again after a crash
+or a failure elsewhere in its batch. Handlers get the worker's session, so
+database side effects commit together with the message's deletion.
+"""
+
+import logging
+import random
+from datetime import timedelta
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Engine, Row
+from sqlmodel import Session, col, delete, insert, select, update
+
+from app.core.config import settings
+from app.models import OutboxMessage
+from app.models.interaction import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Payload {"ids": [...]}: interactions created in one transaction.
+INTERACTIONS_CREATED = "interactions.created"
+# Set in session.info by `enqueue`; the worker is woken after the commit.
+OUTBOX_PENDING = "outbox_pending"
+
+Handler = Callable[[Session, dict[str, Any]], None]
+
+handlers: dict[str, list[Handler]] = {}
+
+
+def handler(topic: str) -> Callable[[Handler], Handler]:
+    """Register a function to run for every message on `topic`."""
+
+    def register(function: Handler) -> Handler:
+        handlers.setdefault(topic, []).append(function)
+        return function
+
+    return register
+
+
+def enqueue(session: Session, topic: str, payload: dict[str, Any]) -> None:
+    """
+    Add a message; the caller commits. Topics nothing handles cost nothing:
+    no message is written for them.
+    """
+    if not handlers.get(topic):
+        return
+    session.execute(insert(OutboxMessage), [{"topic": topic, "payload": payload}])
+    session.info[OUTBOX_PENDING] = True
+
+
+def claim(bind: Engine, worker_id: str, limit: int) -> Sequence[Row[Any]]:
+    """
+    Lease up to `limit` available messages to `worker_id`, oldest first.
+
+    One UPDATE ... RETURNING. On PostgreSQL the candidate rows are locked
+    with SKIP LOCKED, so concurrent workers take disjoint batches without
+    waiting for each other. SQLite runs one writer at a time, which makes
+    the statement atomic on its own; the repeated `available_at` check
+    covers a row leased by a statement that committed in between.
+    """
+    now = utcnow()
+    claimable = (
+        select(OutboxMessage.id)
+        .where(
+            col(OutboxMessage.dead_at).is_(None),
+            col(OutboxMessage.available_at) <= now,
+        )
+        .order_by(col(OutboxMessage.id))
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(OutboxMessage)
+        .where(
+            col(OutboxMessage.id).in_(claimable.scalar_subquery()),
+            col(OutboxMessage.available_at) <= now,
+        )
+        .values(
+            claimed_by=worker_id,
+            available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+        )
+        .returning(
+            OutboxMessage.id,
+            OutboxMessage.topic,
+            OutboxMessage.payload,
+            OutboxMessage.attempts,
+        )
+    )
+    with Session(bind) as session:
+        messages = sorted(session.execute(statement).all(), key=lambda row: row.id)
+        session.commit()
+    return messages
+
+
+def drain(bind: Engine, worker_id: str, limit: int) -> int:
+    """
+    Claim and handle one batch; returns the number of messages claimed.
+    When the batch fails, its messages are retried one transaction each so
+    a bad message only delays itself.
+    """
+    messages = claim(bind, worker_id, limit)
+    if not messages:
+        return 0
+    try:
+        _handle(bind, worker_id, messages)
+    except Exception as exc:
+        if len(messages) == 1:
+            _retry_later(bind, worker_id, messages[0], exc)
+            return 1
+        for message in messages:
+            try:
+                _handle(bind, worker_id, [message])
+            except Exception as message_exc:
+                _retry_later(bind, worker_id, message, message_exc)
+    return len(messages)
+
+
+def _handle(bind: Engine, worker_id: str, messages: Sequence[Row[Any]]) -> None:
+    with Session(bind) as session:
+        for message in messages:
+            for function in handlers.get(message.topic, ()):
+                function(session, message.payload)
+        session.execute(
+            delete(OutboxMessage).where(
+                col(OutboxMessage.id).in_([message.id for message in messages]),
+                col(OutboxMessage.claimed_by) == worker_id,
+            )
+        )
+        session.commit()
+
+
+def backoff(attempts: int) -> float:
+    """
+    Seconds before retrying after the `attempts`-th failure: doubling from
+    OUTBOX_BACKOFF_SECONDS up to OUTBOX_BACKOFF_MAX_SECONDS, with jitter so
+    messages that failed together are not retried together.
+    """
+    delay = min(
+        settings.OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1),
+        settings.OUTBOX_BACKOFF_MAX_SECONDS,
+    )
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _retry_later(
+    bind: Engine, worker_id: str, message: Row[Any], exc: Exception
+) -> None:
+    """Reschedule a failed message, or dead-letter it after its last attempt."""
+    attempts = message.attempts + 1
+    now = utcnow()
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        logger.error(
+            "Outbox message %s (%s) dead-lettered after %d attempts",
+            message.id,
+            message.topic,
+            attempts,
+            exc_info=exc,
+        )
+        values: dict[str, Any] = {"dead_at": now}
+    else:
+        logger.warning(
+            "Outbox message %s (%s) failed, attempt %d",
+            message.id,
+            message.topic,
+            attempts,
+            exc_info=exc,
+        )
+        values = {"available_at": now + timedelta(seconds=backoff(attempts))}
+    with Session(bind) as session:
+        session.execute(
+            update(OutboxMessage)
+            .where(
+                col(OutboxMessage.id) == message.id,
+                col(OutboxMessage.claimed_by) == worker_id,
+            )
+            .values(
+                attempts=attempts,
+                last_error=repr(exc)[:1000],
+                claimed_by=None,
+                **values,
+            )
+        )
+        session.commit()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from sqlmodel import Session, select, update
+
+from app.core.config import settings
+from app.models import Outcome, RegistryVersion
+
+REGISTRY_NAME = "outcome"
+
+
+class OutcomeRegistry:
+    """
+    In-process copy of the Outcome reference data.
+
+    Loaded once (at startup or on first use) and served from memory. Writes
+    through the outcome service bump a version row; every `check_interval`
+    seconds a worker compares that row with its own copy and reloads if
+    another worker changed the outcomes in the meantime.
+
+    Sessions passed in must be on the primary: loading from a replica right
+    after `invalidate` could cache outcomes from before the write.
+    """
+
+    def __init__(self, check_interval: float) -> None:
+        self.check_interval = check_interval
+        self._outcomes: dict[str, Outcome] | None = None
+        self._version = 0
+        self._checked_at = 0.0
+        # Bumped by `invalidate`, so a load that raced with a write is not kept
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def load(self, session: Session) -> dict[str, Outcome]:
+        generation = self._generation
+        with self._lock:
+            version = _read_version(session)
+            outcomes = {
+                outcome.code: Outcome(
+                    code=outcome.code, description=outcome.description
+                )
+                for outcome in session.exec(select(Outcome)).all()
+            }
+            if generation == self._generation:
+                self._outcomes = outcomes
+                self._version = version
+                self._checked_at = time.monotonic()
+        return outcomes
+
+    def invalidate(self) -> None:
+        """Drop the in-process copy. Call after an outcome write has committed."""
+        self._generation += 1
+        self._outcomes = None
+
+    def all(self, session: Session) -> list[Outcome]:
+        return list(self._current(session).values())
+
+    def exists(self, session: Session, code: str) -> bool:
+        return code in self._current(session)
+
+    def bump(self, session: Session) -> None:
+        """
+        Mark the outcomes as changed. Call before committing an outcome write
+        so the version moves in the same transaction, then `invalidate` once
+        the commit succeeded.
+        """
+        result = session.execute(
+            update(RegistryVersion)
+            .where(RegistryVersion.name == REGISTRY_NAME)
+            .values(version=RegistryVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            session.add(RegistryVersion(name=REGISTRY_NAME, version=1))
+
+    def _current(self, session: Session) -> dict[str, Outcome]:
+        outcomes = self._outcomes
+        if outcomes is None:
+            outcomes = self.load(session)
+        elif time.monotonic() - self._checked_at >= self.check_interval:
+            self._checked_at = time.monotonic()
+            if _read_version(session) != self._version:
+                outcomes = self.load(session)
+        return outcomes
+
+
+def _read_version(session: Session) -> int:
+    version = session.exec(
+        select(RegistryVersion.version).where(RegistryVersion.name == REGISTRY_NAME)
+    ).first()
+    return version or 0
+
+
+outcome_registry = OutcomeRegistry(settings.OUTCOME_REGISTRY_CHECK_INTERVAL)
@@ -0,0 +1,82 @@
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from sqlmodel import Session
+
+from app.models import AuditAction, Outcome
+from app.services import audit
+from app.services.outcome_registry import outcome_registry
+
+
+def list_outcomes(session: Session) -> Sequence[Outcome]:
+    """List all configured outcomes, served from the in-process registry."""
+    return outcome_registry.all(session)
+
+
+def create_outcome(session: Session, outcome: Outcome) -> Outcome:
+    """Create a new valid outcome."""
+    if session.get(Outcome, outcome.code):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Outcome '{outcome.code}' already exists.",
+        )
+    session.add(outcome)
+    outcome_registry.bump(session)
+    audit.record(
+        session,
+        audit.OUTCOME,
+        outcome.code,
+        AuditAction.CREATE,
+        after=outcome.model_dump(),
+    )
+    session.commit()
+    outcome_registry.invalidate()
+    return outcome
+
+
+def delete_outcome(session: Session, code: str) -> None:
+    """
+    Remove an outcome from the valid list.
+    Existing interactions with this outcome are preserved (soft validation).
+    """
+    outcome = session.get(Outcome, code)
+    if not outcome:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Outcome not found"
+        )
+    session.delete(outcome)
+    outcome_registry.bump(session)
+    audit.record(
+        session,
+        audit.OUTCOME,
+        outcome.code,
+        AuditAction.DELETE,
+        before=outcome.model_dump(),
+    )
+    session.commit()
+    outcome_registry.invalidate()
+
+
+def update_outcome(session: Session, code: str, outcome_update: Outcome) -> Outcome:
+    """
+    Update outcome description.
+    Note: The code (ID) cannot be changed via this endpoint.
+    """
+    db_outcome = session.get(Outcome, code)
+    if not db_outcome:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Outcome not found"
+        )
+
+    before = db_outcome.model_dump()
+    if outcome_update.description is not None:
+        db_outcome.description = outcome_update.description
+
+    session.add(db_outcome)
+    outcome_registry.bump(session)
+    audit.record_update(
+        session, audit.OUTCOME, db_outcome.code, before, db_outcome.model_dump()
+    )
+    session.commit()
+    outcome_registry.invalidate()
+    return db_outcome
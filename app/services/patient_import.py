@@ -0,0 +1,154 @@
+import codecs
+import csv
+import json
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from pydantic import TypeAdapter, ValidationError
+from sqlmodel import Session, col, select, tuple_
+
+from app.models import Patient
+from app.schemas.patient import PatientCreate, PatientImportError, PatientImportResult
+from app.services.export import ExportFormat
+from app.services.interactions import format_validation_error
+from app.services.patients import insert_patients
+
+# Keep the response bounded on very dirty files; `failed` still counts all.
+MAX_REPORTED_ERRORS = 100
+# Keys per duplicate lookup: three bound parameters each, which keeps the
+# statement under SQLite's 999-variable limit whatever the chunk size.
+KEY_LOOKUP_BATCH = 300
+
+PatientKey = tuple[str, str, Any]
+
+_batch_adapter = TypeAdapter(list[PatientCreate])
+
+
+def decode_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Incrementally decode a UTF-8 byte stream (BOM optional) into lines with
+    their line endings, holding at most one partial line in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        # Split on "\n" only, like reading the file with newline=""
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def parse_records(lines: Iterable[str], file_format: ExportFormat) -> Iterator[Any]:
+    """
+    Lazily turn text lines into raw records (dicts). NDJSON lines that are not
+    valid JSON come through as strings and are rejected during validation.
+    """
+    if file_format is ExportFormat.CSV:
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+def import_patients(
+    session: Session,
+    records: Iterable[Any],
+    chunk_size: int,
+    dedupe: bool = True,
+    progress: Callable[[PatientImportResult], None] | None = None,
+) -> PatientImportResult:
+    """
+    Load patients chunk by chunk: validate the whole chunk in one pass, drop
+    records whose (first_name, last_name, date_of_birth) already exist in the
+    database or earlier in the chunk, insert the rest with executemany and
+    commit. Earlier chunks are committed by then, so duplicates across chunks
+    are found in the database and nothing is kept from one chunk to the next.
+    `progress` is called with the running totals after every chunk.
+    """
+    result = PatientImportResult()
+    started = time.perf_counter()
+    records = iter(records)
+
+    while chunk := list(islice(records, chunk_size)):
+        first_row = result.processed + 1
+        result.processed += len(chunk)
+        patients = _validate_chunk(chunk, first_row, result)
+
+        if dedupe:
+            # Holds the chunk's new keys as well as those in the database
+            seen = _existing_keys(session, {_key(p) for p in patients})
+            unique = []
+            for patient in patients:
+                key = _key(patient)
+                if key in seen:
+                    result.duplicates += 1
+                    continue
+                seen.add(key)
+                unique.append(patient)
+            patients = unique
+
+        if patients:
+            insert_patients(
+                session, [Patient.model_validate(p).model_dump() for p in patients]
+            )
+            session.commit()
+            result.inserted += len(patients)
+
+        result.seconds = time.perf_counter() - started
+        result.rows_per_second = result.processed / result.seconds
+        if progress:
+            progress(result)
+
+    return result
+
+
+def _validate_chunk(
+    chunk: list[Any], first_row: int, result: PatientImportResult
+) -> list[PatientCreate]:
+    try:
+        return _batch_adapter.validate_python(chunk)
+    except ValidationError:
+        pass
+
+    # Some record is bad: fall back to per-record validation to pinpoint it
+    valid = []
+    for offset, record in enumerate(chunk):
+        try:
+            valid.append(PatientCreate.model_validate(record))
+        except ValidationError as exc:
+            result.failed += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(
+                    PatientImportError(
+                        row=first_row + offset, detail=format_validation_error(exc)
+                    )
+                )
+    return valid
+
+
+def _key(patient: PatientCreate) -> PatientKey:
+    return (patient.first_name, patient.last_name, patient.date_of_birth)
+
+
+def _existing_keys(session: Session, keys: set[PatientKey]) -> set[PatientKey]:
+    columns = (
+        col(Patient.first_name),
+        col(Patient.last_name),
+        col(Patient.date_of_birth),
+    )
+    keys_list = list(keys)
+    existing: set[PatientKey] = set()
+    for start in range(0, len(keys_list), KEY_LOOKUP_BATCH):
+        batch = keys_list[start : start + KEY_LOOKUP_BATCH]
+        rows = session.exec(select(*columns).where(tuple_(*columns).in_(batch)))
+        existing.update(tuple(row) for row in rows)
+    return existing
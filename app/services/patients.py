@@ -0,0 +1,284 @@
+import uuid
+from collections import defaultdict
+from datetime import date
+from typing import Any, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Engine, Row, Select
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, col, delete, func, insert, select
+
+from app.core.config import settings
+from app.core.group_commit import GroupCommitter
+from app.models import (
+    AuditAction,
+    DeletionStatus,
+    Gender,
+    Interaction,
+    Patient,
+    PatientDeletion,
+)
+from app.models.interaction import utcnow
+from app.schemas.interaction import InteractionRead
+from app.schemas.patient import (
+    PatientCreate,
+    PatientRead,
+    PatientTimeline,
+    PatientUpdate,
+)
+from app.services import archive, audit, stats, versions
+
+
+def create_patient(session: Session, patient: PatientCreate) -> Patient:
+    db_patient = Patient.model_validate(patient)
+    session.add(db_patient)
+    audit.record(
+        session,
+        audit.PATIENT,
+        db_patient.id,
+        AuditAction.CREATE,
+        after=db_patient.model_dump(),
+    )
+    session.commit()
+    return db_patient
+
+
+def create_patient_grouped(session: Session, patient: PatientCreate) -> Patient:
+    """`create_patient`, committed by the group committer."""
+    db_patient = Patient.model_validate(patient)
+    # Hand the connection back to the pool while waiting, the committer needs one
+    session.close()
+    patient_committer.submit(session.get_bind(), db_patient.model_dump())
+    return db_patient
+
+
+def insert_patients(session: Session, rows: Sequence[dict[str, Any]]) -> None:
+    session.execute(insert(Patient), rows)
+    for row in rows:
+        audit.record(session, audit.PATIENT, row["id"], AuditAction.CREATE, after=row)
+
+
+patient_committer = GroupCommitter(
+    insert_patients, settings.GROUP_COMMIT_WINDOW_MS, settings.GROUP_COMMIT_MAX_BATCH
+)
+
+
+def list_patients(
+    session: Session,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    date_of_birth: date | None = None,
+    gender: Gender | None = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> Sequence[Patient]:
+    query = _list_query(first_name, last_name, date_of_birth, gender)
+    return session.exec(query.offset(offset).limit(limit)).all()
+
+
+READ_COLUMNS = [col(getattr(Patient, name)) for name in PatientRead.model_fields]
+
+
+def list_patient_rows(
+    session: Session,
+    first_name: str | None = None,
+    last_name: str | None = None,
+    date_of_birth: date | None = None,
+    gender: Gender | None = None,
+    offset: int = 0,
+    limit: int = 100,
+) -> Sequence[Row[Any]]:
+    """Same page as `list_patients`, as plain rows with the `PatientRead` columns."""
+    query = _list_query(first_name, last_name, date_of_birth, gender)
+    query = query.with_only_columns(*READ_COLUMNS)
+    return session.execute(query.offset(offset).limit(limit)).all()
+
+
+def _list_query(
+    first_name: str | None,
+    last_name: str | None,
+    date_of_birth: date | None,
+    gender: Gender | None,
+) -> Select[Any]:
+    # TODO: Index if search volume increases
+
+    query = select(Patient)
+    if first_name:
+        query = query.where(Patient.first_name == first_name)
+    if last_name:
+        query = query.where(Patient.last_name == last_name)
+    if date_of_birth:
+        query = query.where(Patient.date_of_birth == date_of_birth)
+    if gender:
+        query = query.where(Patient.gender == gender)
+    return query
+
+
+def update_patient(
+    session: Session, patient_id: uuid.UUID, patient_update: PatientUpdate
+) -> Patient:
+    db_patient = session.get(Patient, patient_id)
+    if not db_patient:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+
+    before = db_patient.model_dump()
+    patient_data = patient_update.model_dump(exclude_unset=True)
+    for key, value in patient_data.items():
+        setattr(db_patient, key, value)
+
+    session.add(db_patient)
+    audit.record_update(
+        session, audit.PATIENT, db_patient.id, before, db_patient.model_dump()
+    )
+    session.commit()
+    return db_patient
+
+
+def delete_patient(
+    session: Session, patient_id: uuid.UUID, chunk_size: int | None = None
+) -> int:
+    """
+    Delete a patient and all their interactions. Returns the number of
+    interactions removed.
+
+    Interactions go in set-based DELETEs of `chunk_size` rows, one commit
+    each, so neither memory nor lock time grows with the history; the
+    ORM cascade on `Patient.interactions` (which loads every row) is never
+    used. Rollups, the history version and archived rows go together with
+    the patient in a final transaction.
+    """
+    patient = session.get(Patient, patient_id)
+    if not patient:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    before = patient.model_dump()
+    chunk_size = chunk_size or settings.DELETE_CHUNK_SIZE
+    of_patient = col(Interaction.patient_id) == patient_id
+    deleted = 0
+    while True:
+        chunk = select(Interaction.id).where(of_patient).limit(chunk_size)
+        result = session.execute(
+            delete(Interaction).where(col(Interaction.id).in_(chunk))
+        )
+        session.commit()
+        deleted += result.rowcount
+        if result.rowcount < chunk_size:
+            break
+
+    # Rows written while the chunks ran go with the patient
+    deleted += session.execute(delete(Interaction).where(of_patient)).rowcount
+    deleted += archive.forget_patient(session, patient_id)
+    stats.forget_patient(session, patient_id)
+    versions.forget_patient(session, patient_id)
+    session.execute(delete(Patient).where(col(Patient.id) == patient_id))
+    # One entry for the patient and its history, not one per interaction
+    audit.record(
+        session,
+        audit.PATIENT,
+        patient_id,
+        AuditAction.DELETE,
+        before={**before, "deleted_interactions": deleted},
+    )
+    session.commit()
+    return deleted
+
+
+def start_deletion(session: Session, patient_id: uuid.UUID) -> PatientDeletion:
+    """Record a pending deletion job for `run_deletion` to carry out."""
+    if not session.get(Patient, patient_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found"
+        )
+    job = PatientDeletion(patient_id=patient_id)
+    session.add(job)
+    session.commit()
+    return job
+
+
+def run_deletion(
+    bind: Engine, job_id: uuid.UUID, chunk_size: int | None = None
+) -> None:
+    """Carry out a deletion job in its own session, recording the outcome."""
+    with Session(bind, expire_on_commit=False) as session:
+        job = session.get(PatientDeletion, job_id)
+        if job is None or job.status != DeletionStatus.PENDING:
+            return
+        job.status = DeletionStatus.RUNNING
+        session.add(job)
+        session.commit()
+        try:
+            job.deleted_interactions = delete_patient(
+                session, job.patient_id, chunk_size
+            )
+            job.status = DeletionStatus.DONE
+        except Exception as exc:
+            session.rollback()
+            job.status = DeletionStatus.FAILED
+            job.error = exc.detail if isinstance(exc, HTTPException) else repr(exc)
+        job.finished_at = utcnow()
+        session.add(job)
+        session.commit()
+
+
+def get_deletion(session: Session, job_id: uuid.UUID) -> PatientDeletion:
+    job = session.get(PatientDeletion, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Deletion job not found"
+        )
+    return job
+
+
+def get_timelines(
+    session: Session, patient_ids: Sequence[uuid.UUID], limit: int
+) -> list[PatientTimeline]:
+    """
+    Patients with their last `limit` interactions, in the order requested.
+    Unknown IDs are skipped. Always two queries (patients, then one windowed
+    query over all their interactions) however many patients are asked for;
+    the lazy `Patient.interactions` relationship is never touched.
+    """
+    ids = list(dict.fromkeys(patient_ids))
+    if not ids:
+        return []
+    patients = {
+        patient.id: patient
+        for patient in session.exec(select(Patient).where(col(Patient.id).in_(ids)))
+    }
+
+    ranked = (
+        select(
+            Interaction,
+            func.row_number()
+            .over(
+                partition_by=col(Interaction.patient_id),
+                order_by=(
+                    col(Interaction.timestamp).desc(),
+                    col(Interaction.id).desc(),
+                ),
+            )
+            .label("position"),
+        )
+        .where(col(Interaction.patient_id).in_(list(patients)))
+        .subquery()
+    )
+    recent = aliased(Interaction, ranked)
+    statement = (
+        select(recent)
+        .where(ranked.c.position <= limit)
+        .order_by(ranked.c.patient_id, ranked.c.position)
+    )
+    history: dict[uuid.UUID, list[InteractionRead]] = defaultdict(list)
+    for interaction in session.exec(statement):
+        history[interaction.patient_id].append(
+            InteractionRead.model_validate(interaction)
+        )
+
+    return [
+        PatientTimeline(**patients[pid].model_dump(), interactions=history[pid])
+        for pid in ids
+        if pid in patients
+    ]
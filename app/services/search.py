@@ -0,0 +1,106 @@
+import re
+import uuid
+from typing import Sequence
+
+from sqlalchemy import ColumnElement, func, text
+from sqlmodel import Session, col, or_, select
+
+from app.models import Interaction, Patient
+
+
+def search_terms(query: str) -> list[str]:
+    """Lower-cased word tokens; anything else (operators, quotes) is dropped."""
+    return re.findall(r"\w+", query.lower())
+
+
+def search_patients(session: Session, query: str, limit: int) -> Sequence[Patient]:
+    """Patients whose names contain words starting with every term, best first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return _fts5_search(session, Patient, "patient_fts", terms, limit)
+
+    names = col(Patient.first_name) + " " + col(Patient.last_name)
+    if dialect == "postgresql":
+        return _tsvector_search(session, Patient, names, terms, limit)
+    statement = select(Patient).where(*_like_prefix(names, terms)).limit(limit)
+    return session.exec(statement).all()
+
+
+def search_interactions(
+    session: Session,
+    query: str,
+    limit: int,
+    patient_id: uuid.UUID | None = None,
+) -> Sequence[Interaction]:
+    """Interactions whose notes contain words starting with every term."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return _fts5_search(
+            session, Interaction, "interaction_fts", terms, limit, patient_id
+        )
+
+    notes = col(Interaction.notes)
+    if dialect == "postgresql":
+        return _tsvector_search(session, Interaction, notes, terms, limit, patient_id)
+    statement = select(Interaction).where(*_like_prefix(notes, terms))
+    if patient_id:
+        statement = statement.where(Interaction.patient_id == patient_id)
+    return session.exec(statement.limit(limit)).all()
+
+
+def _fts5_search(
+    session: Session,
+    model: type[Patient] | type[Interaction],
+    fts: str,
+    terms: list[str],
+    limit: int,
+    patient_id: uuid.UUID | None = None,
+):
+    source = model.__tablename__
+    patient_filter = f"AND {source}.patient_id = :patient_id" if patient_id else ""
+    statement = text(
+        f"SELECT {source}.* FROM {fts} JOIN {source} ON {source}.id = {fts}.id "
+        f"WHERE {fts} MATCH :match {patient_filter} ORDER BY {fts}.rank LIMIT :limit"
+    )
+    params = {
+        # Each term as a quoted prefix query, implicitly AND-ed
+        "match": " ".join(f'"{term}"*' for term in terms),
+        "limit": limit,
+    }
+    if patient_id:
+        params["patient_id"] = patient_id.hex
+    return (
+        session.execute(select(model).from_statement(statement), params).scalars().all()
+    )
+
+
+def _tsvector_search(
+    session: Session,
+    model: type[Patient] | type[Interaction],
+    document: ColumnElement[str],
+    terms: list[str],
+    limit: int,
+    patient_id: uuid.UUID | None = None,
+):
+    # Must match the expression of the GIN indexes in app.models.search
+    vector = func.to_tsvector("simple", document)
+    query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    statement = select(model).where(vector.op("@@")(query))
+    if patient_id:
+        statement = statement.where(Interaction.patient_id == patient_id)
+    statement = statement.order_by(func.ts_rank(vector, query).desc()).limit(limit)
+    return session.exec(statement).all()
+
+
+def _like_prefix(
+    document: ColumnElement[str], terms: list[str]
+) -> list[ColumnElement[bool]]:
+    return [
+        or_(document.ilike(f"{term}%"), document.ilike(f"% {term}%")) for term in terms
+    ]
@@ -0,0 +1,238 @@
+"""
+Outcome statistics kept as rollups (`patient_outcome_stats`,
+`daily_outcome_stats`) so dashboards never aggregate raw interactions.
+
+Write paths call `record` inside their own transaction, so the rollups
+commit or roll back together with the interactions they describe. Rollups
+of archived months are kept as they are; `rebuild` and `check` only cover
+the days still in the interaction table.
+"""
+
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, SQLModel, col, delete, func, insert, select, update
+
+from app.models import DailyOutcomeStats, Interaction, PatientOutcomeStats
+from app.schemas.stats import OutcomeCount, OutcomeStatistics, PatientSummary
+
+# (patient_id, outcome, timestamp) of an interaction
+InteractionKey = tuple[uuid.UUID, str, datetime]
+
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def record(
+    session: Session,
+    added: Iterable[InteractionKey] = (),
+    removed: Iterable[InteractionKey] = (),
+) -> None:
+    """Apply inserted and deleted interactions to the rollups."""
+    deltas: Counter[tuple[uuid.UUID, str, date]] = Counter()
+    for patient_id, outcome, timestamp in added:
+        deltas[(patient_id, outcome, _day(timestamp))] += 1
+    for patient_id, outcome, timestamp in removed:
+        deltas[(patient_id, outcome, _day(timestamp))] -= 1
+
+    daily: Counter[tuple[date, str]] = Counter()
+    for (_, outcome, day), delta in deltas.items():
+        daily[(day, outcome)] += delta
+
+    _increment(
+        session,
+        PatientOutcomeStats,
+        ("patient_id", "outcome", "day"),
+        [
+            {"patient_id": patient_id, "outcome": outcome, "day": day, "count": delta}
+            for (patient_id, outcome, day), delta in deltas.items()
+            if delta
+        ],
+    )
+    _increment(
+        session,
+        DailyOutcomeStats,
+        ("day", "outcome"),
+        [
+            {"day": day, "outcome": outcome, "count": delta}
+            for (day, outcome), delta in daily.items()
+            if delta
+        ],
+    )
+
+
+def forget_patient(session: Session, patient_id: uuid.UUID) -> None:
+    """Remove a patient's rollups and their share of the daily totals."""
+    rows = session.exec(
+        select(PatientOutcomeStats).where(PatientOutcomeStats.patient_id == patient_id)
+    ).all()
+    _increment(
+        session,
+        DailyOutcomeStats,
+        ("day", "outcome"),
+        [{"day": r.day, "outcome": r.outcome, "count": -r.count} for r in rows],
+    )
+    session.execute(
+        delete(PatientOutcomeStats).where(
+            col(PatientOutcomeStats.patient_id) == patient_id
+        )
+    )
+
+
+def outcome_statistics(session: Session, days: int | None = None) -> OutcomeStatistics:
+    statement = select(
+        DailyOutcomeStats.outcome, func.sum(DailyOutcomeStats.count)
+    ).group_by(DailyOutcomeStats.outcome)
+    if days:
+        statement = statement.where(DailyOutcomeStats.day >= _window_start(days))
+    return OutcomeStatistics(days=days, **_counts(session.exec(statement)))
+
+
+def patient_summary(
+    session: Session, patient_id: uuid.UUID, days: int | None = None
+) -> PatientSummary:
+    statement = (
+        select(PatientOutcomeStats.outcome, func.sum(PatientOutcomeStats.count))
+        .where(PatientOutcomeStats.patient_id == patient_id)
+        .group_by(PatientOutcomeStats.outcome)
+    )
+    if days:
+        statement = statement.where(PatientOutcomeStats.day >= _window_start(days))
+    return PatientSummary(
+        patient_id=patient_id, days=days, **_counts(session.exec(statement))
+    )
+
+
+def rebuild(session: Session) -> None:
+    """Recompute the rollups of the hot days from the interaction table."""
+    start = _hot_start(session)
+    session.execute(
+        delete(PatientOutcomeStats).where(col(PatientOutcomeStats.day) >= start)
+    )
+    session.execute(
+        delete(DailyOutcomeStats).where(col(DailyOutcomeStats.day) >= start)
+    )
+    day = func.date(Interaction.timestamp)
+    session.execute(
+        insert(PatientOutcomeStats).from_select(
+            ["patient_id", "outcome", "day", "count"],
+            select(Interaction.patient_id, Interaction.outcome, day, func.count())
+            .where(col(Interaction.timestamp) >= start)
+            .group_by(Interaction.patient_id, Interaction.outcome, day),
+        )
+    )
+    session.execute(
+        insert(DailyOutcomeStats).from_select(
+            ["day", "outcome", "count"],
+            select(
+                PatientOutcomeStats.day,
+                PatientOutcomeStats.outcome,
+                func.sum(PatientOutcomeStats.count),
+            )
+            .where(col(PatientOutcomeStats.day) >= start)
+            .group_by(PatientOutcomeStats.day, PatientOutcomeStats.outcome),
+        )
+    )
+    session.commit()
+
+
+def check(session: Session) -> list[str]:
+    """
+    Differences between the rollups of the hot days and a fresh aggregate of
+    interactions.
+    """
+    start = _hot_start(session)
+    day = func.date(Interaction.timestamp)
+    expected = {
+        (patient_id, outcome, date.fromisoformat(str(d))): count
+        for patient_id, outcome, d, count in session.exec(
+            select(Interaction.patient_id, Interaction.outcome, day, func.count())
+            .where(col(Interaction.timestamp) >= start)
+            .group_by(Interaction.patient_id, Interaction.outcome, day)
+        )
+    }
+    actual = {
+        (r.patient_id, r.outcome, r.day): r.count
+        for r in session.exec(
+            select(PatientOutcomeStats).where(col(PatientOutcomeStats.day) >= start)
+        )
+        if r.count
+    }
+    expected_daily: Counter[tuple[date, str]] = Counter()
+    for (_, outcome, d), count in expected.items():
+        expected_daily[(d, outcome)] += count
+    actual_daily = {
+        (r.day, r.outcome): r.count
+        for r in session.exec(
+            select(DailyOutcomeStats).where(col(DailyOutcomeStats.day) >= start)
+        )
+        if r.count
+    }
+    return [
+        f"{table} {key}: expected {want.get(key, 0)}, found {have.get(key, 0)}"
+        for table, want, have in [
+            ("patient_outcome_stats", expected, actual),
+            ("daily_outcome_stats", dict(expected_daily), actual_daily),
+        ]
+        for key in sorted(set(want) | set(have), key=str)
+        if want.get(key, 0) != have.get(key, 0)
+    ]
+
+
+def _hot_start(session: Session) -> date:
+    # Imported here: archive depends on this module through versions
+    from app.services import archive
+
+    start = archive.hot_since(archive.partitions(session))
+    return start.date() if start else date.min
+
+
+def _increment(
+    session: Session,
+    model: type[SQLModel],
+    keys: tuple[str, ...],
+    rows: list[dict[str, Any]],
+) -> None:
+    """Add each row's `count` to the matching rollup row, creating it if new."""
+    if not rows:
+        return
+    table = model.__table__  # type: ignore[attr-defined]
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is None:
+        for row in rows:
+            match = [table.c[key] == row[key] for key in keys]
+            result = session.execute(
+                update(table)
+                .where(*match)
+                .values(count=table.c["count"] + row["count"])
+            )
+            if result.rowcount == 0:
+                session.execute(insert(table).values(**row))
+        return
+    statement = upsert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={"count": table.c["count"] + statement.excluded["count"]},
+    )
+    session.execute(statement, rows)
+
+
+def _counts(rows: Iterable[tuple[str, int]]) -> dict[str, Any]:
+    outcomes = [
+        OutcomeCount(outcome=outcome, count=count)
+        for outcome, count in sorted(rows)
+        if count
+    ]
+    return {"total": sum(o.count for o in outcomes), "outcomes": outcomes}
+
+
+def _day(timestamp: datetime) -> date:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def _window_start(days: int) -> date:
+    return datetime.now(timezone.utc).date() - timedelta(days=days - 1)
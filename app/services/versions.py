@@ -0,0 +1,56 @@
+"""
+Version counters behind the ETags of the read endpoints.
+
+Interaction write paths call `bump` inside their own transaction, so a
+patient's history version moves together with the rows it describes.
+"""
+
+import uuid
+from typing import Iterable, Sequence
+
+from sqlmodel import Session, col, delete, insert, select, update
+
+from app.models import HistoryVersion
+from app.services.stats import UPSERT_DIALECTS
+
+
+def bump(session: Session, patient_ids: Iterable[uuid.UUID]) -> None:
+    """Mark the interaction history of each patient as changed."""
+    rows = [{"patient_id": pid, "version": 1} for pid in set(patient_ids)]
+    if not rows:
+        return
+    table = HistoryVersion.__table__  # type: ignore[attr-defined]
+    upsert = UPSERT_DIALECTS.get(session.get_bind().dialect.name)
+    if upsert is None:
+        for row in rows:
+            result = session.execute(
+                update(table)
+                .where(table.c.patient_id == row["patient_id"])
+                .values(version=table.c.version + 1)
+            )
+            if result.rowcount == 0:
+                session.execute(insert(table).values(**row))
+        return
+    statement = upsert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["patient_id"], set_={"version": table.c.version + 1}
+    )
+    session.execute(statement, rows)
+
+
+def history_versions(session: Session, patient_ids: Sequence[uuid.UUID]) -> list[int]:
+    """Current history version of each patient, in order, one indexed read."""
+    found = dict(
+        session.exec(
+            select(HistoryVersion.patient_id, HistoryVersion.version).where(
+                col(HistoryVersion.patient_id).in_(patient_ids)
+            )
+        ).all()
+    )
+    return [found.get(patient_id, 0) for patient_id in patient_ids]
+
+
+def forget_patient(session: Session, patient_id: uuid.UUID) -> None:
+    session.execute(
+        delete(HistoryVersion).where(col(HistoryVersion.patient_id) == patient_id)
+    )
@@ -0,0 +1,42 @@
+"""
+Move interactions older than the hot window into monthly archive files
+(gzip NDJSON under ARCHIVE_DIR). Archived rows stay readable through
+`since`/`until` listings and the export.
+
+Usage:
+    python -m app.tools.archive_interactions [--keep-months 12]
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine, init_db
+from app.services import archive
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--keep-months",
+        type=int,
+        default=settings.ARCHIVE_HOT_MONTHS,
+        help="recent months to keep in the table, including the current one",
+    )
+    args = parser.parse_args()
+
+    before = archive.month_start(datetime.now(timezone.utc).date())
+    for _ in range(args.keep_months - 1):
+        before = archive.month_start(before - timedelta(days=1))
+
+    init_db()
+    with Session(engine) as session:
+        for partition in archive.archive_months(session, before):
+            print(f"{partition.month:%Y-%m}: {partition.rows} rows -> {partition.file}")
+    print(f"Interactions before {before:%Y-%m} are archived.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Import patient master data from a CSV or NDJSON file.
+
+Usage:
+    python -m app.tools.import_patients patients.csv [--chunk-size 5000]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine, init_db
+from app.schemas.patient import PatientImportResult
+from app.services.export import ExportFormat
+from app.services.patient_import import import_patients, parse_records
+
+
+def report(result: PatientImportResult) -> None:
+    print(
+        f"{result.processed} processed, {result.inserted} inserted, "
+        f"{result.duplicates} duplicates, {result.failed} failed "
+        f"({result.rows_per_second:.0f} rows/s)",
+        file=sys.stderr,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        type=ExportFormat,
+        choices=list(ExportFormat),
+        help="defaults to the file extension",
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.BULK_CHUNK_SIZE)
+    parser.add_argument(
+        "--no-dedupe",
+        dest="dedupe",
+        action="store_false",
+        help="insert records even if the patient already exists",
+    )
+    args = parser.parse_args()
+
+    file_format = args.format or ExportFormat(args.path.suffix.lstrip(".").lower())
+    init_db()
+    with args.path.open(newline="", encoding="utf-8-sig") as lines:
+        with Session(engine) as session:
+            result = import_patients(
+                session,
+                parse_records(lines, file_format),
+                args.chunk_size,
+                args.dedupe,
+                progress=report,
+            )
+
+    for error in result.errors:
+        print(f"row {error.row}: {error.detail}", file=sys.stderr)
+    print(
+        f"Imported {result.inserted} of {result.processed} records "
+        f"in {result.seconds:.1f}s ({result.rows_per_second:.0f} rows/s)"
+    )
+    sys.exit(1 if result.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
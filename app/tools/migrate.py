@@ -0,0 +1,28 @@
+"""
+Apply the schema and seed data for this release, once, before starting the
+workers (pair with DB_INIT_ON_STARTUP=false).
+
+Usage:
+    python -m app.tools.migrate [--force]
+"""
+
+import argparse
+
+from app.core.database import SCHEMA_VERSION, init_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-run table creation and seeding even if the version is current",
+    )
+    args = parser.parse_args()
+
+    init_db(force=args.force)
+    print(f"Database schema is at version {SCHEMA_VERSION}.")
+
+
+if __name__ == "__main__":
+    main()
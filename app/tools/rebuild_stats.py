@@ -0,0 +1,40 @@
+"""
+Rebuild the outcome statistics rollups from the interaction table, or with
+--check only report where they disagree.
+
+Usage:
+    python -m app.tools.rebuild_stats [--check]
+"""
+
+import argparse
+import sys
+
+from sqlmodel import Session
+
+from app.core.database import engine, init_db
+from app.services import stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--check", action="store_true", help="compare only, do not rebuild"
+    )
+    args = parser.parse_args()
+
+    init_db()
+    with Session(engine) as session:
+        if not args.check:
+            stats.rebuild(session)
+            print("Rebuilt outcome statistics.")
+        problems = stats.check(session)
+
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print("Outcome statistics are consistent.")
+
+
+if __name__ == "__main__":
+    main()
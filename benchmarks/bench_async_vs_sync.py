@@ -0,0 +1,129 @@
+"""
+Load benchmark: sync (threadpool) vs async v1 endpoints.
+
+Runs the app in-process through httpx's ASGI transport against a file-backed
+SQLite database, so the sync handlers go through Starlette's threadpool
+exactly like under uvicorn.
+
+Usage:
+    python -m benchmarks.bench_async_vs_sync [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.api import async_api_router, sync_api_router
+from app.core.database import (
+    get_async_session,
+    get_read_session,
+    get_session,
+    to_async_url,
+)
+from app.models import Outcome
+
+CONCURRENCY_LEVELS = (50, 200, 1000)
+# Unbounded pool for both stacks: sync sessions hold their connection until the
+# dependency teardown gets a threadpool slot, so any fixed size deadlocks.
+POOL_OPTIONS = {"pool_size": 0}
+
+
+def build_apps(db_url: str) -> dict[str, FastAPI]:
+    engine = create_engine(
+        db_url, connect_args={"check_same_thread": False}, **POOL_OPTIONS
+    )
+    async_engine = create_async_engine(to_async_url(db_url), **POOL_OPTIONS)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for code in ["Healthy", "Monitor", "Critical"]:
+            session.add(Outcome(code=code))
+        session.commit()
+
+    def sync_session():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    async def async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    sync_app = FastAPI()
+    sync_app.include_router(sync_api_router, prefix="/api/v1")
+    sync_app.dependency_overrides[get_session] = sync_session
+    sync_app.dependency_overrides[get_read_session] = sync_session
+
+    async_app = FastAPI()
+    async_app.include_router(async_api_router, prefix="/api/v1")
+    async_app.dependency_overrides[get_async_session] = async_session
+    async_app.dependency_overrides[get_session] = sync_session
+    async_app.dependency_overrides[get_read_session] = sync_session
+    return {"sync": sync_app, "async": async_app}
+
+
+async def run_load(
+    app: FastAPI, concurrency: int, total: int
+) -> tuple[float, float, int]:
+    # Count failures (e.g. "database is locked") instead of aborting the run.
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        response = await c.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "date_of_birth": "1970-01-01",
+                "gender": "Other",
+            },
+        )
+        patient_id = response.json()["id"]
+        payload = {"patient_id": patient_id, "outcome": "Healthy", "notes": "bench"}
+        params = {"patient_id": patient_id, "limit": 20}
+        latencies: list[float] = []
+        errors = 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                if i % 4 == 0:
+                    response = await c.post("/api/v1/interactions/", json=payload)
+                else:
+                    response = await c.get("/api/v1/interactions/", params=params)
+                errors += response.is_error
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return total / elapsed, p99 * 1000, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = build_apps(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        print(f"{'mode':<6} {'clients':>7} {'req/s':>9} {'p99 ms':>9} {'errors':>7}")
+        for concurrency in CONCURRENCY_LEVELS:
+            total = max(args.requests, concurrency)
+            for mode, app in apps.items():
+                rps, p99, errors = asyncio.run(run_load(app, concurrency, total))
+                print(f"{mode:<6} {concurrency:>7} {rps:>9.0f} {p99:>9.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Audit benchmark: write throughput with the audit log off, written inline,
+and written by the background audit writer.
+
+Concurrent clients create interactions and then update each one, on the
+sync app (httpx ASGI transport, handlers in Starlette's threadpool) against
+a file-backed SQLite database:
+
+    off         AUDIT_ENABLED=false
+    inline      writer not started: each commit is followed by its own
+                audit INSERT and commit in the request
+    background  writer started: commits queue their entries, one thread
+                inserts whatever has accumulated in one statement
+
+Reports writes/s and, for the modes that audit, the audit INSERTs issued.
+
+Usage:
+    python -m benchmarks.bench_audit [--requests 2000] [--clients 50]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Engine, event
+from sqlmodel import Session, SQLModel, func, select
+
+from app.api.v1.api import sync_api_router
+from app.core.config import settings
+from app.core.database import create_db_engine, get_session
+from app.models import AuditEntry, Outcome
+from app.services import audit
+from app.services.outcome_registry import outcome_registry
+
+
+def build_app(db_url: str) -> tuple[FastAPI, Engine]:
+    # Unbounded pool: see bench_async_vs_sync
+    settings.DB_POOL_SIZE = 0
+    engine = create_db_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Outcome(code="Healthy"), Outcome(code="Monitor")])
+        session.commit()
+    outcome_registry.invalidate()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    return app, engine
+
+
+async def run_load(app: FastAPI, clients: int, total: int) -> tuple[float, int]:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        response = await c.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "date_of_birth": "1970-01-01",
+                "gender": "Other",
+            },
+        )
+        payload = {
+            "patient_id": response.json()["id"],
+            "outcome": "Healthy",
+            "notes": "bench",
+        }
+        errors = 0
+        semaphore = asyncio.Semaphore(clients)
+
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                created = await c.post("/api/v1/interactions/", json=payload)
+                if created.is_error:
+                    # Skip the update of a create that failed
+                    errors += 2
+                    return
+                updated = await c.put(
+                    f"/api/v1/interactions/{created.json()['id']}",
+                    json={"outcome": "Monitor", "notes": "updated"},
+                )
+                errors += updated.is_error
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total // 2)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'audit':<11} {'clients':>7} {'writes/s':>9} {'errors':>7}"
+        f" {'entries':>8} {'INSERTs':>8}"
+    )
+    for mode in ("off", "inline", "background"):
+        settings.AUDIT_ENABLED = mode != "off"
+        with tempfile.TemporaryDirectory() as tmp:
+            app, engine = build_app(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            inserts = [0]
+
+            def count(conn, cursor, statement, *args: object) -> None:
+                inserts[0] += statement.startswith("INSERT INTO audit_log")
+
+            event.listen(engine, "before_cursor_execute", count)
+            if mode == "background":
+                audit.writer.start()
+            rate, errors = asyncio.run(run_load(app, args.clients, args.requests))
+            audit.writer.stop()
+            with Session(engine) as session:
+                entries = session.exec(select(func.count(AuditEntry.id))).one()
+            engine.dispose()
+        print(
+            f"{mode:<11} {args.clients:>7} {rate:>9.0f} {errors:>7}"
+            f" {entries:>8} {inserts[0]:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
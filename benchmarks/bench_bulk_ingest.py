@@ -0,0 +1,76 @@
+"""
+Ingestion benchmark: N single POSTs vs one bulk upload of the same N rows.
+
+Usage:
+    python -m benchmarks.bench_bulk_ingest [--rows 5000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.database import get_session
+from app.main import app
+from app.models import Outcome
+from app.services.outcome_registry import outcome_registry
+
+
+def make_client(db_url: str) -> TestClient:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for code in ["Healthy", "Monitor", "Critical"]:
+            session.add(Outcome(code=code))
+        session.commit()
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = session_override
+    outcome_registry.invalidate()
+    return TestClient(app)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_client(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        patient_id = client.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "date_of_birth": "1970-01-01",
+                "gender": "Other",
+            },
+        ).json()["id"]
+        rows = [
+            {"patient_id": patient_id, "outcome": "Healthy", "notes": f"row {i}"}
+            for i in range(args.rows)
+        ]
+
+        start = time.perf_counter()
+        for row in rows:
+            client.post("/api/v1/interactions/", json=row)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = client.post("/api/v1/interactions/bulk", json=rows).json()
+        bulk = time.perf_counter() - start
+        assert result["created"] == args.rows, result["errors"][:3]
+
+    print(f"{'mode':<8} {'rows':>7} {'seconds':>9} {'rows/s':>10}")
+    print(f"{'single':<8} {args.rows:>7} {single:>9.2f} {args.rows / single:>10.0f}")
+    print(f"{'bulk':<8} {args.rows:>7} {bulk:>9.2f} {args.rows / bulk:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
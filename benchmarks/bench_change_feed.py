@@ -0,0 +1,160 @@
+"""
+Change feed benchmark: fan-out latency and memory with many SSE subscribers.
+
+Opens N streams on `GET /api/v1/interactions/stream` (driven straight
+through the ASGI app, no sockets; half of them filtered on
+`outcome=Critical`), then creates interactions one at a time, alternating
+Critical and Healthy, against a file-backed SQLite database. Reports the
+traced memory per connected subscriber and the delay from a create
+returning to each matching subscriber receiving the event.
+
+Usage:
+    python -m benchmarks.bench_change_feed [--subscribers 100 1000 5000] [--events 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core import change_feed
+from app.core.database import create_db_engine, get_lazy_session
+from app.models import Gender, Outcome, Patient
+from app.schemas.interaction import InteractionCreate
+from app.services import changes
+from app.services import interactions as interaction_service
+
+
+def build(db_url: str) -> tuple[FastAPI, Engine, Patient]:
+    engine = create_db_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add_all([Outcome(code="Healthy"), Outcome(code="Critical")])
+        patient = Patient(
+            first_name="Fan",
+            last_name="Out",
+            date_of_birth=date(1970, 1, 1),
+            gender=Gender.OTHER,
+        )
+        session.add(patient)
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_lazy_session] = session_override
+    return app, engine, patient
+
+
+def open_stream(
+    app: FastAPI, query: str, arrivals: list[tuple[int, float]], closed: asyncio.Event
+) -> "asyncio.Task[None]":
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/interactions/stream",
+        "raw_path": b"/api/v1/interactions/stream",
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive() -> dict[str, Any]:
+        await closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] != "http.response.body":
+            return
+        received = time.perf_counter()
+        for line in message.get("body", b"").splitlines():
+            if line.startswith(b"id: "):
+                arrivals.append((int(line[4:]), received))
+
+    return asyncio.create_task(app(scope, receive, send))
+
+
+async def run(
+    app: FastAPI, engine: Engine, patient: Patient, subscribers: int, events: int
+) -> tuple[float, list[float]]:
+    closed = asyncio.Event()
+    arrivals: list[tuple[int, float]] = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = [
+        open_stream(app, "outcome=Critical" if n % 2 else "", arrivals, closed)
+        for n in range(subscribers)
+    ]
+    while change_feed.hub.subscribers < subscribers:
+        await asyncio.sleep(0.01)
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - baseline) / subscribers
+    tracemalloc.stop()
+
+    def create(outcome: str) -> tuple[int, float]:
+        with Session(engine, expire_on_commit=False) as session:
+            interaction_service.create_interaction(
+                session,
+                InteractionCreate(patient_id=patient.id, outcome=outcome, notes="n"),
+            )
+        written = time.perf_counter()
+        return changes.latest_seq(engine), written
+
+    written: dict[int, float] = {}
+    expected = 0
+    for n in range(events):
+        outcome = "Critical" if n % 2 else "Healthy"
+        seq, at = await asyncio.to_thread(create, outcome)
+        written[seq] = at
+        expected += subscribers if outcome == "Critical" else subscribers // 2
+        await asyncio.sleep(0.05)
+    while len(arrivals) < expected:
+        await asyncio.sleep(0.01)
+
+    closed.set()
+    await asyncio.gather(*tasks)
+    return per_subscriber, [at - written[seq] for seq, at in arrivals]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'subscribers':>11} {'KiB/sub':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+    )
+    for subscribers in args.subscribers:
+        with tempfile.TemporaryDirectory() as tmp:
+            app, engine, patient = build(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            per_subscriber, delays = asyncio.run(
+                run(app, engine, patient, subscribers, args.events)
+            )
+            engine.dispose()
+        p50 = statistics.median(delays) * 1000
+        p99 = statistics.quantiles(delays, n=100)[98] * 1000
+        print(
+            f"{subscribers:>11} {per_subscriber / 1024:>8.1f} {p50:>7.1f}"
+            f" {p99:>7.1f} {max(delays) * 1000:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Cold-start benchmark: N workers booting together against a fresh SQLite
+database, until each has served its first request.
+
+Modes:
+    legacy   every worker runs create_all and per-code seeding (old init_db)
+    locked   every worker runs init_db: version check, one applies it
+    migrate  `app.tools.migrate` once, then workers only verify the version
+             (DB_INIT_ON_STARTUP=false)
+
+Each worker is a separate process that imports the app, runs its lifespan
+and serves `GET /health?detail=true`. Reports the wall time until all
+workers served, the mean per-worker startup (lifespan to first response)
+and workers that failed to start.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--workers 1 8 16]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+MODES = ("legacy", "locked", "migrate")
+
+
+def legacy_init_db() -> None:
+    """`init_db` before schema versioning, for comparison."""
+    from sqlmodel import Session, SQLModel
+
+    from app.core.database import engine
+    from app.models import Outcome, RegistryVersion
+    from app.services.outcome_registry import REGISTRY_NAME
+
+    SQLModel.metadata.create_all(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with Session(engine) as session:
+        for code in ["Healthy", "Monitor", "Critical"]:
+            if not session.get(Outcome, code):
+                session.add(Outcome(code=code, description="System Default"))
+        if not session.get(RegistryVersion, REGISTRY_NAME):
+            session.add(RegistryVersion(name=REGISTRY_NAME))
+        session.commit()
+
+
+def worker(mode: str, results: "multiprocessing.Queue[float | None]") -> None:
+    try:
+        from fastapi.testclient import TestClient
+
+        import app.main
+
+        if mode == "legacy":
+            app.main.init_db = legacy_init_db
+        started = time.perf_counter()
+        with TestClient(app.main.app) as client:
+            client.get("/health", params={"detail": True}).raise_for_status()
+        results.put(time.perf_counter() - started)
+    except Exception:
+        results.put(None)
+
+
+def boot(mode: str, workers: int, db_url: str) -> tuple[float, float, int]:
+    # Inherited by the spawned workers
+    os.environ.update(
+        DATABASE_URL=db_url,
+        METRICS_ENABLED="false",
+        DB_INIT_ON_STARTUP=str(mode != "migrate").lower(),
+    )
+    start = time.perf_counter()
+    if mode == "migrate":
+        subprocess.run(
+            [sys.executable, "-m", "app.tools.migrate"],
+            check=True,
+            capture_output=True,
+        )
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, results)) for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    startups = [results.get() for _ in processes]
+    wall = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    served = [s for s in startups if s is not None]
+    mean = statistics.mean(served) if served else float("nan")
+    return wall, mean, workers - len(served)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 16])
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<8} {'workers':>7} {'all up s':>9} {'startup ms':>11} {'failed':>7}"
+    )
+    for workers in args.workers:
+        for mode in MODES:
+            with tempfile.TemporaryDirectory() as tmp:
+                db_url = f"sqlite:///{Path(tmp) / 'app.db'}"
+                wall, mean, failed = boot(mode, workers, db_url)
+            print(
+                f"{mode:<8} {workers:>7} {wall:>9.2f} {mean * 1000:>11.1f} {failed:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
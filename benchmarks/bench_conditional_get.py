@@ -0,0 +1,133 @@
+"""
+Polling benchmark: clients re-fetching a patient's history and the outcome
+list, with and without `If-None-Match`.
+
+Each round every client polls its patient's history and the outcomes; one
+patient in ten gets a new interaction per round. Reports SQL statements and
+response bytes per poll.
+
+Usage:
+    python -m benchmarks.bench_conditional_get [--patients 50] [--rounds 20]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.v1.api import sync_api_router
+from app.core.database import get_read_session, get_session
+from app.models import Gender, Outcome, Patient
+from app.schemas.interaction import InteractionCreate
+from app.services import interactions as interaction_service
+
+HISTORY_SIZE = 20
+
+
+def build(db_url: str, patients: int) -> tuple[TestClient, list[str], list[int]]:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    patient_ids = []
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(Outcome(code="Healthy"))
+        for i in range(patients):
+            patient = Patient(
+                first_name=f"Poll{i}",
+                last_name="Bench",
+                date_of_birth=date(1970, 1, 1),
+                gender=Gender.OTHER,
+            )
+            session.add(patient)
+            patient_ids.append(str(patient.id))
+        session.commit()
+        for patient_id in patient_ids:
+            for i in range(HISTORY_SIZE):
+                interaction_service.create_interaction(
+                    session,
+                    InteractionCreate(
+                        patient_id=patient_id, outcome="Healthy", notes=f"visit {i}"
+                    ),
+                )
+
+    statements = [0]
+
+    def count(*args: object) -> None:
+        statements[0] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    return TestClient(app), patient_ids, statements
+
+
+def poll(
+    client: TestClient, patient_ids: list[str], rounds: int, conditional: bool
+) -> tuple[int, int, float]:
+    etags: dict[str, str] = {}
+    sent = 0
+    polls = 0
+    start = time.perf_counter()
+    for round_no in range(rounds):
+        for n, patient_id in enumerate(patient_ids):
+            if n % 10 == round_no % 10:
+                client.post(
+                    "/api/v1/interactions/",
+                    json={
+                        "patient_id": patient_id,
+                        "outcome": "Healthy",
+                        "notes": "new",
+                    },
+                )
+            for path in (
+                f"/api/v1/interactions/?patient_id={patient_id}",
+                "/api/v1/outcomes/",
+            ):
+                headers = (
+                    {"If-None-Match": etags[path]}
+                    if conditional and path in etags
+                    else {}
+                )
+                response = client.get(path, headers=headers)
+                if "ETag" in response.headers:
+                    etags[path] = response.headers["ETag"]
+                sent += len(response.content)
+                polls += 1
+    return polls, sent, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'SQL/poll':>9} {'bytes/poll':>11} {'ms/poll':>8}")
+    for conditional in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            client, patient_ids, statements = build(
+                f"sqlite:///{Path(tmp) / 'bench.db'}", args.patients
+            )
+            statements[0] = 0
+            polls, sent, seconds = poll(client, patient_ids, args.rounds, conditional)
+        mode = "conditional" if conditional else "plain"
+        print(
+            f"{mode:<12} {statements[0] / polls:>9.2f} {sent / polls:>11.0f}"
+            f" {seconds / polls * 1000:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
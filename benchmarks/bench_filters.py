@@ -0,0 +1,135 @@
+"""
+Range filter benchmark: `since`/`until` with outcome and patient lists, with
+and without the composite (outcome, timestamp) indexes.
+
+Seeds 5M interactions by default (1000 patients, three outcomes, spread over
+a year) and times one page of each query through `list_interactions`, then
+drops the composite indexes and times the same queries again.
+
+Usage:
+    python -m benchmarks.bench_filters [--rows 5000000] [--patients 1000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine, insert
+
+from app.models import Gender, Interaction, Patient
+from app.services.interactions import list_interactions
+
+COMPOSITE_INDEXES = (
+    "ix_interaction_outcome_timestamp_id",
+    "ix_interaction_patient_outcome_timestamp_id",
+)
+OUTCOMES = ["Healthy", "Monitor", "Critical"]
+# Critical is rare, like in real data
+WEIGHTS = [0.8, 0.15, 0.05]
+START = datetime(2024, 1, 1)
+SPAN_SECONDS = 365 * 24 * 3600
+
+
+def seed(session: Session, rows: int, patients: int) -> list[uuid.UUID]:
+    patient_ids = [uuid.uuid4() for _ in range(patients)]
+    session.execute(
+        insert(Patient),
+        [
+            {
+                "id": patient_id,
+                "first_name": "Range",
+                "last_name": str(n),
+                "date_of_birth": date(1970, 1, 1),
+                "gender": Gender.OTHER,
+            }
+            for n, patient_id in enumerate(patient_ids)
+        ],
+    )
+    random.seed(16)
+    chunk = 50_000
+    for start in range(0, rows, chunk):
+        count = min(chunk, rows - start)
+        session.execute(
+            insert(Interaction),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "patient_id": random.choice(patient_ids),
+                    "outcome": outcome,
+                    "notes": "seeded",
+                    "timestamp": START
+                    + timedelta(seconds=random.randrange(SPAN_SECONDS)),
+                }
+                for outcome in random.choices(OUTCOMES, WEIGHTS, k=count)
+            ],
+        )
+        session.commit()
+    return patient_ids
+
+
+def queries(patient_ids: list[uuid.UUID]) -> dict[str, dict]:
+    march = {"since": datetime(2024, 3, 1), "until": datetime(2024, 4, 1)}
+    return {
+        "Critical in March": {"outcomes": ["Critical"], **march},
+        "Critical|Monitor in March": {"outcomes": ["Critical", "Monitor"], **march},
+        "5 patients, Critical": {
+            "patient_ids": patient_ids[:5],
+            "outcomes": ["Critical"],
+            **march,
+        },
+        "Critical, last 2 weeks": {
+            "outcomes": ["Critical"],
+            "since": START + timedelta(days=351),
+        },
+    }
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            patient_ids = seed(session, args.rows, args.patients)
+            print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+            session.connection().exec_driver_sql("ANALYZE")
+
+            cases = queries(patient_ids)
+            with_indexes = {
+                name: timed(lambda: list_interactions(session, limit=args.limit, **q))
+                for name, q in cases.items()
+            }
+            for index in COMPOSITE_INDEXES:
+                session.connection().exec_driver_sql(f"DROP INDEX {index}")
+            session.connection().exec_driver_sql("ANALYZE")
+            without = {
+                name: timed(lambda: list_interactions(session, limit=args.limit, **q))
+                for name, q in cases.items()
+            }
+
+    print(f"{'query':<28} {'indexed ms':>11} {'without ms':>11}")
+    for name in cases:
+        print(f"{name:<28} {with_indexes[name]:>11.2f} {without[name]:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
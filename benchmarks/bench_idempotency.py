@@ -0,0 +1,113 @@
+"""
+Idempotency benchmark: the cost of a retried create.
+
+Sequential `POST /api/v1/interactions/` against a file-backed SQLite
+database:
+
+    no key        plain create
+    first         create with a new Idempotency-Key (claim + store)
+    replay table  retry of a stored key, LRU disabled (another worker)
+    replay memory retry of a stored key from the in-process LRU
+
+Reports requests/s, mean latency and SQL statements per request.
+
+Usage:
+    python -m benchmarks.bench_idempotency [--requests 2000]
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core.database import create_db_engine, get_read_session, get_session
+from app.core.idempotency import (
+    IDEMPOTENCY_HEADER,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+)
+from app.models import Gender, Outcome, Patient
+
+
+def build_client(engine: Engine, cache_size: int) -> TestClient:
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    store = IdempotencyStore(engine, max_entries=cache_size)
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    return TestClient(app)
+
+
+def run(
+    client: TestClient, payload: dict, keys: list[str | None], statements: list[int]
+) -> tuple[float, float, float]:
+    statements[0] = 0
+    start = time.perf_counter()
+    for key in keys:
+        headers = {IDEMPOTENCY_HEADER: key} if key else {}
+        client.post("/api/v1/interactions/", json=payload, headers=headers)
+    elapsed = time.perf_counter() - start
+    n = len(keys)
+    return n / elapsed, elapsed / n * 1000, statements[0] / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as session:
+            session.add(Outcome(code="Healthy"))
+            patient = Patient(
+                first_name="Re",
+                last_name="Try",
+                date_of_birth=date(1970, 1, 1),
+                gender=Gender.OTHER,
+            )
+            session.add(patient)
+            session.commit()
+        payload = {"patient_id": str(patient.id), "outcome": "Healthy", "notes": "n"}
+
+        statements = [0]
+
+        def count(*args: object) -> None:
+            statements[0] += 1
+
+        event.listen(engine, "before_cursor_execute", count)
+
+        keys = [str(uuid.uuid4()) for _ in range(args.requests)]
+        no_keys: list[str | None] = [None] * args.requests
+        with_cache = build_client(engine, cache_size=args.requests)
+        without_cache = build_client(engine, cache_size=0)
+        modes = [
+            ("no key", with_cache, no_keys),
+            ("first", with_cache, keys),
+            ("replay table", without_cache, keys),
+            ("replay memory", with_cache, keys),
+        ]
+
+        print(f"{'mode':<14} {'req/s':>8} {'mean ms':>8} {'SQL/req':>8}")
+        for mode, client, mode_keys in modes:
+            rate, mean_ms, sql = run(client, payload, mode_keys, statements)
+            print(f"{mode:<14} {rate:>8.0f} {mean_ms:>8.2f} {sql:>8.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
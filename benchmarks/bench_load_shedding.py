@@ -0,0 +1,174 @@
+"""
+Overload benchmark: latency of served requests with and without load
+shedding.
+
+First measures the capacity of `GET /api/v1/interactions/` on the sync app
+(closed loop, file-backed SQLite), then offers an open-loop arrival rate
+of 0.5x, 1x and 3x that capacity. The client shares the process, so the
+open loop already saturates the app at 1x. Without shedding every request queues for the
+threadpool and latency grows for as long as the overload lasts; with
+LoadSheddingMiddleware the adaptive limit rejects the excess with 503 and
+served requests keep their latency. Per-client rate limits are set out of
+the way so only the concurrency limit is measured.
+
+Usage:
+    python -m benchmarks.bench_load_shedding [--seconds 5] [--target-ms 25]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core.config import Settings, settings
+from app.core.database import create_db_engine, get_read_session, get_session
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.models import Gender, Outcome, Patient
+from app.services.interactions import insert_interactions
+
+LOADS = (0.5, 1, 3)
+URL = "/api/v1/interactions/?limit=50"
+
+
+def seed(db_url: str) -> Engine:
+    # Unbounded pool: see bench_async_vs_sync
+    settings.DB_POOL_SIZE = 0
+    engine = create_db_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        patient = Patient(
+            first_name="Bench",
+            last_name="Mark",
+            date_of_birth=datetime(1970, 1, 1).date(),
+            gender=Gender.OTHER,
+        )
+        session.add(patient)
+        session.commit()
+        start = datetime(2024, 1, 1)
+        insert_interactions(
+            session,
+            [
+                {
+                    "patient_id": patient.id,
+                    "timestamp": start + timedelta(minutes=n),
+                    "outcome": "Healthy",
+                    "notes": "bench",
+                }
+                for n in range(5000)
+            ],
+        )
+        session.commit()
+    return engine
+
+
+def build_app(engine: Engine, shedding: bool, target_ms: float) -> FastAPI:
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    if shedding:
+        config = Settings(
+            RATE_LIMIT_READ_PER_SECOND=1e9,
+            RATE_LIMIT_READ_BURST=1_000_000,
+            CONCURRENCY_TARGET_LATENCY_MS=target_ms,
+        )
+        app.add_middleware(LoadSheddingMiddleware, config=config)
+    return app
+
+
+async def capacity(app: FastAPI, seconds: float, clients: int = 8) -> float:
+    """Requests/s served by a closed loop of `clients`."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        done = 0
+        deadline = time.perf_counter() + seconds
+
+        async def loop() -> None:
+            nonlocal done
+            while time.perf_counter() < deadline:
+                (await c.get(URL)).raise_for_status()
+                done += 1
+
+        await asyncio.gather(*(loop() for _ in range(clients)))
+    return done / seconds
+
+
+async def offer(
+    app: FastAPI, rate: float, seconds: float
+) -> tuple[list[float], int, float]:
+    """Open loop at `rate` req/s: served latencies, rejections, wall time."""
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as c:
+        latencies: list[float] = []
+        rejected = 0
+
+        async def one(scheduled: float) -> None:
+            nonlocal rejected
+            response = await c.get(URL)
+            if response.status_code in (429, 503):
+                rejected += 1
+            else:
+                latencies.append(time.perf_counter() - scheduled)
+
+        tasks = []
+        start = time.perf_counter()
+        for n in range(int(rate * seconds)):
+            scheduled = start + n / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(scheduled)))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - start
+    return latencies, rejected, wall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--target-ms", type=float, default=25.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = seed(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        rate = asyncio.run(capacity(build_app(engine, False, args.target_ms), 2.0))
+        print(f"capacity: {rate:.0f} req/s\n")
+        print(
+            f"{'shedding':<9} {'load':>5} {'offered/s':>10} {'served/s':>9} "
+            f"{'shed %':>7} {'p50 ms':>8} {'p99 ms':>8}"
+        )
+        for load in LOADS:
+            for shedding in (False, True):
+                app = build_app(engine, shedding, args.target_ms)
+                latencies, rejected, wall = asyncio.run(
+                    offer(app, rate * load, args.seconds)
+                )
+                total = len(latencies) + rejected
+                p50 = statistics.median(latencies) * 1000
+                p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+                print(
+                    f"{'on' if shedding else 'off':<9} {load:>4g}x {rate * load:>10.0f}"
+                    f" {len(latencies) / wall:>9.0f} {rejected / total:>7.1%}"
+                    f" {p50:>8.1f} {p99:>8.1f}"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
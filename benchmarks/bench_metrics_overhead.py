@@ -0,0 +1,154 @@
+"""
+Micro-benchmark of the instrumentation overhead: the same endpoints served
+with and without MetricsMiddleware plus SQL event hooks.
+
+The two apps take turns in short batches of requests, so drift (CPU
+frequency, other load) hits both alike, and each figure is the median
+batch; long back-to-back runs of one app swung by several percent either
+way. A last row isolates the SQL hooks: the time they add to a trivial
+statement.
+
+Usage:
+    python -m benchmarks.bench_metrics_overhead [--batches 200] [--batch-size 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import Engine, text
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.v1.api import sync_api_router
+from app.core.database import get_lazy_session, get_read_session, get_session
+from app.core.metrics import (
+    MetricsMiddleware,
+    RequestStats,
+    _current,
+    instrument_engine,
+)
+from app.models import Gender, Interaction, Outcome, Patient
+
+PATHS = ("/api/v1/outcomes/", "/api/v1/interactions/?limit=20")
+
+
+def build_app(db_url: str, instrumented: bool) -> FastAPI:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    if instrumented:
+        instrument_engine(engine)
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_lazy_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    return app
+
+
+def seed(db_url: str) -> None:
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        patient = Patient(
+            first_name="Bench",
+            last_name="Mark",
+            date_of_birth=date(1970, 1, 1),
+            gender=Gender.OTHER,
+        )
+        session.add(patient)
+        for i in range(50):
+            session.add(Interaction(patient=patient, outcome="Healthy", notes=str(i)))
+        session.commit()
+
+
+async def batch_latencies_us(
+    apps: list[FastAPI], path: str, batches: int, batch_size: int
+) -> list[float]:
+    """Median per-request latency of each app over alternating batches."""
+    clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://b")
+        for app in apps
+    ]
+    latencies: list[list[float]] = [[] for _ in apps]
+    for client in clients:
+        for _ in range(100):  # warm-up
+            await client.get(path)
+    for _ in range(batches):
+        for client, samples in zip(clients, latencies):
+            start = time.perf_counter()
+            for _ in range(batch_size):
+                await client.get(path)
+            samples.append((time.perf_counter() - start) / batch_size * 1e6)
+    for client in clients:
+        await client.aclose()
+    return [statistics.median(samples) for samples in latencies]
+
+
+def statement_us(engine: Engine, statements: int) -> float:
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        start = time.perf_counter()
+        for _ in range(statements):
+            connection.execute(statement)
+        return (time.perf_counter() - start) / statements * 1e6
+
+
+def hook_cost_us(statements: int, rounds: int) -> tuple[float, float]:
+    """Median per-statement time without and with the SQL hooks."""
+    plain = create_engine("sqlite://")
+    instrumented = create_engine("sqlite://")
+    instrument_engine(instrumented)
+    token = _current.set(RequestStats())
+    times: dict[Engine, list[float]] = {plain: [], instrumented: []}
+    try:
+        for _ in range(rounds):
+            for engine, latencies in times.items():
+                latencies.append(statement_us(engine, statements))
+    finally:
+        _current.reset(token)
+    return statistics.median(times[plain]), statistics.median(times[instrumented])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed(db_url)
+        plain = build_app(db_url, instrumented=False)
+        instrumented = build_app(db_url, instrumented=True)
+
+        print(f"{'path':<32} {'plain us':>9} {'metrics us':>11} {'overhead':>9}")
+        for path in PATHS:
+            base, with_metrics = asyncio.run(
+                batch_latencies_us(
+                    [plain, instrumented], path, args.batches, args.batch_size
+                )
+            )
+            overhead = (with_metrics / base - 1) * 100
+            print(f"{path:<32} {base:>9.0f} {with_metrics:>11.0f} {overhead:>8.1f}%")
+
+    base, with_hooks = hook_cost_us(2000, args.batches // 10)
+    label = "SQL hooks, per statement"
+    added = with_hooks - base
+    print(f"{label:<32} {base:>9.1f} {with_hooks:>11.1f} {added:>7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
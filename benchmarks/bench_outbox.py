@@ -0,0 +1,123 @@
+"""
+Outbox benchmark: create latency with a slow side effect, inline vs outbox.
+
+Creates interactions one at a time against a file-backed SQLite database.
+Every create is followed by a side effect that sleeps for the given cost
+(standing in for a notification call):
+
+    inline    the side effect runs in the request, after the commit
+    outbox N  the create enqueues a message; N outbox worker threads run
+              the side effect in the background
+
+Reports mean and p99 create latency, and for the outbox the time from the
+first create until every side effect has run.
+
+Usage:
+    python -m benchmarks.bench_outbox [--creates 200] [--cost-ms 0 10 50] [--threads 4]
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
+
+from app.core import outbox_worker
+from app.core.database import create_db_engine
+from app.models import Gender, Outcome, Patient
+from app.schemas.interaction import InteractionCreate
+from app.services import interactions as interaction_service
+from app.services import outbox
+from app.services.outcome_registry import outcome_registry
+
+
+def build(db_url: str) -> tuple[Engine, Patient]:
+    engine = create_db_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(Outcome(code="Healthy"))
+        patient = Patient(
+            first_name="Side",
+            last_name="Effect",
+            date_of_birth=date(1970, 1, 1),
+            gender=Gender.OTHER,
+        )
+        session.add(patient)
+        session.commit()
+    outcome_registry.invalidate()
+    return engine, patient
+
+
+def run(
+    engine: Engine, patient: Patient, creates: int, cost: float, threads: int
+) -> tuple[list[float], float | None]:
+    """Create latencies, and seconds until all side effects ran (outbox only)."""
+    handled = [0]
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def side_effect(_: Session, payload: dict[str, Any]) -> None:
+        time.sleep(cost)
+        with lock:
+            handled[0] += len(payload["ids"])
+            if handled[0] >= creates:
+                done.set()
+
+    outbox.handlers[outbox.INTERACTIONS_CREATED] = [side_effect]
+    worker = outbox_worker.OutboxWorker(threads, batch_size=10, poll_seconds=1)
+    outbox_worker.worker = worker
+    if threads:
+        worker.start(engine)
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in range(creates):
+        began = time.perf_counter()
+        with Session(engine, expire_on_commit=False) as session:
+            created = interaction_service.create_interaction(
+                session,
+                InteractionCreate(patient_id=patient.id, outcome="Healthy", notes="n"),
+            )
+            if not threads:
+                side_effect(session, {"ids": [str(created.id)]})
+        latencies.append(time.perf_counter() - began)
+
+    finished = None
+    if threads:
+        done.wait()
+        finished = time.perf_counter() - start
+        worker.stop()
+    return latencies, finished
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--creates", type=int, default=200)
+    parser.add_argument("--cost-ms", type=float, nargs="+", default=[0, 10, 50])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    print(f"{'cost ms':>7} {'mode':<9} {'mean ms':>8} {'p99 ms':>7} {'all done s':>10}")
+    for cost_ms in args.cost_ms:
+        for threads in [0, *args.threads]:
+            with tempfile.TemporaryDirectory() as tmp:
+                engine, patient = build(f"sqlite:///{Path(tmp) / 'bench.db'}")
+                latencies, finished = run(
+                    engine, patient, args.creates, cost_ms / 1000, threads
+                )
+                engine.dispose()
+            mode = f"outbox {threads}" if threads else "inline"
+            mean = statistics.fmean(latencies) * 1000
+            p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+            done = f"{finished:>10.2f}" if finished is not None else f"{'-':>10}"
+            print(f"{cost_ms:>7.0f} {mode:<9} {mean:>8.2f} {p99:>7.2f} {done}")
+
+
+if __name__ == "__main__":
+    main()
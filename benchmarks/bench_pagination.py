@@ -0,0 +1,105 @@
+"""
+History paging benchmark: offset/limit vs keyset cursor at increasing depth.
+
+Seeds one patient with a long history (1M interactions by default) and times
+fetching a single page at each depth through `list_interactions`.
+
+Usage:
+    python -m benchmarks.bench_pagination [--rows 1000000] [--limit 100]
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine, insert, select
+
+from app.models import Gender, Interaction, Patient
+from app.services.interactions import list_interactions, next_cursor
+
+DEPTHS = (1, 10, 100, 1000, 5000, 9000)
+
+
+def seed(session: Session, rows: int) -> uuid.UUID:
+    patient = Patient(
+        first_name="Long",
+        last_name="History",
+        date_of_birth=date(1950, 1, 1),
+        gender=Gender.UNKNOWN,
+    )
+    session.add(patient)
+    session.commit()
+    base = datetime(2000, 1, 1, tzinfo=timezone.utc)
+    chunk = 50_000
+    for start in range(0, rows, chunk):
+        session.execute(
+            insert(Interaction),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "patient_id": patient.id,
+                    "outcome": "Healthy",
+                    "notes": "seeded",
+                    "timestamp": base + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + chunk, rows))
+            ],
+        )
+        session.commit()
+    return patient.id
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            patient_id = seed(session, args.rows)
+            print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+            print(f"{'page':>6} {'offset ms':>10} {'cursor ms':>10}")
+            for depth in DEPTHS:
+                offset = depth * args.limit
+                if offset >= args.rows:
+                    break
+                # Cursor pointing at the row just before the page (untimed)
+                previous = session.exec(
+                    select(Interaction)
+                    .where(Interaction.patient_id == patient_id)
+                    .order_by(Interaction.timestamp.desc(), Interaction.id.desc())
+                    .offset(offset - 1)
+                    .limit(1)
+                ).all()
+                cursor = next_cursor(previous, 1)
+
+                offset_ms = timed(
+                    lambda: list_interactions(session, offset, args.limit, [patient_id])
+                )
+                cursor_ms = timed(
+                    lambda: list_interactions(
+                        session, 0, args.limit, [patient_id], cursor=cursor
+                    )
+                )
+                print(f"{depth:>6} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
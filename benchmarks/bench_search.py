@@ -0,0 +1,118 @@
+"""
+Search benchmark: FTS5 prefix search vs a LIKE scan over patient names and
+interaction notes.
+
+FTS ranks every match, so very common terms cost more than an unranked
+LIKE that stops at LIMIT; selective terms avoid the full-table scan.
+
+Usage:
+    python -m benchmarks.bench_search [--rows 1000000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, col, create_engine, insert, or_, select
+
+from app.models import Gender, Interaction, Patient
+from app.services.search import search_interactions, search_patients
+
+SYLLABLES = ["an", "ber", "chri", "da", "el", "fer", "gun", "ha", "jo", "ka", "lu"]
+WORDS = ["headache", "fever", "ankle", "cough", "rash", "checkup", "follow-up"]
+QUERIES = ["jo", "luber", "headache", "fev ank"]
+
+
+def name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize()
+
+
+def seed(session: Session, rows: int) -> None:
+    rng = random.Random(42)
+    chunk = 20_000
+    for start in range(0, rows, chunk):
+        size = min(chunk, rows - start)
+        patients = [
+            {
+                "id": uuid.uuid4(),
+                "first_name": name(rng),
+                "last_name": name(rng),
+                "date_of_birth": date(1980, 1, 1),
+                "gender": Gender.UNKNOWN,
+            }
+            for _ in range(size)
+        ]
+        session.execute(insert(Patient), patients)
+        session.execute(
+            insert(Interaction),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "patient_id": patient["id"],
+                    "outcome": "Healthy",
+                    "notes": " ".join(rng.choices(WORDS, k=6)),
+                    "timestamp": datetime.now(timezone.utc),
+                }
+                for patient in patients
+            ],
+        )
+        session.commit()
+
+
+def like_patients(session: Session, query: str, limit: int):
+    statement = select(Patient)
+    for term in query.split():
+        statement = statement.where(
+            or_(
+                col(Patient.first_name).ilike(f"%{term}%"),
+                col(Patient.last_name).ilike(f"%{term}%"),
+            )
+        )
+    return session.exec(statement.limit(limit)).all()
+
+
+def like_interactions(session: Session, query: str, limit: int):
+    statement = select(Interaction)
+    for term in query.split():
+        statement = statement.where(col(Interaction.notes).ilike(f"%{term}%"))
+    return session.exec(statement.limit(limit)).all()
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            start = time.perf_counter()
+            seed(session, args.rows)
+            elapsed = time.perf_counter() - start
+            print(f"seeded {args.rows} patients + interactions in {elapsed:.1f}s")
+
+            print(f"{'target':<13} {'query':<10} {'fts ms':>8} {'like ms':>9}")
+            for query in QUERIES:
+                for target, fts, like in [
+                    ("patients", search_patients, like_patients),
+                    ("interactions", search_interactions, like_interactions),
+                ]:
+                    fts_ms = timed(fts, session, query, args.limit)
+                    like_ms = timed(like, session, query, args.limit)
+                    print(f"{target:<13} {query:<10} {fts_ms:>8.2f} {like_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
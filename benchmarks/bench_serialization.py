@@ -0,0 +1,117 @@
+"""
+List endpoint serialisation benchmark: ORM rows validated through
+`response_model` vs plain column rows encoded with orjson
+(`FAST_JSON_RESPONSES`).
+
+Times `GET /interactions/` and `GET /patients/` end to end (query, encoding
+and transport) for pages of 1k and 10k rows, best of several rounds.
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 10000] [--rounds 5]
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine, insert
+
+from app.api.v1.api import sync_api_router
+from app.core.config import settings
+from app.core.database import get_read_session, get_session
+from app.models import Gender, Interaction, Outcome, Patient
+
+PAGE_SIZES = (1000, 10_000)
+
+
+def seed(db_url: str, rows: int) -> None:
+    engine = create_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        patients = [
+            {
+                "id": uuid.uuid4(),
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "date_of_birth": date(1950 + i % 50, 1 + i % 12, 1 + i % 28),
+                "gender": list(Gender)[i % len(Gender)],
+            }
+            for i in range(rows)
+        ]
+        session.execute(insert(Patient), patients)
+        session.execute(
+            insert(Interaction),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "patient_id": patients[i % len(patients)]["id"],
+                    "outcome": "Healthy",
+                    "notes": f"Routine check-up {i}, no findings.",
+                    "timestamp": base + timedelta(seconds=i, microseconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        session.commit()
+
+
+def build_app(db_url: str) -> FastAPI:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+
+    def session_override():
+        with Session(engine) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    app.dependency_overrides[get_read_session] = session_override
+    return app
+
+
+def best_ms(client: TestClient, path: str, fast: bool, rounds: int) -> float:
+    settings.FAST_JSON_RESPONSES = fast
+    client.get(path)  # warm-up
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = client.get(path)
+        best = min(best, time.perf_counter() - start)
+        response.raise_for_status()
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        seed(db_url, args.rows)
+        client = TestClient(build_app(db_url))
+
+        print(f"{'endpoint':<14} {'rows':>6} {'validated ms':>13} {'orjson ms':>10}")
+        for resource in ("interactions", "patients"):
+            for page in PAGE_SIZES:
+                if page > args.rows:
+                    continue
+                path = f"/api/v1/{resource}/?limit={page}"
+                validated = best_ms(client, path, False, args.rounds)
+                fast = best_ms(client, path, True, args.rounds)
+                print(
+                    f"{resource:<14} {page:>6} {validated:>13.1f} {fast:>10.1f}"
+                    f"  ({validated / fast:.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Session acquisition benchmark: eager per-request sessions (a sync generator
+dependency, as `get_session`) vs the lazy dependencies, for `/health` and
+the list endpoints at high request rates.
+
+Runs the app in-process through httpx's ASGI transport against a file-backed
+SQLite database, so sync dependencies go through the threadpool exactly like
+under uvicorn.
+
+Usage:
+    python -m benchmarks.bench_session_acquisition [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.database import (
+    get_lazy_session,
+    get_read_session,
+    get_session,
+    lazy_session,
+)
+from app.main import app
+from app.models import Gender, Outcome, Patient
+
+CONCURRENCY = 200
+PATHS = ("/health", "/api/v1/patients/?limit=20", "/api/v1/outcomes/")
+
+
+def install(db_url: str) -> dict[str, dict]:
+    engine = create_engine(
+        db_url, connect_args={"check_same_thread": False}, pool_size=0
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        for i in range(100):
+            session.add(
+                Patient(
+                    first_name=f"Rate{i}",
+                    last_name="Bench",
+                    date_of_birth=date(1970, 1, 1),
+                    gender=Gender.OTHER,
+                )
+            )
+        session.commit()
+    read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+    def eager():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    async def lazy():
+        async with lazy_session(
+            lambda: Session(engine, expire_on_commit=False)
+        ) as session:
+            yield session
+
+    async def lazy_read():
+        async with lazy_session(
+            lambda: Session(read_engine, autoflush=False, expire_on_commit=False)
+        ) as session:
+            yield session
+
+    return {
+        "eager": {get_session: eager, get_lazy_session: eager, get_read_session: eager},
+        "lazy": {
+            get_session: eager,
+            get_lazy_session: lazy,
+            get_read_session: lazy_read,
+        },
+    }
+
+
+async def run_load(path: str, total: int) -> tuple[float, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        latencies: list[float] = []
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await c.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return total / elapsed, p99 * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = install(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        print(f"{'path':<28} {'mode':<6} {'req/s':>8} {'p99 ms':>8}")
+        for path in PATHS:
+            for mode, overrides in modes.items():
+                app.dependency_overrides = dict(overrides)
+                rps, p99 = asyncio.run(run_load(path, args.requests))
+                print(f"{path:<28} {mode:<6} {rps:>8.0f} {p99:>8.1f}")
+        app.dependency_overrides = {}
+
+
+if __name__ == "__main__":
+    main()
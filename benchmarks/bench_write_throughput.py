@@ -0,0 +1,100 @@
+"""
+Write throughput benchmark: one commit per create vs group commit.
+
+100 concurrent clients POST interactions to the sync app (httpx ASGI
+transport, so handlers run in Starlette's threadpool like under uvicorn)
+against a file-backed SQLite database with the WAL profile.
+
+Usage:
+    python -m benchmarks.bench_write_throughput [--requests 3000] [--clients 100]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core.config import settings
+from app.core.database import create_db_engine, get_session
+from app.models import Outcome
+from app.services import interactions as interaction_service
+
+WINDOWS_MS = (0.0, 2.0, 5.0)
+
+
+def build_app(db_url: str) -> FastAPI:
+    # Unbounded pool: see bench_async_vs_sync
+    settings.DB_POOL_SIZE = 0
+    engine = create_db_engine(db_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        session.commit()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    return app
+
+
+async def run_load(app: FastAPI, clients: int, total: int) -> tuple[float, int]:
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        response = await c.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "date_of_birth": "1970-01-01",
+                "gender": "Other",
+            },
+        )
+        payload = {
+            "patient_id": response.json()["id"],
+            "outcome": "Healthy",
+            "notes": "bench",
+        }
+        errors = 0
+        semaphore = asyncio.Semaphore(clients)
+
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                response = await c.post("/api/v1/interactions/", json=payload)
+                errors += response.is_error
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+    return total / elapsed, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--clients", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'group commit':<14} {'clients':>7} {'writes/s':>9} {'errors':>7}")
+    for window_ms in WINDOWS_MS:
+        settings.GROUP_COMMIT_WINDOW_MS = window_ms
+        interaction_service.interaction_committer.window_ms = window_ms
+        with tempfile.TemporaryDirectory() as tmp:
+            app = build_app(f"sqlite:///{Path(tmp) / 'bench.db'}")
+            rate, errors = asyncio.run(run_load(app, args.clients, args.requests))
+        mode = f"{window_ms:g} ms" if window_ms else "off"
+        print(f"{mode:<14} {args.clients:>7} {rate:>9.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
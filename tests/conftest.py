@@ -1,12 +1,16 @@
-from typing import Generator
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Generator, Iterator
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
-from app.core.database import get_session
+from app.core.database import get_lazy_session, get_read_session, get_session
+from app.core.metrics import instrument_engine
 from app.main import app
+from app.services.outcome_registry import outcome_registry
 
 # Use in-memory SQLite for tests.
 # StaticPool is important for in-memory SQLite to share connection across threads.
@@ -14,6 +18,7 @@ sqlite_url = "sqlite://"
 engine = create_engine(
     sqlite_url, connect_args={"check_same_thread": False}, poolclass=StaticPool
 )
+instrument_engine(engine)
 
 
 @pytest.fixture(name="session")
@@ -32,9 +37,12 @@ def session_fixture() -> Generator[Session, None, None]:
             seed_session.add(Outcome(code=code, description="Test Default"))
         seed_session.commit()
 
-    with Session(engine) as session:
+    # The registry is process-wide; never let one test see another's outcomes.
+    outcome_registry.invalidate()
+    with Session(engine, expire_on_commit=False) as session:
         yield session
     SQLModel.metadata.drop_all(engine)
+    outcome_registry.invalidate()
 
 
 @pytest.fixture(name="client")
@@ -47,5 +55,55 @@ def client_fixture(session: Session) -> Generator[TestClient, None, None]:
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_lazy_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
     yield TestClient(app)
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(name="create_patient")
+def create_patient_fixture(client: TestClient) -> Callable[..., str]:
+    """
+    Factory creating a patient through the API and returning its id. Names
+    are positional, any other field can be overridden by keyword.
+    """
+
+    def create_patient(
+        first_name: str = "Test", last_name: str = "Patient", **fields: Any
+    ) -> str:
+        response = client.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": first_name,
+                "last_name": last_name,
+                "date_of_birth": "1980-01-01",
+                "gender": "Other",
+                **fields,
+            },
+        )
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create_patient
+
+
+@pytest.fixture(name="count_queries")
+def count_queries_fixture() -> Callable[[], ContextManager[list[str]]]:
+    """
+    Context manager collecting every SQL statement sent to the test database.
+    """
+
+    @contextmanager
+    def count_queries() -> Iterator[list[str]]:
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return count_queries
@@ -0,0 +1,158 @@
+import gzip
+import json
+import re
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import Gender, Interaction, Patient
+from app.services import archive, stats
+from app.services.interactions import insert_interactions
+
+# Two archived months (Jan, Feb) and one hot month (Mar)
+TIMESTAMPS = [
+    datetime(2024, 1, 5, 9),
+    datetime(2024, 1, 20, 9),
+    datetime(2024, 2, 10, 9),
+    datetime(2024, 3, 1, 9),
+    datetime(2024, 3, 15, 9),
+]
+
+
+@pytest.fixture(name="archived")
+def archived_fixture(session: Session, tmp_path: Path, monkeypatch) -> Patient:
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    patient = Patient(
+        first_name="Old",
+        last_name="Records",
+        date_of_birth=date(1950, 5, 5),
+        gender=Gender.FEMALE,
+    )
+    session.add(patient)
+    session.commit()
+    insert_interactions(
+        session,
+        [
+            Interaction(
+                patient_id=patient.id,
+                timestamp=timestamp,
+                outcome="Critical" if n % 2 else "Healthy",
+                notes=f"visit {n}",
+            ).model_dump()
+            for n, timestamp in enumerate(TIMESTAMPS)
+        ],
+    )
+    session.commit()
+    archive.archive_months(session, date(2024, 3, 1))
+    return patient
+
+
+def test_archive_moves_months_out_of_the_table(
+    session: Session, archived: Patient, tmp_path: Path
+):
+    months = [p.month for p in archive.partitions(session)]
+    assert months == [date(2024, 1, 1), date(2024, 2, 1)]
+    assert session.exec(select(func.count()).select_from(Interaction)).one() == 2
+
+    with gzip.open(tmp_path / "interactions-2024-01.ndjson.gz", "rt") as lines:
+        records = [json.loads(line) for line in lines]
+    assert [r["notes"] for r in records] == ["visit 0", "visit 1"]
+    assert not list(tmp_path.glob("*.partial"))
+
+    # Rollups still count archived interactions, and survive a rebuild
+    summary = stats.patient_summary(session, archived.id)
+    assert summary.total == 5
+    stats.rebuild(session)
+    assert stats.patient_summary(session, archived.id).total == 5
+    assert stats.check(session) == []
+
+    # Running it again is a no-op
+    assert archive.archive_months(session, date(2024, 3, 1)) == []
+
+
+def test_late_rows_are_merged_into_their_month(
+    session: Session, archived: Patient, tmp_path: Path
+):
+    late = Interaction(
+        patient_id=archived.id,
+        timestamp=datetime(2024, 1, 10, 9),
+        outcome="Monitor",
+        notes="late",
+    )
+    session.add(late)
+    session.commit()
+    (partition,) = archive.archive_months(session, date(2024, 3, 1))
+    assert partition.rows == 3
+    notes = [i.notes for i in archive.read_partition(partition)]
+    assert notes == ["visit 0", "late", "visit 1"]
+
+
+def test_list_routes_by_time_range(
+    client: TestClient, archived: Patient, count_queries, monkeypatch
+):
+    opened = []
+    read_partition = archive.read_partition
+
+    def record(partition):
+        opened.append(partition.month)
+        return read_partition(partition)
+
+    monkeypatch.setattr(archive, "read_partition", record)
+    params = {"patient_id": str(archived.id)}
+    # Without a range the archive is only read on request
+    response = client.get("/api/v1/interactions/", params=params)
+    assert [i["notes"] for i in response.json()] == ["visit 4", "visit 3"]
+    assert opened == []
+    response = client.get(
+        "/api/v1/interactions/", params={**params, "include_archived": True}
+    )
+    assert [i["notes"] for i in response.json()] == [
+        f"visit {n}" for n in (4, 3, 2, 1, 0)
+    ]
+    opened.clear()
+
+    with count_queries() as statements:
+        response = client.get(
+            "/api/v1/interactions/",
+            params={**params, "since": "2024-01-10T00:00:00", "until": "2024-03-01"},
+        )
+    assert [i["notes"] for i in response.json()] == ["visit 2", "visit 1"]
+    # Only archived months overlap the range: the hot table is not queried
+    assert statements
+    assert not [s for s in statements if re.search(r"FROM interaction\b", s)]
+    assert opened == [date(2024, 2, 1), date(2024, 1, 1)]
+
+    response = client.get(
+        "/api/v1/interactions/",
+        params={**params, "outcome": "Critical", "include_archived": True},
+    )
+    assert [i["notes"] for i in response.json()] == ["visit 3", "visit 1"]
+
+
+def test_pages_cross_tiers(client: TestClient, archived: Patient):
+    params = {"patient_id": str(archived.id), "limit": 2, "include_archived": True}
+    seen = []
+    cursor = None
+    while True:
+        response = client.get(
+            "/api/v1/interactions/",
+            params={**params, **({"cursor": cursor} if cursor else {})},
+        )
+        seen += [i["notes"] for i in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        cursor = response.headers["X-Next-Cursor"]
+    assert seen == [f"visit {n}" for n in (4, 3, 2, 1, 0)]
+
+    response = client.get("/api/v1/interactions/", params={**params, "offset": 3})
+    assert [i["notes"] for i in response.json()] == ["visit 1", "visit 0"]
+
+
+def test_export_includes_archived_rows(client: TestClient, archived: Patient):
+    response = client.get("/api/v1/interactions/export")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["notes"] for r in records] == [f"visit {n}" for n in range(5)]
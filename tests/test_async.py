@@ -0,0 +1,117 @@
+from contextlib import asynccontextmanager
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.pool import StaticPool
+
+from app.api.v1.api import async_api_router
+from app.core.config import settings
+from app.core.database import get_async_session, to_async_url
+from app.models import Outcome
+from app.services.outcome_registry import outcome_registry
+
+async_engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with AsyncSession(async_engine) as session:
+        for code in ["Healthy", "Monitor", "Critical"]:
+            session.add(Outcome(code=code, description="Test Default"))
+        await session.commit()
+    yield
+    async with async_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+@pytest.fixture(name="async_client")
+def async_client_fixture(monkeypatch) -> Generator[TestClient, None, None]:
+    """
+    TestClient for an app serving the async routers from in-memory aiosqlite.
+    """
+    # The audit writer uses the app's sync engine, not this private database
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", False)
+
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(async_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_async_session] = get_async_session_override
+    outcome_registry.invalidate()
+    with TestClient(app) as client:
+        yield client
+    outcome_registry.invalidate()
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert (
+        to_async_url("postgresql://user:pw@db/app")
+        == "postgresql+asyncpg://user:pw@db/app"
+    )
+    with pytest.raises(ValueError):
+        to_async_url("oracle://db")
+
+
+def test_async_crud_roundtrip(async_client: TestClient):
+    response = async_client.post(
+        "/api/v1/patients/",
+        json={
+            "first_name": "Async",
+            "last_name": "Doe",
+            "date_of_birth": "1980-01-01",
+            "gender": "Female",
+        },
+    )
+    assert response.status_code == 201
+    patient_id = response.json()["id"]
+
+    response = async_client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": "Healthy", "notes": "First"},
+    )
+    assert response.status_code == 201
+    interaction_id = response.json()["id"]
+
+    response = async_client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": "Unknown", "notes": "Bad"},
+    )
+    assert response.status_code == 400
+
+    response = async_client.put(
+        f"/api/v1/interactions/{interaction_id}",
+        json={"outcome": "Critical", "notes": "Updated"},
+    )
+    assert response.status_code == 200
+    assert response.json()["outcome"] == "Critical"
+
+    response = async_client.get(f"/api/v1/interactions/?patient_id={patient_id}")
+    assert [i["notes"] for i in response.json()] == ["Updated"]
+    etag = response.headers["ETag"]
+    response = async_client.get(
+        f"/api/v1/interactions/?patient_id={patient_id}",
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 304
+
+    response = async_client.get("/api/v1/outcomes/")
+    assert {o["code"] for o in response.json()} == {"Healthy", "Monitor", "Critical"}
+
+    response = async_client.delete(f"/api/v1/patients/{patient_id}")
+    assert response.status_code == 204
+    response = async_client.get(f"/api/v1/interactions/?patient_id={patient_id}")
+    assert response.json() == []
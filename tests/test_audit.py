@@ -0,0 +1,175 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel
+
+from app.core.audit_writer import AuditWriter
+from app.core.database import create_db_engine
+from app.models import AuditAction, Gender, Outcome, Patient
+from app.models.interaction import utcnow
+from app.schemas.patient import PatientCreate, PatientUpdate
+from app.services import audit
+from app.services import outcomes as outcome_service
+from app.services import patients as patient_service
+
+
+def test_interaction_history_survives_updates_and_deletion(
+    client: TestClient, create_patient
+):
+    patient_id = create_patient()
+    created = client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": "Monitor", "notes": "first"},
+    ).json()
+    url = f"/api/v1/interactions/{created['id']}"
+    client.put(url, json={"notes": "second", "outcome": "Critical"})
+    client.put(url, json={"notes": "second"})
+    client.delete(url)
+
+    response = client.get(f"{url}/history")
+    assert response.status_code == 200
+    create, update, delete = response.json()
+    assert create["action"] == "create"
+    assert create["before"] is None
+    assert create["after"]["notes"] == "first"
+    assert create["after"]["patient_id"] == patient_id
+    # Only what changed; the no-op update left no entry
+    assert update["action"] == "update"
+    assert update["before"] == {"notes": "first", "outcome": "Monitor"}
+    assert update["after"] == {"notes": "second", "outcome": "Critical"}
+    assert delete["action"] == "delete"
+    assert delete["before"]["notes"] == "second"
+    assert delete["after"] is None
+    assert create["id"] < update["id"] < delete["id"]
+
+    response = client.get(f"/api/v1/interactions/{uuid.uuid4()}/history")
+    assert response.status_code == 404
+
+
+def test_patient_and_outcome_writes_are_audited(session: Session):
+    patient = patient_service.create_patient(
+        session,
+        PatientCreate(
+            first_name="Ada",
+            last_name="Audit",
+            date_of_birth=date(1970, 7, 7),
+            gender=Gender.FEMALE,
+        ),
+    )
+    patient_service.update_patient(session, patient.id, PatientUpdate(last_name="B"))
+    patient_service.delete_patient(session, patient.id)
+    actions = [
+        (entry.action, entry.before, entry.after and entry.after.get("last_name"))
+        for entry in audit.history(session, audit.PATIENT, patient.id)
+    ]
+    assert actions[:2] == [
+        (AuditAction.CREATE, None, "Audit"),
+        (AuditAction.UPDATE, {"last_name": "Audit"}, "B"),
+    ]
+    assert actions[2][0] == AuditAction.DELETE
+    assert actions[2][1]["deleted_interactions"] == 0
+
+    outcome_service.create_outcome(session, Outcome(code="Stable"))
+    outcome_service.update_outcome(
+        session, "Stable", Outcome(code="Stable", description="No change")
+    )
+    outcome_service.delete_outcome(session, "Stable")
+    entries = audit.history(session, audit.OUTCOME, "Stable")
+    assert [entry.action for entry in entries] == [
+        AuditAction.CREATE,
+        AuditAction.UPDATE,
+        AuditAction.DELETE,
+    ]
+    assert entries[1].after == {"description": "No change"}
+
+
+def test_rolled_back_writes_are_not_audited(session: Session):
+    patient = Patient(
+        first_name="Never",
+        last_name="Saved",
+        date_of_birth=date(1980, 8, 8),
+        gender=Gender.OTHER,
+    )
+    session.add(patient)
+    audit.record(session, audit.PATIENT, patient.id, AuditAction.CREATE)
+    session.rollback()
+    assert audit.history(session, audit.PATIENT, patient.id) == []
+
+
+def test_background_writer_batches_entries(tmp_path: Path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    SQLModel.metadata.create_all(engine)
+    inserts: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO audit_log"):
+            inserts.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    writer = AuditWriter(audit.insert_entries, max_batch=1000, max_queued=1000)
+    monkeypatch.setattr(audit, "writer", writer)
+    writer.start()
+
+    def create(n: int) -> uuid.UUID:
+        with Session(engine, expire_on_commit=False) as session:
+            return patient_service.create_patient(
+                session,
+                PatientCreate(
+                    first_name=f"P{n}",
+                    last_name="Batch",
+                    date_of_birth=date(1990, 1, 1),
+                    gender=Gender.OTHER,
+                ),
+            ).id
+
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            ids = list(pool.map(create, range(200)))
+        writer.flush()
+    finally:
+        writer.stop()
+
+    with Session(engine) as session:
+        for patient_id in ids:
+            (entry,) = audit.history(session, audit.PATIENT, patient_id)
+            assert entry.action == AuditAction.CREATE
+    # Commits that arrived while a batch was written share the next INSERT
+    assert len(inserts) < len(ids)
+    engine.dispose()
+
+
+def queued_entry(n: int) -> dict[str, Any]:
+    return {
+        "entity_type": audit.OUTCOME,
+        "entity_id": "Retried",
+        "action": AuditAction.UPDATE,
+        "before": {"n": n},
+        "after": None,
+        "recorded_at": utcnow(),
+    }
+
+
+def test_failed_batches_are_retried_not_dropped(session: Session):
+    attempts: list[int] = []
+
+    def write(session: Session, rows) -> None:
+        attempts.append(len(rows))
+        if len(attempts) < 3:
+            raise RuntimeError("database unavailable")
+        audit.insert_entries(session, rows)
+
+    writer = AuditWriter(write, max_batch=10, max_queued=10, backoff=0.01)
+    writer.start()
+    try:
+        writer.put(session.get_bind(), [queued_entry(n) for n in range(2)])
+        writer.flush()
+    finally:
+        writer.stop()
+
+    assert attempts == [2, 2, 2]
+    assert len(audit.history(session, audit.OUTCOME, "Retried")) == 2
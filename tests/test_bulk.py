@@ -0,0 +1,82 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints.interactions import read_bulk_rows
+from app.core.config import settings
+
+
+def test_bulk_create_interactions(client: TestClient, create_patient):
+    patient_id = create_patient()
+    rows = [
+        {"patient_id": patient_id, "outcome": "Healthy", "notes": "1"},
+        {"patient_id": str(uuid.uuid4()), "outcome": "Healthy", "notes": "2"},
+        {"patient_id": patient_id, "outcome": "Recovered", "notes": "3"},
+        {"patient_id": patient_id, "notes": "4"},
+        {"patient_id": patient_id, "outcome": "Critical", "notes": "5"},
+    ]
+
+    response = client.post("/api/v1/interactions/bulk", json=rows)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3]
+    assert "not found" in data["errors"][0]["detail"]
+    assert "Invalid outcome" in data["errors"][1]["detail"]
+    assert "outcome" in data["errors"][2]["detail"]
+
+    history = client.get(f"/api/v1/interactions/?patient_id={patient_id}").json()
+    assert sorted(i["notes"] for i in history) == ["1", "5"]
+
+
+def test_bulk_create_interactions_ndjson(client: TestClient, create_patient):
+    patient_id = create_patient()
+    lines = [
+        json.dumps({"patient_id": patient_id, "outcome": "Monitor", "notes": "a"}),
+        "{not json",
+        "",
+        json.dumps({"patient_id": patient_id, "outcome": "Healthy", "notes": "b"}),
+    ]
+
+    response = client.post(
+        "/api/v1/interactions/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert [error["index"] for error in data["errors"]] == [1]
+
+    history = client.get(f"/api/v1/interactions/?patient_id={patient_id}").json()
+    assert len(history) == 2
+
+
+def test_bulk_rejects_non_array_body(client: TestClient):
+    response = client.post("/api/v1/interactions/bulk", json={"notes": "x"})
+    assert response.status_code == 422
+
+
+def test_bulk_ndjson_over_the_row_limit_stops_reading(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ROWS", 3)
+    received: list[int] = []
+
+    async def receive() -> dict:
+        received.append(len(received))
+        return {
+            "type": "http.request",
+            "body": b'{"notes": "x"}\n',
+            "more_body": len(received) < 100,
+        }
+
+    headers = [(b"content-type", b"application/x-ndjson")]
+    request = Request({"type": "http", "method": "POST", "headers": headers}, receive)
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(read_bulk_rows(request))
+    assert raised.value.status_code == 413
+    # Refused at the fourth line, not after reading all 100
+    assert len(received) == 4
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, AsyncIterator, Generator
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core.change_feed import ChangeFeedHub
+from app.core.database import DEFAULT_OUTCOMES, create_db_engine, get_lazy_session
+from app.models import Gender, Outcome, Patient
+from app.schemas.interaction import InteractionCreate, InteractionUpdate
+from app.services import changes
+from app.services import interactions as interaction_service
+from app.services.outcome_registry import outcome_registry
+
+
+@pytest.fixture(name="feed")
+def feed_fixture(tmp_path: Path) -> Generator[tuple[FastAPI, Engine], None, None]:
+    """
+    The v1 API on a file database: the hub reads on its own connections
+    while the test writes, which the shared in-memory test engine cannot do.
+    """
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'feed.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Outcome(code=code) for code in DEFAULT_OUTCOMES])
+        session.commit()
+    outcome_registry.invalidate()
+
+    def session_override():
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_lazy_session] = session_override
+    yield app, engine
+    engine.dispose()
+    outcome_registry.invalidate()
+
+
+class Stream:
+    """An SSE request driven straight through the ASGI app."""
+
+    def __init__(
+        self, app: FastAPI, url: str, headers: dict[str, str] | None = None
+    ) -> None:
+        self.app = app
+        parts = urlsplit(url)
+        self.scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+            "client": ("testclient", 1),
+            "server": ("testserver", 80),
+        }
+        self.chunks: asyncio.Queue[bytes] = asyncio.Queue()
+        self.started = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.buffer = b""
+
+    async def __aenter__(self) -> "Stream":
+        async def receive() -> dict[str, Any]:
+            await self.closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                self.started.set()
+            elif message["type"] == "http.response.body":
+                await self.chunks.put(message.get("body", b""))
+
+        self.task = asyncio.create_task(self.app(self.scope, receive, send))
+        # The handler subscribes before the response starts
+        await asyncio.wait_for(self.started.wait(), 5)
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.closed.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def events(self) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+        while True:
+            while b"\n\n" not in self.buffer:
+                self.buffer += await asyncio.wait_for(self.chunks.get(), 5)
+            frame, self.buffer = self.buffer.split(b"\n\n", 1)
+            fields = dict(
+                line.split(": ", 1) for line in frame.decode().splitlines() if line
+            )
+            if "id" in fields:
+                yield int(fields["id"]), json.loads(fields["data"])
+
+    async def take(self, count: int) -> list[tuple[int, dict[str, Any]]]:
+        received: list[tuple[int, dict[str, Any]]] = []
+        async for event in self.events():
+            received.append(event)
+            if len(received) == count:
+                return received
+        return received
+
+
+def make_patient(engine: Engine) -> Patient:
+    with Session(engine, expire_on_commit=False) as session:
+        patient = Patient(
+            first_name="Feed",
+            last_name="Reader",
+            date_of_birth=date(1960, 6, 6),
+            gender=Gender.FEMALE,
+        )
+        session.add(patient)
+        session.commit()
+    return patient
+
+
+def document(engine: Engine, patient: Patient, outcome: str, notes: str = ""):
+    with Session(engine, expire_on_commit=False) as session:
+        return interaction_service.create_interaction(
+            session,
+            InteractionCreate(patient_id=patient.id, outcome=outcome, notes=notes),
+        )
+
+
+def update(engine: Engine, interaction_id: uuid.UUID, notes: str) -> None:
+    with Session(engine) as session:
+        interaction_service.update_interaction(
+            session, interaction_id, InteractionUpdate(notes=notes)
+        )
+
+
+def test_stream_pushes_matching_creates_and_updates(feed):
+    app, engine = feed
+    patient = make_patient(engine)
+
+    async def run() -> None:
+        async with Stream(
+            app, "/api/v1/interactions/stream?outcome=Critical"
+        ) as stream:
+            await asyncio.to_thread(document, engine, patient, "Healthy")
+            critical = await asyncio.to_thread(document, engine, patient, "Critical")
+            ((seq, data),) = await stream.take(1)
+            assert data["id"] == str(critical.id)
+            assert data["notes"] == ""
+
+            await asyncio.to_thread(update, engine, critical.id, "escalated")
+            ((next_seq, data),) = await stream.take(1)
+            assert next_seq > seq
+            assert data["notes"] == "escalated"
+
+    asyncio.run(run())
+
+
+def test_stream_resumes_from_last_event_id(feed):
+    app, engine = feed
+    patient = make_patient(engine)
+    for n in range(3):
+        document(engine, patient, "Monitor", notes=str(n))
+
+    async def run() -> None:
+        async with Stream(app, "/api/v1/interactions/stream") as stream:
+            await asyncio.to_thread(document, engine, patient, "Healthy", "live")
+            ((seq, _),) = await stream.take(1)
+
+        # Reconnect as if the connection dropped after the first backlog event
+        headers = {"Last-Event-ID": str(seq - 3)}
+        async with Stream(app, "/api/v1/interactions/stream", headers) as stream:
+            await asyncio.to_thread(document, engine, patient, "Healthy", "after")
+            events = await stream.take(4)
+        assert [data["notes"] for _, data in events] == ["1", "2", "live", "after"]
+        assert [seq for seq, _ in events] == sorted(seq for seq, _ in events)
+
+    asyncio.run(run())
+
+
+def test_failed_start_reaches_waiting_subscribers(monkeypatch):
+    calls = []
+
+    def latest_seq(bind: Any) -> int:
+        calls.append(bind)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return 0
+
+    monkeypatch.setattr(changes, "latest_seq", latest_seq)
+    hub = ChangeFeedHub(poll_seconds=0.05)
+    engine = create_db_engine("sqlite://")
+
+    async def run() -> None:
+        results = await asyncio.gather(
+            hub.subscribe(engine), hub.subscribe(engine), return_exceptions=True
+        )
+        assert [str(result) for result in results] == ["database unavailable"] * 2
+        # The next subscriber starts the hub again
+        subscription = await asyncio.wait_for(hub.subscribe(engine), 1)
+        hub.unsubscribe(subscription)
+
+    asyncio.run(run())
+    assert len(calls) == 2
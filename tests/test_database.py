@@ -0,0 +1,105 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, select, text
+
+from app.core import database
+from app.core.config import Settings
+from app.core.database import create_db_engine, engine_options
+from app.core.replicas import ReplicaRouter
+from app.main import app
+from app.models import Outcome
+
+
+def test_engine_options_pool_profile():
+    config = Settings(DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5)
+
+    options = engine_options("postgresql://db/app", config)
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is True
+    assert "connect_args" not in options
+
+    # In-memory SQLite has no pool to size
+    assert "pool_size" not in engine_options("sqlite://", config)
+
+
+def test_sqlite_pragmas_applied(tmp_path: Path):
+    config = Settings(SQLITE_BUSY_TIMEOUT_MS=1234, SQLITE_CACHE_SIZE=-2000)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}", config)
+
+    with engine.connect() as conn:
+
+        def pragma(name: str):
+            return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 1234
+        assert pragma("cache_size") == -2000
+    engine.dispose()
+
+
+def test_health_does_not_open_a_session(monkeypatch):
+    def no_session(*args, **kwargs):
+        raise AssertionError("session opened")
+
+    monkeypatch.setattr(database, "Session", no_session)
+    # No overrides: the real lazy dependency
+    response = TestClient(app).get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_read_session_is_lazy_autocommit(tmp_path: Path, monkeypatch):
+    read_engine = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter(read_engine))
+    request = Request({"type": "http", "headers": []})
+
+    async def use(touch: bool):
+        generator = database.get_read_session(request)
+        session = await generator.__anext__()
+        assert not session.used
+        if touch:
+            assert session.exec(text("SELECT 1")).one() == (1,)
+            assert session.autoflush is False
+            # pysqlite in autocommit mode: no implicit BEGIN
+            dbapi_connection = session.connection().connection.driver_connection
+            assert dbapi_connection.isolation_level is None
+        await generator.aclose()
+        return session
+
+    assert not asyncio.run(use(False)).used
+    assert asyncio.run(use(True)).used
+    # The session's own connection went back to the pool
+    assert read_engine.pool.checkedout() == 0
+    read_engine.dispose()
+
+
+def test_init_db_runs_once_per_schema_version(tmp_path: Path, monkeypatch):
+    fresh = create_db_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    monkeypatch.setattr(database, "engine", fresh)
+
+    with pytest.raises(RuntimeError, match="run `python -m app.tools.migrate`"):
+        database.verify_schema()
+
+    # Workers starting together: one applies the schema, the others wait
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: database.init_db(), range(8)))
+    database.verify_schema()
+    with Session(fresh) as session:
+        outcomes = session.exec(select(Outcome.code)).all()
+    assert sorted(outcomes) == sorted(database.DEFAULT_OUTCOMES)
+
+    statements = []
+    event.listen(
+        fresh, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    database.init_db()
+    assert len(statements) == 1
+    fresh.dispose()
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, insert
+
+from app.core.config import settings
+from app.models import Interaction
+from app.services.export import ExportFormat, export_interactions
+
+
+def test_export_interactions_ndjson(client: TestClient, create_patient):
+    patient_id = create_patient()
+    for outcome in ["Healthy", "Critical"]:
+        client.post(
+            "/api/v1/interactions/",
+            json={"patient_id": patient_id, "outcome": outcome, "notes": outcome},
+        )
+
+    response = client.get("/api/v1/interactions/export", params={"outcome": "Critical"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["patient_id"] == patient_id
+    assert rows[0]["outcome"] == "Critical"
+
+
+def test_export_patients_csv(client: TestClient, create_patient):
+    patient_id = create_patient(
+        "Export", "Me", date_of_birth="1990-02-02", gender="Female"
+    )
+
+    response = client.get("/api/v1/patients/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows == [
+        {
+            "id": patient_id,
+            "first_name": "Export",
+            "last_name": "Me",
+            "date_of_birth": "1990-02-02",
+            "gender": "Female",
+        }
+    ]
+
+
+def peak_export_memory(session: Session, rows: int) -> int:
+    patient_id = uuid.uuid4()
+    session.execute(
+        insert(Interaction),
+        [
+            {
+                "id": uuid.uuid4(),
+                "patient_id": patient_id,
+                "outcome": "Healthy",
+                "notes": "x" * 100,
+                "timestamp": datetime.now(timezone.utc),
+            }
+            for _ in range(rows)
+        ],
+    )
+    session.commit()
+
+    tracemalloc.start()
+    try:
+        for _ in export_interactions(
+            session.get_bind(), ExportFormat.NDJSON, patient_id=patient_id
+        ):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_memory_is_bounded(session: Session, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 200)
+
+    small = peak_export_memory(session, 1_000)
+    large = peak_export_memory(session, 10_000)
+
+    # 10x the rows must not mean anywhere near 10x the peak memory
+    assert large < small * 2
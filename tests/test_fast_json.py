@@ -0,0 +1,68 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.main import app
+from app.models import Gender, Interaction, Patient
+
+
+def seed(session: Session) -> Patient:
+    patient = Patient(
+        first_name="Fast",
+        last_name="Path",
+        date_of_birth=date(1975, 3, 14),
+        gender=Gender.OTHER,
+    )
+    session.add(patient)
+    base = datetime(2024, 5, 1, 8, 30, tzinfo=timezone.utc)
+    for i in range(5):
+        session.add(
+            Interaction(
+                patient_id=patient.id,
+                outcome="Monitor" if i % 2 else "Healthy",
+                notes="" if i == 0 else f"note {i}",
+                # Whole seconds and microseconds must both render like pydantic
+                timestamp=base + timedelta(seconds=i, microseconds=i * 1234),
+            )
+        )
+    session.commit()
+    return patient
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/v1/interactions/", {"limit": 2}),
+        ("/api/v1/interactions/", {"outcome": "Monitor"}),
+        ("/api/v1/patients/", {"gender": "Other"}),
+    ],
+)
+def test_fast_path_matches_response_model(
+    client: TestClient,
+    session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    path: str,
+    params: dict,
+):
+    seed(session)
+    validated = client.get(path, params=params)
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = client.get(path, params=params)
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers["content-type"] == validated.headers["content-type"]
+    assert fast.content == validated.content
+    assert fast.headers.get("X-Next-Cursor") == validated.headers.get("X-Next-Cursor")
+
+
+def test_openapi_schema_is_unchanged():
+    schema = app.openapi()["paths"]["/api/v1/interactions/"]["get"]["responses"]
+    assert schema["200"]["content"]["application/json"]["schema"] == {
+        "type": "array",
+        "items": {"$ref": "#/components/schemas/InteractionRead"},
+        "title": "Response Read Interactions Api V1 Interactions  Get",
+    }
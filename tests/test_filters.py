@@ -0,0 +1,123 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session
+
+from app.models import Gender, Interaction, Patient
+from app.services import interactions as interaction_service
+from app.services.interactions import insert_interactions
+
+OUTCOMES = ["Healthy", "Monitor", "Critical"]
+
+
+def seed(session: Session) -> list[uuid.UUID]:
+    """Three patients with one interaction per outcome on 1 Feb, Mar and Apr."""
+    patients = [
+        Patient(
+            first_name=f"Range{n}",
+            last_name="Filter",
+            date_of_birth=date(1980, 1, 1),
+            gender=Gender.OTHER,
+        )
+        for n in range(3)
+    ]
+    session.add_all(patients)
+    session.commit()
+    insert_interactions(
+        session,
+        [
+            Interaction(
+                patient_id=patient.id,
+                timestamp=datetime(2024, month, 1, hour),
+                outcome=outcome,
+                notes=f"{patient.first_name} {outcome} {month}",
+            ).model_dump()
+            for patient in patients
+            for month in (2, 3, 4)
+            for hour, outcome in enumerate(OUTCOMES)
+        ],
+    )
+    session.commit()
+    return [patient.id for patient in patients]
+
+
+def test_multi_value_and_range_filters(client: TestClient, session: Session):
+    patient_ids = seed(session)
+
+    response = client.get(
+        "/api/v1/interactions/",
+        params={
+            "outcome": ["Critical", "Monitor"],
+            "since": "2024-03-01T00:00:00",
+            "until": "2024-04-01T00:00:00",
+        },
+    )
+    assert response.status_code == 200
+    notes = [i["notes"] for i in response.json()]
+    assert len(notes) == 6
+    assert all(" 3" in n and "Healthy" not in n for n in notes)
+
+    response = client.get(
+        "/api/v1/interactions/",
+        params={
+            "patient_id": [str(pid) for pid in patient_ids[:2]],
+            "outcome": "Critical",
+            "since": "2024-04-01T00:00:00Z",
+        },
+    )
+    assert sorted(i["notes"] for i in response.json()) == [
+        "Range0 Critical 4",
+        "Range1 Critical 4",
+    ]
+
+    # Several patients still get a conditional-GET ETag
+    etag = response.headers["ETag"]
+    response = client.get(response.request.url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    ("patients", "outcomes", "index"),
+    [
+        (0, ["Critical"], "ix_interaction_outcome_timestamp_id"),
+        (0, ["Critical", "Monitor"], "ix_interaction_outcome_timestamp_id"),
+        (1, ["Critical"], "ix_interaction_patient_outcome_timestamp_id"),
+        (2, ["Critical", "Monitor"], "ix_interaction_patient_outcome_timestamp_id"),
+        (1, [], "ix_interaction_patient_timestamp_id"),
+    ],
+)
+def test_range_filters_use_composite_indexes(
+    session: Session, patients: int, outcomes: list[str], index: str
+):
+    patient_ids = seed(session)
+    engine = session.get_bind()
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM interaction \n" in statement:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        interaction_service.list_interactions(
+            session,
+            limit=10,
+            patient_ids=patient_ids[:patients],
+            outcomes=outcomes,
+            since=datetime(2024, 3, 1),
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = captured[0]
+    plan = " ".join(
+        row[-1]
+        for row in session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        )
+    )
+    assert f"USING INDEX {index}" in plan
+    assert "timestamp>?" in plan
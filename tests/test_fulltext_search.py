@@ -0,0 +1,99 @@
+from datetime import date
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, col, create_engine, delete, text
+
+from app.models import Gender, Patient
+from app.services import search as search_service
+
+
+def search_names(client: TestClient, q: str) -> list[str]:
+    response = client.get("/api/v1/patients/search", params={"q": q})
+    assert response.status_code == 200
+    return [f"{p['first_name']} {p['last_name']}" for p in response.json()]
+
+
+def test_patient_prefix_search(client: TestClient, create_patient):
+    create_patient("Johanna", "Smith")
+    create_patient("John", "Smithers")
+    create_patient("Mary", "Johnson")
+
+    assert sorted(search_names(client, "SMI")) == ["Johanna Smith", "John Smithers"]
+    assert search_names(client, "jo smithe") == ["John Smithers"]
+    assert sorted(search_names(client, "joh")) == [
+        "Johanna Smith",
+        "John Smithers",
+        "Mary Johnson",
+    ]
+    assert search_names(client, "nobody") == []
+    # Query syntax is not passed through to the search engine
+    assert search_names(client, 'mary* "(') == ["Mary Johnson"]
+
+
+def test_patient_search_follows_writes(client: TestClient, create_patient):
+    patient_id = create_patient("Renate", "Old")
+
+    client.put(f"/api/v1/patients/{patient_id}", json={"last_name": "New"})
+    assert search_names(client, "old") == []
+    assert search_names(client, "new") == ["Renate New"]
+
+    client.delete(f"/api/v1/patients/{patient_id}")
+    assert search_names(client, "renate") == []
+
+
+def test_interaction_notes_search(client: TestClient, create_patient):
+    p1 = create_patient("Note", "One")
+    p2 = create_patient("Note", "Two")
+    for patient_id, notes in [
+        (p1, "Persistent headache, prescribed ibuprofen"),
+        (p1, "Follow-up: headache resolved"),
+        (p2, "Headaches since Monday"),
+        (p2, "Sprained ankle"),
+    ]:
+        client.post(
+            "/api/v1/interactions/",
+            json={"patient_id": patient_id, "outcome": "Monitor", "notes": notes},
+        )
+
+    response = client.get("/api/v1/interactions/search", params={"q": "Headache"})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+    response = client.get(
+        "/api/v1/interactions/search", params={"q": "headache", "patient_id": p2}
+    )
+    assert [i["notes"] for i in response.json()] == ["Headaches since Monday"]
+
+    response = client.get("/api/v1/interactions/search", params={"q": "ibu head"})
+    assert [i["notes"] for i in response.json()] == [
+        "Persistent headache, prescribed ibuprofen"
+    ]
+
+
+def test_search_survives_vacuum(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for first_name in ["Anna", "Bert", "Carla", "Dora"]:
+            session.add(
+                Patient(
+                    first_name=first_name,
+                    last_name="Vacuum",
+                    date_of_birth=date(1960, 1, 1),
+                    gender=Gender.UNKNOWN,
+                )
+            )
+        session.commit()
+        session.execute(delete(Patient).where(col(Patient.first_name) == "Anna"))
+        session.commit()
+
+    # VACUUM may renumber the implicit rowids of the UUID-keyed tables
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+
+    with Session(engine) as session:
+        found = search_service.search_patients(session, "dora", 10)
+        assert [p.first_name for p in found] == ["Dora"]
+        assert search_service.search_patients(session, "anna", 10) == []
+    engine.dispose()
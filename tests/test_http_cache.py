@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+
+
+def test_history_conditional_get(client: TestClient, count_queries, create_patient):
+    patient_id = create_patient()
+    response = client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": "Healthy", "notes": "first"},
+    )
+    interaction_id = response.json()["id"]
+    params = {"patient_id": patient_id}
+
+    response = client.get("/api/v1/interactions/", params=params)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    with count_queries() as statements:
+        response = client.get(
+            "/api/v1/interactions/", params=params, headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    # Only the version lookup, no rows loaded
+    assert len(statements) == 1
+
+    # Other pages of the same history have their own ETag
+    other_page = client.get("/api/v1/interactions/", params={**params, "limit": 1})
+    assert other_page.headers["ETag"] != etag
+
+    # A notes-only edit changes neither count nor timestamps, but the ETag
+    client.put(f"/api/v1/interactions/{interaction_id}", json={"notes": "edited"})
+    response = client.get(
+        "/api/v1/interactions/", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["notes"] == "edited"
+    assert response.headers["ETag"] != etag
+
+
+def test_unfiltered_listing_has_no_etag(client: TestClient):
+    response = client.get("/api/v1/interactions/")
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_outcomes_conditional_get(client: TestClient):
+    response = client.get("/api/v1/outcomes/")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "public, max-age=60"
+
+    response = client.get("/api/v1/outcomes/", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+
+    client.post("/api/v1/outcomes/", json={"code": "Recovered"})
+    response = client.get("/api/v1/outcomes/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Recovered" in {o["code"] for o in response.json()}
@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.api.v1.api import sync_api_router
+from app.core.database import get_read_session, get_session
+from app.core.idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAYED_HEADER,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+)
+from app.models import IdempotencyRecord, Interaction, Patient
+
+PATIENT = {
+    "first_name": "Re",
+    "last_name": "Try",
+    "date_of_birth": "1980-08-08",
+    "gender": "Other",
+}
+
+
+def idempotent_app(session: Session) -> FastAPI:
+    """The v1 API on the test session behind a fresh idempotency store."""
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    app.add_middleware(IdempotencyMiddleware, store=IdempotencyStore(session.bind))
+    return app
+
+
+def count(session: Session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+@pytest.fixture(name="idempotent_client")
+def idempotent_client_fixture(session: Session) -> TestClient:
+    return TestClient(idempotent_app(session))
+
+
+def test_retry_replays_stored_response(
+    idempotent_client: TestClient, session: Session, count_queries
+):
+    headers = {IDEMPOTENCY_HEADER: "create-1"}
+    first = idempotent_client.post("/api/v1/patients/", json=PATIENT, headers=headers)
+    assert first.status_code == 201
+    assert REPLAYED_HEADER not in first.headers
+
+    with count_queries() as statements:
+        retry = idempotent_client.post(
+            "/api/v1/patients/", json=PATIENT, headers=headers
+        )
+    assert retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.json() == first.json()
+    # Served from memory
+    assert statements == []
+
+    # Another worker only has the table
+    other_worker = TestClient(idempotent_app(session))
+    with count_queries() as statements:
+        retry = other_worker.post("/api/v1/patients/", json=PATIENT, headers=headers)
+    assert retry.json() == first.json()
+    assert any("idempotency_key" in s for s in statements)
+    assert not any(s.startswith("INSERT INTO patient ") for s in statements)
+    assert count(session, Patient) == 1
+
+    # Without a key every request is executed
+    idempotent_client.post("/api/v1/patients/", json=PATIENT)
+    assert count(session, Patient) == 2
+
+
+def test_key_reused_with_another_body(idempotent_client: TestClient):
+    headers = {IDEMPOTENCY_HEADER: "create-2"}
+    idempotent_client.post("/api/v1/patients/", json=PATIENT, headers=headers)
+    response = idempotent_client.post(
+        "/api/v1/patients/", json={**PATIENT, "first_name": "Other"}, headers=headers
+    )
+    assert response.status_code == 422
+
+    response = idempotent_client.post(
+        "/api/v1/patients/", json=PATIENT, headers={IDEMPOTENCY_HEADER: "x" * 256}
+    )
+    assert response.status_code == 400
+
+
+def test_key_in_progress_on_another_worker(
+    idempotent_client: TestClient, session: Session
+):
+    session.add(
+        IdempotencyRecord(path="/api/v1/patients/", key="busy", fingerprint="f")
+    )
+    session.commit()
+    response = idempotent_client.post(
+        "/api/v1/patients/", json=PATIENT, headers={IDEMPOTENCY_HEADER: "busy"}
+    )
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert count(session, Patient) == 0
+
+
+def test_concurrent_requests_with_one_key_run_once(session: Session):
+    app = idempotent_app(session)
+    patient_id = TestClient(app).post("/api/v1/patients/", json=PATIENT).json()["id"]
+    payload = {"patient_id": patient_id, "outcome": "Healthy", "notes": "n"}
+
+    async def run() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            return await asyncio.gather(
+                *(
+                    c.post(
+                        "/api/v1/interactions/",
+                        json=payload,
+                        headers={IDEMPOTENCY_HEADER: "same"},
+                    )
+                    for _ in range(5)
+                )
+            )
+
+    responses = asyncio.run(run())
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert sum(REPLAYED_HEADER in r.headers for r in responses) == 4
+    assert count(session, Interaction) == 1
@@ -0,0 +1,134 @@
+import csv
+import json
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import AuditAction, Patient
+from app.schemas.patient import PatientImportResult
+from app.services import audit
+from app.services.export import ExportFormat
+from app.services.patient_import import decode_lines, import_patients, parse_records
+
+CSV_FILE = """first_name,last_name,date_of_birth,gender
+Ada,Lovelace,1815-12-10,Female
+Alan,Turing,1912-06-23,Male
+Ada,Lovelace,1815-12-10,Female
+Grace,Hopper,not-a-date,Female
+"""
+
+
+def test_import_patients_csv(client: TestClient):
+    response = client.post(
+        "/api/v1/patients/import",
+        params={"format": "csv"},
+        content=CSV_FILE,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["processed"] == 4
+    assert data["inserted"] == 2
+    assert data["duplicates"] == 1
+    assert data["failed"] == 1
+    assert data["errors"][0]["row"] == 4
+    assert "date_of_birth" in data["errors"][0]["detail"]
+
+    # Re-importing the same file inserts nothing new
+    data = client.post(
+        "/api/v1/patients/import", params={"format": "csv"}, content=CSV_FILE
+    ).json()
+    assert data["inserted"] == 0
+    assert data["duplicates"] == 3
+
+
+def test_import_patients_ndjson_without_dedupe(client: TestClient):
+    record = {
+        "first_name": "Twin",
+        "last_name": "Case",
+        "date_of_birth": "2001-01-01",
+        "gender": "Other",
+    }
+    body = "\n".join([json.dumps(record), json.dumps(record), "{broken"])
+
+    data = client.post(
+        "/api/v1/patients/import",
+        params={"format": "ndjson", "dedupe": False},
+        content=body,
+    ).json()
+    assert data["inserted"] == 2
+    assert data["failed"] == 1
+
+    patients = client.get("/api/v1/patients/", params={"last_name": "Case"}).json()
+    assert len(patients) == 2
+
+
+def test_import_reports_progress_per_chunk(session: Session):
+    lines = CSV_FILE.splitlines(keepends=True)[:3]
+    reports: list[PatientImportResult] = []
+
+    result = import_patients(
+        session,
+        parse_records(lines, ExportFormat.CSV),
+        chunk_size=1,
+        progress=lambda r: reports.append(r.model_copy()),
+    )
+
+    assert [r.processed for r in reports] == [1, 2]
+    assert result.inserted == 2
+    assert result.rows_per_second > 0
+    patients = session.exec(select(Patient)).all()
+    assert len(patients) == 2
+    # Imported rows are audited like any other create
+    for patient in patients:
+        (entry,) = audit.history(session, audit.PATIENT, patient.id)
+        assert entry.action == AuditAction.CREATE
+        assert entry.after["last_name"] == patient.last_name
+
+
+def test_import_dedupes_large_chunks_and_across_chunks(session: Session):
+    records = [
+        {
+            "first_name": "Many",
+            "last_name": f"Row{n}",
+            "date_of_birth": "1990-01-01",
+            "gender": "Other",
+        }
+        for n in range(700)
+    ]
+    # More keys than one lookup may bind; the last record repeats the first
+    result = import_patients(session, [*records, records[0]], chunk_size=1000)
+    assert result.inserted == 700
+    assert result.duplicates == 1
+
+    # Across chunks the earlier, committed chunk is found in the database
+    fresh = [{**record, "first_name": "Fresh"} for record in records[:3]]
+    result = import_patients(session, fresh + fresh, chunk_size=3)
+    assert result.inserted == 3
+    assert result.duplicates == 3
+
+
+def test_decode_lines_across_chunk_boundaries():
+    body = '\ufeffname\r\nZoë,"a\r\nb"\nlast'.encode()
+    # One byte at a time splits the BOM, "ë" and every "\r\n"
+    chunks = [body[i : i + 1] for i in range(len(body))]
+
+    lines = list(decode_lines(chunks))
+    assert lines == ["name\r\n", 'Zoë,"a\r\n', 'b"\n', "last"]
+    assert list(csv.reader(lines)) == [["name"], ["Zoë", "a\r\nb"], ["last"]]
+
+
+def test_import_streams_body(client: TestClient):
+    rows = "".join(f"Stream,Row{i},1990-01-01,Other\n" for i in range(50))
+
+    def body():
+        yield b"first_name,last_name,date_of_birth,gender\n"
+        data = rows.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    data = client.post(
+        "/api/v1/patients/import", params={"format": "csv"}, content=body()
+    ).json()
+    assert data["processed"] == 50
+    assert data["inserted"] == 50
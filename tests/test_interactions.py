@@ -3,23 +3,8 @@ import uuid
 from fastapi.testclient import TestClient
 
 
-# Helper to create a patient
-def create_patient(client: TestClient) -> str:
-    response = client.post(
-        "/api/v1/patients/",
-        json={
-            "first_name": "John",
-            "last_name": "Doe",
-            "date_of_birth": "1980-01-01",
-            "gender": "Male",
-        },
-    )
-    assert response.status_code == 201
-    return response.json()["id"]
-
-
-def test_create_interaction(client: TestClient):
-    patient_id = create_patient(client)
+def test_create_interaction(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     response = client.post(
         "/api/v1/interactions/",
@@ -50,8 +35,8 @@ def test_create_interaction_patient_not_found(client: TestClient):
     assert response.status_code == 404
 
 
-def test_read_patient_history(client: TestClient):
-    patient_id = create_patient(client)
+def test_read_patient_history(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     # Create two interactions
     client.post(
@@ -82,8 +67,8 @@ def test_read_history_patient_not_found(client: TestClient):
     assert len(response.json()) == 0
 
 
-def test_delete_patient(client: TestClient):
-    patient_id = create_patient(client)
+def test_delete_patient(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     # Create an interaction to ensure it gets deleted
     client.post(
@@ -102,8 +87,8 @@ def test_delete_patient(client: TestClient):
     assert len(response.json()) == 0
 
 
-def test_delete_interaction(client: TestClient):
-    patient_id = create_patient(client)
+def test_delete_interaction(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     # Create an interaction
     response = client.post(
@@ -130,8 +115,8 @@ def test_delete_interaction(client: TestClient):
     assert response.status_code == 201
 
 
-def test_configurable_outcomes(client: TestClient):
-    patient_id = create_patient(client)
+def test_configurable_outcomes(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     # Try to use "Recovered" (Not yet configured) -> Should Fail
     response = client.post(
@@ -160,8 +145,8 @@ def test_configurable_outcomes(client: TestClient):
     assert data[0]["outcome"] == "Recovered"
 
 
-def test_update_patient(client: TestClient):
-    patient_id = create_patient(client)
+def test_update_patient(client: TestClient, create_patient):
+    patient_id = create_patient(gender="Male")
 
     # Update Name
     response = client.put(
@@ -175,8 +160,8 @@ def test_update_patient(client: TestClient):
     assert data["gender"] == "Male"  # Should remain unchanged
 
 
-def test_update_interaction(client: TestClient):
-    patient_id = create_patient(client)
+def test_update_interaction(client: TestClient, create_patient):
+    patient_id = create_patient()
 
     # Create Interaction
     response = client.post(
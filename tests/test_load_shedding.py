@@ -0,0 +1,129 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import Settings
+from app.core.load_shedding import (
+    AdaptiveLimit,
+    LoadSheddingMiddleware,
+    TokenBucket,
+    client_key,
+)
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=2, updated=0.0)
+    assert bucket.take(now=0.0) == 0
+    assert bucket.take(now=0.0) == 0
+    assert bucket.take(now=0.0) == 0.5
+    assert bucket.take(now=0.5) == 0
+    # Never more than the burst banked
+    bucket.take(now=100.0)
+    bucket.take(now=100.0)
+    assert bucket.take(now=100.0) > 0
+
+
+def test_adaptive_limit_backs_off_once_per_round():
+    limit = AdaptiveLimit(minimum=2, maximum=10, target_seconds=0.1)
+    assert limit.limit == 10.0
+    limit.limit = 8.0
+    admitted_at = 0.0
+    # Slow responses of requests admitted before the cut count once
+    limit.observe(admitted_at, 0.5)
+    limit.observe(admitted_at, 0.5)
+    assert limit.limit == 8.0 * 0.9
+
+    # Fast responses grow the limit while it is in use
+    limit.inflight = 5
+    before = limit.limit
+    limit.observe(admitted_at, 0.01)
+    assert limit.limit > before
+    # ...but not when the load is far below it
+    limit.inflight = 1
+    before = limit.limit
+    limit.observe(admitted_at, 0.01)
+    assert limit.limit == before
+
+
+def test_client_key_trusts_forwarded_for_only_from_proxies():
+    proxies = {"10.0.0.1", "10.0.0.2"}
+
+    def scope(peer: str, *forwarded: str) -> dict:
+        headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+        return {"client": (peer, 1), "headers": headers}
+
+    assert client_key(scope("203.0.113.9", "198.51.100.1"), proxies) == "203.0.113.9"
+    assert client_key(scope("10.0.0.1", "198.51.100.1"), proxies) == "198.51.100.1"
+    # A spoofed entry in front of the real client address is ignored
+    spoofed = scope("10.0.0.1", "1.2.3.4, 198.51.100.1", "10.0.0.2")
+    assert client_key(spoofed, proxies) == "198.51.100.1"
+    assert client_key(scope("10.0.0.1"), proxies) == "10.0.0.1"
+
+
+def shedding_app(**config) -> tuple[FastAPI, asyncio.Event]:
+    release = asyncio.Event()
+    app = FastAPI()
+
+    @app.get("/api/v1/items")
+    async def read_items():
+        await release.wait()
+        return []
+
+    @app.post("/api/v1/items")
+    async def create_item():
+        return {}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    app.add_middleware(LoadSheddingMiddleware, config=Settings(**config))
+    return app, release
+
+
+def test_clients_over_their_rate_get_429():
+    app, release = shedding_app(
+        RATE_LIMIT_READ_PER_SECOND=0.01, RATE_LIMIT_READ_BURST=2
+    )
+    release.set()
+
+    async def run() -> None:
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1))
+        other = httpx.ASGITransport(app=app, client=("10.0.0.2", 1))
+        async with (
+            httpx.AsyncClient(transport=transport, base_url="http://test") as c,
+            httpx.AsyncClient(transport=other, base_url="http://test") as d,
+        ):
+            for _ in range(2):
+                assert (await c.get("/api/v1/items")).status_code == 200
+            response = await c.get("/api/v1/items")
+            assert response.status_code == 429
+            assert int(response.headers["Retry-After"]) >= 1
+            # Writes, other clients and non-API paths have their own budget
+            assert (await c.post("/api/v1/items")).status_code == 200
+            assert (await d.get("/api/v1/items")).status_code == 200
+            assert (await c.get("/health")).status_code == 200
+
+    asyncio.run(run())
+
+
+def test_requests_over_the_concurrency_limit_get_503():
+    app, release = shedding_app(CONCURRENCY_LIMIT_MIN=2, CONCURRENCY_LIMIT_MAX=2)
+
+    async def run() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            held = [asyncio.create_task(c.get("/api/v1/items")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            response = await c.get("/api/v1/items")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+            # The write class is not affected by reads piling up
+            assert (await c.post("/api/v1/items")).status_code == 200
+
+            release.set()
+            assert [r.status_code for r in await asyncio.gather(*held)] == [200, 200]
+            assert (await c.get("/api/v1/items")).status_code == 200
+
+    asyncio.run(run())
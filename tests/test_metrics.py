@@ -0,0 +1,62 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def metric_value(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not in metrics output")
+
+
+def test_metrics_per_route_template(client: TestClient):
+    for name in ["A", "B"]:
+        client.post(
+            "/api/v1/patients/",
+            json={
+                "first_name": name,
+                "last_name": "Metric",
+                "date_of_birth": "1999-09-09",
+                "gender": "Other",
+            },
+        )
+    patient_id = client.get("/api/v1/patients/").json()[0]["id"]
+    client.get(f"/api/v1/patients/{patient_id}/timeline")
+    client.get("/api/v1/does-not-exist")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    route = 'method="POST",route="/api/v1/patients/"'
+    assert metric_value(text, f'http_requests_total{{{route},status="201"}}') == 2
+    assert metric_value(text, f"http_request_duration_seconds_count{{{route}}}") == 2
+    assert metric_value(text, f"http_request_sql_statements_total{{{route}}}") >= 2
+    assert metric_value(text, f"http_request_sql_seconds_total{{{route}}}") > 0
+
+    # Path parameters collapse into the template
+    timeline = 'route="/api/v1/patients/{patient_id}/timeline"'
+    assert metric_value(text, f'http_requests_total{{method="GET",{timeline}') == 1
+    assert 'route="unmatched",status="404"' in text
+
+
+def test_slow_requests_are_logged(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, caplog
+):
+    monkeypatch.setattr(settings, "METRICS_SLOW_REQUEST_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+        client.get("/api/v1/outcomes/")
+    assert "Slow request GET /api/v1/outcomes/" in caplog.text
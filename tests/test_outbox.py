@@ -0,0 +1,198 @@
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlmodel import Session, SQLModel, select
+
+from app.core import outbox_worker
+from app.core.config import settings
+from app.core.database import DEFAULT_OUTCOMES, create_db_engine
+from app.models import Gender, OutboxMessage, Outcome, Patient
+from app.models.interaction import utcnow
+from app.schemas.interaction import InteractionCreate
+from app.services import interactions as interaction_service
+from app.services import outbox
+from app.services.outcome_registry import outcome_registry
+
+
+def make_patient(session: Session) -> Patient:
+    patient = Patient(
+        first_name="Out",
+        last_name="Box",
+        date_of_birth=date(1975, 5, 5),
+        gender=Gender.FEMALE,
+    )
+    session.add(patient)
+    session.commit()
+    return patient
+
+
+def messages(session: Session) -> list[OutboxMessage]:
+    session.expire_all()
+    return list(session.exec(select(OutboxMessage).order_by(OutboxMessage.id)))
+
+
+def test_creates_enqueue_one_message_per_transaction(session: Session, monkeypatch):
+    patient = make_patient(session)
+    # Nothing is written for a topic without a handler
+    interaction_service.create_interaction(
+        session,
+        InteractionCreate(patient_id=patient.id, outcome="Healthy", notes="none"),
+    )
+    assert messages(session) == []
+
+    monkeypatch.setitem(
+        outbox.handlers, outbox.INTERACTIONS_CREATED, [lambda _, payload: None]
+    )
+    created = interaction_service.create_interaction(
+        session,
+        InteractionCreate(patient_id=patient.id, outcome="Healthy", notes="one"),
+    )
+    rows = [
+        {"patient_id": str(patient.id), "outcome": "Monitor", "notes": str(n)}
+        for n in range(3)
+    ]
+    interaction_service.create_interactions_bulk(session, rows)
+
+    single, bulk = messages(session)
+    assert single.topic == bulk.topic == outbox.INTERACTIONS_CREATED
+    assert single.payload == {"ids": [str(created.id)]}
+    assert len(bulk.payload["ids"]) == 3
+
+
+def test_drain_runs_handlers_and_deletes_messages(session: Session, monkeypatch):
+    seen: list[dict[str, Any]] = []
+    monkeypatch.setitem(
+        outbox.handlers, "test.topic", [lambda _, payload: seen.append(payload)]
+    )
+    for n in range(3):
+        outbox.enqueue(session, "test.topic", {"n": n})
+    session.commit()
+
+    assert outbox.drain(session.get_bind(), "worker", limit=2) == 2
+    assert outbox.drain(session.get_bind(), "worker", limit=2) == 1
+    assert seen == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert messages(session) == []
+
+
+def test_failing_message_is_retried_with_backoff_then_dead_lettered(
+    session: Session, monkeypatch
+):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    seen: list[int] = []
+
+    def handle(_: Session, payload: dict[str, Any]) -> None:
+        if payload["n"] == 1:
+            raise RuntimeError("downstream unavailable")
+        seen.append(payload["n"])
+
+    monkeypatch.setitem(outbox.handlers, "test.topic", [handle])
+    for n in range(3):
+        outbox.enqueue(session, "test.topic", {"n": n})
+    session.commit()
+    bind = session.get_bind()
+
+    # The bad message fails the batch; the others go through one by one
+    # (at least once: 0 was handled again after the batch rolled back)
+    assert outbox.drain(bind, "worker", limit=10) == 3
+    assert seen == [0, 0, 2]
+    (failed,) = messages(session)
+    assert failed.attempts == 1
+    assert failed.claimed_by is None
+    assert "downstream unavailable" in failed.last_error
+    assert failed.available_at > utcnow()
+    assert outbox.drain(bind, "worker", limit=10) == 0
+
+    failed.available_at = utcnow() - timedelta(seconds=1)
+    session.add(failed)
+    session.commit()
+    assert outbox.drain(bind, "worker", limit=10) == 1
+    (dead,) = messages(session)
+    assert dead.attempts == 2
+    assert dead.dead_at is not None
+
+    dead.available_at = utcnow() - timedelta(seconds=1)
+    session.add(dead)
+    session.commit()
+    assert outbox.claim(bind, "worker", limit=10) == []
+
+
+def test_claims_are_disjoint_leases(session: Session, monkeypatch):
+    monkeypatch.setitem(outbox.handlers, "test.topic", [lambda _, payload: None])
+    for n in range(4):
+        outbox.enqueue(session, "test.topic", {"n": n})
+    session.commit()
+    bind = session.get_bind()
+
+    first = outbox.claim(bind, "a", limit=3)
+    second = outbox.claim(bind, "b", limit=3)
+    assert [message.payload["n"] for message in first] == [0, 1, 2]
+    assert [message.payload["n"] for message in second] == [3]
+    assert outbox.claim(bind, "c", limit=3) == []
+
+    # A worker that died holding a claim loses it when the lease runs out
+    for message in messages(session)[:3]:
+        message.available_at = utcnow() - timedelta(seconds=1)
+        session.add(message)
+    session.commit()
+    reclaimed = outbox.claim(bind, "c", limit=3)
+    assert [message.payload["n"] for message in reclaimed] == [0, 1, 2]
+
+
+@pytest.fixture(name="file_engine")
+def file_engine_fixture(tmp_path: Path):
+    """A file database: the worker threads need connections of their own."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'outbox.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([Outcome(code=code) for code in DEFAULT_OUTCOMES])
+        session.commit()
+    outcome_registry.invalidate()
+    yield engine
+    engine.dispose()
+    outcome_registry.invalidate()
+
+
+def test_worker_runs_slow_side_effects_off_the_request_path(file_engine, monkeypatch):
+    handled: list[str] = []
+    done = threading.Event()
+
+    def notify(_: Session, payload: dict[str, Any]) -> None:
+        time.sleep(0.2)
+        handled.extend(payload["ids"])
+        if len(handled) == 20:
+            done.set()
+
+    monkeypatch.setitem(outbox.handlers, outbox.INTERACTIONS_CREATED, [notify])
+    with Session(file_engine, expire_on_commit=False) as session:
+        patient = make_patient(session)
+
+    worker = outbox_worker.OutboxWorker(threads=4, batch_size=1, poll_seconds=5)
+    monkeypatch.setattr(outbox_worker, "worker", worker)
+    worker.start(file_engine)
+    try:
+        created = []
+        start = time.perf_counter()
+        for n in range(20):
+            with Session(file_engine, expire_on_commit=False) as session:
+                created.append(
+                    interaction_service.create_interaction(
+                        session,
+                        InteractionCreate(
+                            patient_id=patient.id, outcome="Healthy", notes=str(n)
+                        ),
+                    )
+                )
+        # 20 creates return well before 20 x 0.2 s of side effects ran
+        assert time.perf_counter() - start < 2
+        # Woken by the commits, not the 5 s poll; four threads share the work
+        assert done.wait(3)
+    finally:
+        worker.stop()
+
+    assert sorted(handled) == sorted(str(interaction.id) for interaction in created)
+    with Session(file_engine) as session:
+        assert messages(session) == []
@@ -0,0 +1,84 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Outcome
+from app.services import outcome_registry as outcome_registry_module
+from app.services.outcome_registry import OutcomeRegistry, outcome_registry
+
+
+def test_interaction_writes_skip_outcome_lookup(
+    client: TestClient, count_queries, create_patient
+):
+    patient_id = create_patient()
+    # Warm the registry
+    assert client.get("/api/v1/outcomes/").status_code == 200
+
+    with count_queries() as statements:
+        response = client.post(
+            "/api/v1/interactions/",
+            json={"patient_id": patient_id, "outcome": "Monitor", "notes": "Cached"},
+        )
+        client.get("/api/v1/outcomes/")
+
+    assert response.status_code == 201
+    assert not any("FROM outcome" in statement for statement in statements)
+
+
+def test_outcome_writes_invalidate_registry(client: TestClient):
+    assert "Recovered" not in {
+        o["code"] for o in client.get("/api/v1/outcomes/").json()
+    }
+
+    client.post("/api/v1/outcomes/", json={"code": "Recovered"})
+    assert "Recovered" in {o["code"] for o in client.get("/api/v1/outcomes/").json()}
+
+    client.put(
+        "/api/v1/outcomes/Recovered", json={"code": "Recovered", "description": "Up"}
+    )
+    outcomes = {o["code"]: o for o in client.get("/api/v1/outcomes/").json()}
+    assert outcomes["Recovered"]["description"] == "Up"
+
+    client.delete("/api/v1/outcomes/Recovered")
+    assert "Recovered" not in {
+        o["code"] for o in client.get("/api/v1/outcomes/").json()
+    }
+
+
+def test_registry_detects_write_from_other_worker(session: Session):
+    # Two workers, each with its own in-process copy
+    worker_a = OutcomeRegistry(check_interval=0)
+    worker_b = OutcomeRegistry(check_interval=3600)
+    assert not worker_a.exists(session, "Recovered")
+    assert not worker_b.exists(session, "Recovered")
+
+    session.add(Outcome(code="Recovered"))
+    outcome_registry.bump(session)
+    session.commit()
+
+    assert worker_a.exists(session, "Recovered")
+    # Not yet due for a version check
+    assert not worker_b.exists(session, "Recovered")
+
+
+def test_registry_discards_load_racing_a_write(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    registry = OutcomeRegistry(check_interval=3600)
+    read_version = outcome_registry_module._read_version
+
+    def write_commits_during_load(session: Session) -> int:
+        # Another request commits an outcome write while this load is running
+        registry.invalidate()
+        return read_version(session)
+
+    monkeypatch.setattr(
+        outcome_registry_module, "_read_version", write_commits_during_load
+    )
+    assert not registry.exists(session, "Recovered")
+    monkeypatch.undo()
+
+    session.add(Outcome(code="Recovered"))
+    session.commit()
+    # The racing load was not cached, so the next lookup reads fresh data
+    assert registry.exists(session, "Recovered")
@@ -0,0 +1,68 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Gender, Interaction, Patient
+
+
+def seed_history(session: Session, count: int) -> uuid.UUID:
+    patient = Patient(
+        first_name="Page",
+        last_name="Turner",
+        date_of_birth=date(1960, 6, 6),
+        gender=Gender.FEMALE,
+    )
+    session.add(patient)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        # Pairs of rows share a timestamp, so the id tie-breaker matters
+        session.add(
+            Interaction(
+                patient_id=patient.id,
+                outcome="Healthy",
+                notes=str(i),
+                timestamp=base + timedelta(minutes=i // 2),
+            )
+        )
+    session.commit()
+    return patient.id
+
+
+def test_cursor_pagination_walks_full_history(client: TestClient, session: Session):
+    patient_id = seed_history(session, 25)
+
+    seen: list[str] = []
+    params = {"patient_id": str(patient_id), "limit": 10}
+    while True:
+        response = client.get("/api/v1/interactions/", params=params)
+        assert response.status_code == 200
+        seen.extend(i["id"] for i in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        assert 'rel="next"' in response.headers["Link"]
+        params["cursor"] = cursor
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+    offset_page = client.get(
+        "/api/v1/interactions/", params={"patient_id": str(patient_id), "limit": 25}
+    ).json()
+    assert [i["id"] for i in offset_page] == seen
+
+
+def test_last_page_has_no_cursor(client: TestClient, session: Session):
+    patient_id = seed_history(session, 3)
+    response = client.get(
+        "/api/v1/interactions/", params={"patient_id": str(patient_id), "limit": 10}
+    )
+    assert "X-Next-Cursor" not in response.headers
+    assert "Link" not in response.headers
+
+
+def test_invalid_cursor(client: TestClient):
+    response = client.get("/api/v1/interactions/", params={"cursor": "garbage"})
+    assert response.status_code == 400
@@ -0,0 +1,103 @@
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models import (
+    DailyOutcomeStats,
+    Gender,
+    Interaction,
+    Patient,
+    PatientOutcomeStats,
+)
+from app.services import archive
+from app.services import patients as patient_service
+from app.services.interactions import insert_interactions
+
+
+def seed(session: Session, interactions: int, start: datetime) -> uuid.UUID:
+    patient = Patient(
+        first_name="Long",
+        last_name="History",
+        date_of_birth=date(1940, 4, 4),
+        gender=Gender.MALE,
+    )
+    session.add(patient)
+    session.commit()
+    chunk = 10_000
+    for offset in range(0, interactions, chunk):
+        insert_interactions(
+            session,
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "patient_id": patient.id,
+                    "timestamp": start + timedelta(minutes=n),
+                    "outcome": "Healthy",
+                    "notes": "routine",
+                }
+                for n in range(offset, min(offset + chunk, interactions))
+            ],
+        )
+        session.commit()
+    return patient.id
+
+
+def count(session: Session, model) -> int:
+    return session.exec(select(func.count()).select_from(model)).one()
+
+
+def test_delete_long_history_in_bounded_memory(session: Session):
+    patient_id = seed(session, 100_000, datetime(2024, 1, 1))
+    session.expunge_all()
+
+    tracemalloc.start()
+    deleted = patient_service.delete_patient(session, patient_id, chunk_size=5000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert deleted == 100_000
+    # The ORM cascade would hold all 100k Interaction objects at once
+    assert peak < 5 * 1024 * 1024
+    assert session.get(Patient, patient_id) is None
+    assert count(session, Interaction) == 0
+    assert count(session, PatientOutcomeStats) == 0
+    assert session.exec(select(func.sum(DailyOutcomeStats.count))).one() == 0
+
+
+def test_background_deletion_job(client: TestClient, session: Session):
+    patient_id = seed(session, 50, datetime(2024, 1, 1))
+
+    response = client.delete(f"/api/v1/patients/{patient_id}?background=true")
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+
+    # TestClient runs the background task before returning
+    job = client.get(response.headers["Location"]).json()
+    assert job["status"] == "done"
+    assert job["deleted_interactions"] == 50
+    assert job["finished_at"] is not None
+    assert session.get(Patient, patient_id) is None
+
+    response = client.delete(f"/api/v1/patients/{patient_id}?background=true")
+    assert response.status_code == 404
+    response = client.get(f"/api/v1/patients/deletions/{uuid.uuid4()}")
+    assert response.status_code == 404
+
+
+def test_deletion_removes_archived_rows(session: Session, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    kept = seed(session, 3, datetime(2024, 1, 1))
+    removed = seed(session, 3, datetime(2024, 1, 2))
+    archive.archive_months(session, date(2024, 2, 1))
+
+    assert patient_service.delete_patient(session, removed) == 3
+
+    (partition,) = archive.partitions(session)
+    assert partition.rows == 3
+    records = list(archive.iter_archived_records(session.get_bind()))
+    assert {record["patient_id"] for record in records} == {kept}
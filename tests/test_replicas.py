@@ -0,0 +1,131 @@
+import sqlite3
+from pathlib import Path
+from typing import Callable, Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from app.api.v1.api import sync_api_router
+from app.core import database
+from app.core.database import create_db_engine, get_lazy_session, get_session
+from app.core.replicas import LAST_WRITE_HEADER, ReadYourWritesMiddleware, ReplicaRouter
+from app.models import Outcome
+from app.services.outcome_registry import outcome_registry
+
+PATIENT = {
+    "first_name": "Lag",
+    "last_name": "Behind",
+    "date_of_birth": "1970-07-07",
+    "gender": "Other",
+}
+
+
+@pytest.fixture(name="replicated")
+def replicated_fixture(
+    tmp_path: Path, monkeypatch
+) -> Generator[tuple[FastAPI, Callable[[], None]], None, None]:
+    """
+    An app on a primary and a replica SQLite file. Writes go to the primary;
+    the returned function copies it onto the replica, standing in for
+    replication.
+    """
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    primary = create_db_engine(f"sqlite:///{primary_path}")
+    replica = create_db_engine(f"sqlite:///{replica_path}")
+    SQLModel.metadata.create_all(primary)
+    with Session(primary) as session:
+        session.add(Outcome(code="Healthy"))
+        session.commit()
+
+    def sync() -> None:
+        replica.dispose()
+        with (
+            sqlite3.connect(primary_path) as source,
+            sqlite3.connect(replica_path) as target,
+        ):
+            source.backup(target)
+
+    sync()
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter(primary, [replica]))
+
+    def primary_session():
+        with Session(primary, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(sync_api_router, prefix="/api/v1")
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.dependency_overrides[get_session] = primary_session
+    app.dependency_overrides[get_lazy_session] = primary_session
+    outcome_registry.invalidate()
+    yield app, sync
+    outcome_registry.invalidate()
+    primary.dispose()
+    replica.dispose()
+
+
+def test_reads_go_to_replica_and_writers_read_their_writes(replicated):
+    app, replicate = replicated
+    client = TestClient(app)
+    response = client.post("/api/v1/patients/", json=PATIENT)
+    assert response.status_code == 201
+    token = response.headers[LAST_WRITE_HEADER]
+    assert client.cookies.get("last_write") == token
+
+    # The writer's cookie routes its reads to the primary
+    assert len(client.get("/api/v1/patients/").json()) == 1
+
+    # Others read the replica, which has not caught up yet
+    other = TestClient(app)
+    assert other.get("/api/v1/patients/").json() == []
+    # ...unless they present the token
+    response = other.get("/api/v1/patients/", headers={LAST_WRITE_HEADER: token})
+    assert len(response.json()) == 1
+
+    replicate()
+    assert len(other.get("/api/v1/patients/").json()) == 1
+
+
+def test_outcome_registry_reloads_from_primary(replicated):
+    app, _ = replicated
+    client = TestClient(app)
+    assert [o["code"] for o in client.get("/api/v1/outcomes/").json()] == ["Healthy"]
+    response = client.post("/api/v1/outcomes/", json={"code": "Stable"})
+    assert response.status_code == 201
+
+    # The replica has not caught up, but the reload after the write does not
+    # read it
+    other = TestClient(app)
+    codes = [o["code"] for o in other.get("/api/v1/outcomes/").json()]
+    assert sorted(codes) == ["Healthy", "Stable"]
+
+
+def test_failed_replica_falls_back_to_primary(tmp_path: Path):
+    primary = create_db_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    # A replica that cannot be opened
+    broken = create_db_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(primary, [broken], retry_after=60)
+
+    for _ in range(2):
+        with router.connect() as connection:
+            assert connection.engine is primary
+    assert router._down_until[broken] > 0
+    primary.dispose()
+
+
+def test_replicas_round_robin(tmp_path: Path):
+    primary, *replicas = [
+        create_db_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        for name in ("primary", "a", "b")
+    ]
+    router = ReplicaRouter(primary, replicas)
+
+    used = []
+    for _ in range(4):
+        with router.connect() as connection:
+            used.append(connection.engine)
+    assert used == [replicas[0], replicas[1], replicas[0], replicas[1]]
+    for engine in (primary, *replicas):
+        engine.dispose()
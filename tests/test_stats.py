@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import DailyOutcomeStats, Interaction, PatientOutcomeStats
+from app.services import stats
+
+
+def document(client: TestClient, patient_id: str, outcome: str) -> str:
+    response = client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": outcome, "notes": outcome},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def counts(data: dict) -> dict[str, int]:
+    return {entry["outcome"]: entry["count"] for entry in data["outcomes"]}
+
+
+def test_rollups_follow_every_write_path(
+    client: TestClient, session: Session, create_patient
+):
+    alice = create_patient("Alice")
+    bob = create_patient("Bob")
+
+    document(client, alice, "Healthy")
+    changed = document(client, alice, "Healthy")
+    removed = document(client, alice, "Monitor")
+    document(client, bob, "Critical")
+    client.post(
+        "/api/v1/interactions/bulk",
+        json=[{"patient_id": alice, "outcome": "Critical", "notes": "b"}] * 3,
+    )
+    client.put(f"/api/v1/interactions/{changed}", json={"outcome": "Critical"})
+    client.put(f"/api/v1/interactions/{changed}", json={"notes": "Only notes"})
+    client.delete(f"/api/v1/interactions/{removed}")
+
+    summary = client.get(f"/api/v1/patients/{alice}/summary").json()
+    assert summary["total"] == 5
+    assert counts(summary) == {"Critical": 4, "Healthy": 1}
+
+    overall = client.get("/api/v1/stats/outcomes", params={"days": 7}).json()
+    assert counts(overall) == {"Critical": 5, "Healthy": 1}
+
+    client.delete(f"/api/v1/patients/{bob}")
+    overall = client.get("/api/v1/stats/outcomes").json()
+    assert counts(overall) == {"Critical": 4, "Healthy": 1}
+
+    assert stats.check(session) == []
+
+
+def test_summary_window_and_rebuild(
+    client: TestClient, session: Session, create_patient
+):
+    patient_id = create_patient("Carol")
+    document(client, patient_id, "Critical")
+
+    # Written behind the application's back: rollups are now stale
+    old = Interaction(
+        patient_id=patient_id,
+        outcome="Critical",
+        notes="Last month",
+        timestamp=datetime.now(timezone.utc) - timedelta(days=30),
+    )
+    session.add(old)
+    session.commit()
+    assert len(stats.check(session)) == 2
+
+    stats.rebuild(session)
+    assert stats.check(session) == []
+
+    everything = client.get(f"/api/v1/patients/{patient_id}/summary").json()
+    this_week = client.get(
+        f"/api/v1/patients/{patient_id}/summary", params={"days": 7}
+    ).json()
+    assert counts(everything) == {"Critical": 2}
+    assert counts(this_week) == {"Critical": 1}
+    assert len(session.exec(select(PatientOutcomeStats)).all()) == 2
+    assert len(session.exec(select(DailyOutcomeStats)).all()) == 2
+
+
+def test_summary_unknown_patient(client: TestClient):
+    response = client.get(
+        "/api/v1/patients/00000000-0000-0000-0000-000000000000/summary"
+    )
+    assert response.status_code == 404
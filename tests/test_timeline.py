@@ -0,0 +1,56 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+
+def create_history(client: TestClient, patient_id: str, count: int) -> None:
+    rows = [
+        {"patient_id": patient_id, "outcome": "Healthy", "notes": str(i)}
+        for i in range(count)
+    ]
+    assert (
+        client.post("/api/v1/interactions/bulk", json=rows).json()["created"] == count
+    )
+
+
+def test_patient_timeline(client: TestClient, create_patient):
+    patient_id = create_patient("Solo")
+    for notes in ["first", "second", "third"]:
+        client.post(
+            "/api/v1/interactions/",
+            json={"patient_id": patient_id, "outcome": "Monitor", "notes": notes},
+        )
+
+    response = client.get(f"/api/v1/patients/{patient_id}/timeline?limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["first_name"] == "Solo"
+    assert [i["notes"] for i in data["interactions"]] == ["third", "second"]
+
+    response = client.get(f"/api/v1/patients/{uuid.uuid4()}/timeline")
+    assert response.status_code == 404
+
+
+def test_timelines_query_count_is_constant(
+    client: TestClient, count_queries, create_patient
+):
+    patient_ids = [create_patient(f"P{i}") for i in range(6)]
+    for patient_id in patient_ids:
+        create_history(client, patient_id, 5)
+
+    with count_queries() as one:
+        response = client.get(
+            "/api/v1/patients/timelines", params={"ids": patient_ids[:1], "limit": 3}
+        )
+    assert len(response.json()) == 1
+
+    with count_queries() as many:
+        response = client.get(
+            "/api/v1/patients/timelines",
+            params={"ids": patient_ids + [str(uuid.uuid4())], "limit": 3},
+        )
+    data = response.json()
+
+    assert len(one) == len(many) == 2
+    assert [p["id"] for p in data] == patient_ids
+    assert all(len(p["interactions"]) == 3 for p in data)
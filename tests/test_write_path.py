@@ -0,0 +1,127 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.core.group_commit import GroupCommitter
+from app.models import Gender, Interaction, Outcome, Patient
+from app.schemas.interaction import InteractionCreate
+from app.schemas.patient import PatientCreate
+from app.services import interactions as interaction_service
+from app.services import patients as patient_service
+
+
+def test_writes_do_not_read_back(client: TestClient, count_queries, create_patient):
+    patient_id = create_patient()
+
+    with count_queries() as statements:
+        response = client.post(
+            "/api/v1/interactions/",
+            json={"patient_id": patient_id, "outcome": "Healthy", "notes": "new"},
+        )
+    assert response.status_code == 201
+    inserted = [s for s in statements if s.startswith("INSERT INTO interaction")]
+    assert inserted
+    # Only the patient lookup and the stats upserts, nothing after the INSERT
+    assert not any(s.startswith("SELECT interaction") for s in statements)
+
+    with count_queries() as statements:
+        response = client.put(
+            f"/api/v1/patients/{patient_id}", json={"first_name": "Renamed"}
+        )
+    assert response.json()["first_name"] == "Renamed"
+    # The audit entry is written after the commit, by the audit writer
+    written = [s.split()[0] for s in statements if "audit_log" not in s]
+    assert written == ["SELECT", "UPDATE"]
+
+
+def test_created_interaction_matches_listing(client: TestClient, create_patient):
+    patient_id = create_patient()
+    created = client.post(
+        "/api/v1/interactions/",
+        json={"patient_id": patient_id, "outcome": "Monitor", "notes": "same"},
+    ).json()
+
+    listed = client.get("/api/v1/interactions/", params={"patient_id": patient_id})
+    assert listed.json() == [created]
+
+
+@pytest.fixture(name="file_engine")
+def file_engine_fixture(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'group.db'}", connect_args={"timeout": 30}
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Outcome(code="Healthy"))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_group_commit_batches_concurrent_creates(
+    file_engine, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(interaction_service.interaction_committer, "window_ms", 20)
+    with Session(file_engine, expire_on_commit=False) as session:
+        patient = patient_service.create_patient(
+            session,
+            PatientCreate(
+                first_name="Group",
+                last_name="Commit",
+                date_of_birth=date(1970, 1, 1),
+                gender=Gender.OTHER,
+            ),
+        )
+
+    commits = []
+    event.listen(file_engine, "commit", lambda conn: commits.append(1))
+
+    def create(i: int) -> Interaction:
+        with Session(file_engine) as session:
+            return interaction_service.create_interaction_grouped(
+                session,
+                InteractionCreate(
+                    patient_id=patient.id, outcome="Healthy", notes=f"n{i}"
+                ),
+            )
+
+    with ThreadPoolExecutor(max_workers=30) as pool:
+        created = list(pool.map(create, range(60)))
+
+    assert len({interaction.id for interaction in created}) == 60
+    assert len(commits) < 60
+    with Session(file_engine) as session:
+        assert session.exec(select(func.count()).select_from(Interaction)).one() == 60
+
+
+def test_group_commit_isolates_failing_row(file_engine):
+    committer = GroupCommitter(patient_service.insert_patients, 50, 10)
+    row = Patient(
+        first_name="Dup",
+        last_name="Licate",
+        date_of_birth=date(1980, 5, 5),
+        gender=Gender.MALE,
+    ).model_dump()
+    committer.submit(file_engine, row)
+
+    def submit(candidate: dict) -> Exception | None:
+        try:
+            committer.submit(file_engine, candidate)
+        except Exception as exc:
+            return exc
+        return None
+
+    fresh = {**row, "id": uuid.uuid4()}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        duplicate_error, fresh_error = pool.map(submit, [row, fresh])
+
+    assert duplicate_error is not None
+    assert fresh_error is None
+    with Session(file_engine) as session:
+        assert session.exec(select(func.count()).select_from(Patient)).one() == 2